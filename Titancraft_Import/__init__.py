@@ -5,18 +5,31 @@ bl_info = {
 }
 
 import bpy
-from .operator import ImportApplyTexturesOperator
+from . import preferences
+from .operator import ImportApplyTexturesOperator, ImportTitancraftBatchOperator, RestoreFullResolutionTexturesOperator
 
 def menu_func_import(self, context):
     self.layout.operator(ImportApplyTexturesOperator.bl_idname, text="Titancraft (.zip)")
+    self.layout.operator(ImportTitancraftBatchOperator.bl_idname, text="Titancraft Batch (.zip)")
+
+def menu_func_object(self, context):
+    self.layout.operator(RestoreFullResolutionTexturesOperator.bl_idname)
 
 def register():
+    preferences.register()
     bpy.utils.register_class(ImportApplyTexturesOperator)
+    bpy.utils.register_class(ImportTitancraftBatchOperator)
+    bpy.utils.register_class(RestoreFullResolutionTexturesOperator)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.VIEW3D_MT_object.append(menu_func_object)
 
 def unregister():
+    bpy.utils.unregister_class(RestoreFullResolutionTexturesOperator)
+    bpy.utils.unregister_class(ImportTitancraftBatchOperator)
     bpy.utils.unregister_class(ImportApplyTexturesOperator)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    bpy.types.VIEW3D_MT_object.remove(menu_func_object)
+    preferences.unregister()
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,354 @@
+"""
+Headless batch pipeline for Titancraft Import add-on.
+
+Run inside Blender:
+    blender --background --python Titancraft_Import/cli.py -- --manifest assets.txt --output out --format glb
+
+With --workers N the manifest is split into N asset queues, and each queue
+is processed by its own background Blender process. The coordinator itself
+does not need bpy, so it can also be started with a plain Python interpreter
+given --blender or the TITANCRAFT_BLENDER environment variable.
+
+With --render the assets are imported in Turntable mode and rendered on the
+CPU instead of exported. The work runs in three stages: the import stage
+saves each asset's scene, the render stage gives each of the N workers a
+contiguous part of every asset's frame range, and the assemble stage turns
+the frames into a video or contact sheet. Finished scenes, frames and
+outputs are skipped, so running the same command again resumes after a
+failed or killed worker.
+
+Set TITANCRAFT_PROFILE=1 to write a per-asset stage profile.
+"""
+
+import os
+import sys
+
+# Running this file directly puts the add-on folder first on sys.path, where
+# operator.py would shadow the standard library module of the same name.
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != ADDON_DIR]
+
+import argparse
+import importlib
+import subprocess
+import tempfile
+import time
+
+OUTPUT_FORMATS = ('blend', 'fbx', 'glb')
+CONFIGURATIONS = ('DEFAULT', 'UNREAL', 'TURNTABLE')
+BLENDER_ENV_VAR = 'TITANCRAFT_BLENDER'
+RENDER_ENGINES = ('CYCLES', 'EEVEE', 'WORKBENCH')
+RENDER_OUTPUTS = ('video', 'sheet')
+GLOW_QUALITIES = ('PREVIEW', 'FINAL')
+STAGES = ('import', 'render', 'assemble')
+
+def parse_args(argv):
+    """Parse the arguments that follow '--' on the Blender command line."""
+    if '--' in argv:
+        argv = argv[argv.index('--') + 1:]
+    parser = argparse.ArgumentParser(prog="cli.py", description="Import Titancraft zips headlessly and save or export each asset.")
+    parser.add_argument('--manifest', required=True, help="Text file with one zip path per line (relative paths are resolved against the manifest)")
+    parser.add_argument('--output', required=True, help="Directory for the saved or exported assets")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='blend', help="Output format per asset")
+    parser.add_argument('--configuration', choices=CONFIGURATIONS, default='DEFAULT', help="Import configuration")
+    parser.add_argument('--ior', type=float, default=None, help="Index of Refraction for the material")
+    parser.add_argument('--glow', action='store_true', help="Set up the glow compositor")
+    parser.add_argument('--glow-quality', choices=GLOW_QUALITIES, default='FINAL', help="Glare quality of the glow compositor")
+    parser.add_argument('--no-orm', dest='pack_orm', action='store_false', help="UNREAL only: keep separate metallic and roughness maps instead of a packed ORM map")
+    parser.add_argument('--no-fast-obj', dest='fast_obj_reader', action='store_false', help="Always import OBJs with Blender's OBJ import operator")
+    parser.add_argument('--mesh-sidecar', action='store_true', help="Keep binary mesh sidecars in the asset cache and map them on re-import")
+    parser.add_argument('--bake-textures', action='store_true', help="DEFAULT and TURNTABLE only: bake AO into the color map and precompute the emission map")
+    parser.add_argument('--lods', type=int, default=0, help="Number of LODs to generate besides LOD0 (<model>_LOD0 .. _LODn)")
+    parser.add_argument('--lod-ratio', type=float, default=None, help="Triangle ratio of each LOD relative to the previous one")
+    parser.add_argument('--render', action='store_true', help="Render a turntable per asset instead of exporting it (implies --configuration TURNTABLE)")
+    parser.add_argument('--render-engine', choices=RENDER_ENGINES, default='CYCLES', help="Render engine; Cycles renders on the CPU and EEVEE through software OpenGL")
+    parser.add_argument('--render-output', choices=RENDER_OUTPUTS, default='video', help="Assemble the frames into an MP4 video or a PNG contact sheet")
+    parser.add_argument('--samples', type=int, default=None, help="Render samples per pixel (Cycles and EEVEE)")
+    parser.add_argument('--resolution', default=None, help="Render resolution as WIDTHxHEIGHT, e.g. 1280x720")
+    parser.add_argument('--retries', type=int, default=1, help="Times to rerun failed render workers")
+    parser.add_argument('--workers', type=int, default=1, help="Number of Blender processes to fan the work out to")
+    parser.add_argument('--blender', default=os.environ.get(BLENDER_ENV_VAR), help="Blender executable used for worker processes")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--stage', choices=STAGES, default='import', help=argparse.SUPPRESS)
+    parser.add_argument('--shard', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--shards', type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument('--threads', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.render:
+        args.configuration = 'TURNTABLE'
+    if args.resolution is not None:
+        try:
+            args.resolution = tuple(int(size) for size in args.resolution.lower().split('x'))
+        except ValueError:
+            args.resolution = ()
+        if len(args.resolution) != 2 or min(args.resolution) <= 0:
+            parser.error("--resolution must look like 1280x720")
+    return args
+
+def read_manifest(manifest_path):
+    """Return the zip paths listed in the manifest, skipping blank lines and # comments."""
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, 'r', encoding='utf-8') as manifest:
+        lines = [line.strip() for line in manifest]
+    return [os.path.join(manifest_dir, line) for line in lines if line and not line.startswith('#')]
+
+def split_queues(filepaths, workers):
+    """Distribute the assets round-robin into one queue per worker."""
+    queues = [filepaths[index::workers] for index in range(workers)]
+    return [queue for queue in queues if queue]
+
+def get_blender_binary(args):
+    """Return the Blender executable for worker processes."""
+    if args.blender:
+        return args.blender
+    try:
+        import bpy  # type: ignore
+        return bpy.app.binary_path
+    except ImportError:
+        sys.exit(f"Blender executable not found: pass --blender or set {BLENDER_ENV_VAR}")
+
+def build_worker_command(blender, args, queue_path, stage='import'):
+    """Return the command line for one background Blender worker."""
+    command = [
+        blender, '--background', '--factory-startup', '--python', os.path.abspath(__file__), '--',
+        '--worker', '--stage', stage, '--manifest', queue_path, '--output', args.output,
+        '--format', args.format, '--configuration', args.configuration,
+    ]
+    if args.ior is not None:
+        command += ['--ior', str(args.ior)]
+    if args.glow:
+        command += ['--glow', '--glow-quality', args.glow_quality]
+    if not args.pack_orm:
+        command.append('--no-orm')
+    if not args.fast_obj_reader:
+        command.append('--no-fast-obj')
+    if args.mesh_sidecar:
+        command.append('--mesh-sidecar')
+    if args.bake_textures:
+        command.append('--bake-textures')
+    if args.lods:
+        command += ['--lods', str(args.lods)]
+    if args.lod_ratio is not None:
+        command += ['--lod-ratio', str(args.lod_ratio)]
+    if args.render:
+        command += ['--render', '--render-engine', args.render_engine, '--render-output', args.render_output]
+    if args.samples is not None:
+        command += ['--samples', str(args.samples)]
+    if args.resolution is not None:
+        command += ['--resolution', 'x'.join(str(size) for size in args.resolution)]
+    return command
+
+def run_workers(blender, args, queue_dir, queues, stage='import', worker_args=None, env=None):
+    """Start one worker process per queue for a stage and wait for all of them. Returns their exit codes."""
+    processes = []
+    for index, queue in enumerate(queues):
+        queue_path = os.path.join(queue_dir, f"{stage}_queue_{index}.txt")
+        with open(queue_path, 'w', encoding='utf-8') as queue_file:
+            queue_file.write('\n'.join(queue))
+        command = build_worker_command(blender, args, queue_path, stage) + (worker_args[index] if worker_args else [])
+        processes.append(subprocess.Popen(command, env=env))
+    return [process.wait() for process in processes]
+
+def run_render_workers(blender, args, queue_dir, filepaths):
+    """Render every asset's frame range split across the workers, rerunning failed shards up to --retries times.
+
+    The cores are divided between the workers, so N processes together keep
+    every core busy without oversubscribing them.
+    """
+    shards = max(1, args.workers)
+    threads = max(1, (os.cpu_count() or 1) // shards)
+    # EEVEE workers without a GPU render through Mesa's software OpenGL
+    env = dict(os.environ, LIBGL_ALWAYS_SOFTWARE='1') if args.render_engine == 'EEVEE' else None
+    pending = list(range(shards))
+    for attempt in range(args.retries + 1):
+        if attempt:
+            print(f"Retrying {len(pending)} failed render workers (attempt {attempt} of {args.retries})")
+        worker_args = [['--shard', str(shard), '--shards', str(shards), '--threads', str(threads)] for shard in pending]
+        exit_codes = run_workers(blender, args, queue_dir, [filepaths] * len(pending), 'render', worker_args, env)
+        pending = [shard for shard, code in zip(pending, exit_codes) if code != 0]
+        if not pending:
+            break
+    return [1] * len(pending)
+
+def run_coordinator(args, filepaths):
+    """Fan the assets out to worker processes and wait for all of them."""
+    blender = get_blender_binary(args)
+    queues = split_queues(filepaths, max(1, args.workers))
+    start_time = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="titancraft_cli_") as queue_dir:
+        exit_codes = run_workers(blender, args, queue_dir, queues)
+        if args.render:
+            exit_codes += run_render_workers(blender, args, queue_dir, filepaths)
+            exit_codes += run_workers(blender, args, queue_dir, queues, 'assemble')
+
+    failed_workers = sum(1 for code in exit_codes if code != 0)
+    elapsed = time.perf_counter() - start_time
+    print(f"Processed {len(filepaths)} assets with {len(queues)} workers in {elapsed:.2f}s "
+          f"({len(filepaths) / max(elapsed, 1e-6):.2f} assets/sec), {failed_workers} workers reported failures")
+    return 1 if failed_workers else 0
+
+def load_addon_module(name):
+    """Import a submodule of the add-on package, whatever its folder is called."""
+    package_parent, package_name = os.path.split(ADDON_DIR)
+    if package_parent not in sys.path:
+        sys.path.insert(0, package_parent)
+    return importlib.import_module(f"{package_name}.{name}")
+
+def export_asset(output_path, output_format):
+    """Save the current file as .blend, or export it as FBX or GLB."""
+    import bpy  # type: ignore
+    if output_format == 'blend':
+        bpy.ops.wm.save_as_mainfile(filepath=output_path)
+    elif output_format == 'fbx':
+        bpy.ops.export_scene.fbx(filepath=output_path, path_mode='COPY', embed_textures=True)
+    else:
+        bpy.ops.export_scene.gltf(filepath=output_path, export_format='GLB')
+
+def process_asset(filepath, args):
+    """Run the full import pipeline for one zip in a fresh empty scene."""
+    import bpy  # type: ignore
+    if args.render:
+        scene_path = load_addon_module('functions.render').get_scene_path(args.output, load_addon_module('functions.io').resolve_base_name(filepath))
+        if os.path.exists(scene_path):
+            print(f"Scene already saved: {scene_path}")
+            return True
+
+    apply_textures = load_addon_module('functions.apply_textures')
+    constants = load_addon_module('functions.constants')
+    glow = load_addon_module('functions.glow')
+    io = load_addon_module('functions.io')
+    resize = load_addon_module('functions.resize')
+    turntable = load_addon_module('functions.turntable')
+    utils = load_addon_module('functions.utils')
+    validation = load_addon_module('functions.validation')
+    logger = load_addon_module('functions.logging_utils').get_logger()
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    base_name, extract_to = io.extract_zip(filepath, logger)
+    obj_path, texture_paths = io.get_file_paths(base_name, extract_to, logger)
+    if not utils.check_files_exist(obj_path, texture_paths, logger):
+        return False
+    if not validation.preflight_textures(texture_paths, logger=logger).ok:
+        return False
+
+    if args.configuration == constants.ImportConstants.CONFIGURATION_UNREAL and args.pack_orm:
+        texture_paths = load_addon_module('functions.image_ops').add_orm_texture(texture_paths, base_name, logger)
+
+    if args.bake_textures and args.configuration != constants.ImportConstants.CONFIGURATION_UNREAL:
+        cache = load_addon_module('functions.cache')
+        texture_paths = load_addon_module('functions.image_ops').add_baked_textures(texture_paths, cache.get_baked_directory(), logger)
+
+    ior = constants.MaterialConstants.DEFAULT_IOR if args.ior is None else args.ior
+    sidecar_dir = load_addon_module('functions.cache').get_sidecar_directory() if args.fast_obj_reader and args.mesh_sidecar else None
+    objects = apply_textures.import_obj(obj_path, logger, args.fast_obj_reader, sidecar_dir)
+    if not objects:
+        return False
+    if apply_textures.apply_textures(obj_path, texture_paths, base_name, ior, args.configuration, objects=objects) == {'CANCELLED'}:
+        return False
+    io.rename_imported_object(base_name, objects, logger)
+
+    if args.configuration in (constants.ImportConstants.CONFIGURATION_UNREAL, constants.ImportConstants.CONFIGURATION_TURNTABLE):
+        if resize.resize_object(scale=constants.ScalingConstants.UNREAL_ENGINE_SCALE, logger=logger, objects=objects) == {'CANCELLED'}:
+            return False
+    if args.lods:
+        lod_ratio = constants.LODConstants.DEFAULT_LOD_RATIO if args.lod_ratio is None else args.lod_ratio
+        load_addon_module('functions.lod').generate_lods(objects, args.lods, lod_ratio, logger)
+    if args.render:
+        # Before the rig is fitted, which depends on the render aspect
+        render_defaults = constants.RenderConstants
+        load_addon_module('functions.render').configure_render(bpy.context.scene, args.render_engine, args.resolution or render_defaults.DEFAULT_RESOLUTION,
+                                                               render_defaults.DEFAULT_SAMPLES if args.samples is None else args.samples)
+    if args.configuration == constants.ImportConstants.CONFIGURATION_TURNTABLE:
+        turntable.setup_turntable_camera(objects)
+        turntable.add_lights(objects)
+    if args.glow:
+        glow.setup_glow_compositor(quality=args.glow_quality)
+
+    if args.render:
+        os.makedirs(os.path.dirname(scene_path), exist_ok=True)
+        export_asset(scene_path, 'blend')
+        return True
+    os.makedirs(args.output, exist_ok=True)
+    export_asset(os.path.join(os.path.abspath(args.output), f"{base_name}.{args.format}"), args.format)
+    return True
+
+def render_asset(filepath, args):
+    """Render this worker's part of an asset's turntable frames from its saved scene."""
+    import bpy  # type: ignore
+    render = load_addon_module('functions.render')
+    base_name = load_addon_module('functions.io').resolve_base_name(filepath)
+    scene_path = render.get_scene_path(args.output, base_name)
+    if not os.path.exists(scene_path):
+        print(f"No scene to render for {base_name}: {scene_path} is missing")
+        return False
+
+    bpy.ops.wm.open_mainfile(filepath=scene_path)
+    scene = bpy.context.scene
+    frames = render.split_frames(scene.frame_start, scene.frame_end, args.shard, args.shards)
+    render.render_frames(scene, frames, args.output, base_name, args.threads, load_addon_module('functions.logging_utils').get_logger())
+    return True
+
+def assemble_asset(filepath, args):
+    """Turn an asset's rendered frames into its video or contact sheet."""
+    import bpy  # type: ignore
+    constants = load_addon_module('functions.constants')
+    render = load_addon_module('functions.render')
+    logger = load_addon_module('functions.logging_utils').get_logger()
+    base_name = load_addon_module('functions.io').resolve_base_name(filepath)
+    output_path = render.get_assembled_path(args.output, base_name, args.render_output)
+    if os.path.exists(output_path):
+        print(f"Already assembled: {output_path}")
+        return True
+
+    frame_range = range(constants.AnimationConstants.TURNTABLE_FRAME_START, constants.AnimationConstants.TURNTABLE_FRAME_END + 1)
+    frame_paths = [render.get_frame_path(args.output, base_name, frame) for frame in frame_range]
+    missing = [path for path in frame_paths if not os.path.exists(path)]
+    if missing:
+        print(f"{base_name} is missing {len(missing)} of {len(frame_paths)} frames; run the command again to render them")
+        return False
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    if args.render_output == constants.RenderConstants.OUTPUT_VIDEO:
+        return render.write_video(frame_paths, output_path, constants.AnimationConstants.TURNTABLE_FPS, logger)
+    return render.write_contact_sheet(frame_paths, output_path, logger=logger)
+
+STAGE_FUNCTIONS = {'import': process_asset, 'render': render_asset, 'assemble': assemble_asset}
+
+def run_worker(args, filepaths):
+    """Process an asset queue inside this Blender process."""
+    process = STAGE_FUNCTIONS[args.stage]
+    failures = 0
+    for index, filepath in enumerate(filepaths, start=1):
+        start_time = time.perf_counter()
+        logging_utils = load_addon_module('functions.logging_utils')
+        try:
+            with logging_utils.profiling_session(False, logging_utils.get_logger(), os.path.splitext(os.path.basename(filepath))[0]):
+                succeeded = process(filepath, args)
+        except Exception as e:
+            print(f"Error processing {filepath}: {e}")
+            succeeded = False
+        failures += 0 if succeeded else 1
+        status = "OK" if succeeded else "FAILED"
+        print(f"[{index}/{len(filepaths)}] {status} {os.path.basename(filepath)} in {time.perf_counter() - start_time:.2f}s")
+    return 1 if failures else 0
+
+def main(argv=None):
+    args = parse_args(sys.argv if argv is None else argv)
+    filepaths = read_manifest(args.manifest)
+
+    in_blender = 'bpy' in sys.modules
+    if args.worker:
+        return run_worker(args, filepaths)
+    if in_blender and args.workers <= 1:
+        # Run every stage in this process
+        failures = 0
+        for stage in (STAGES if args.render else STAGES[:1]):
+            args.stage = stage
+            failures += run_worker(args, filepaths)
+        return 1 if failures else 0
+    return run_coordinator(args, filepaths)
+
+if __name__ == "__main__":
+    sys.exit(main())
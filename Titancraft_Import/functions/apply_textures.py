@@ -1,111 +1,203 @@
 import bpy  # type: ignore
+import hashlib
 import os
-from .utils import arrange_nodes
+from .obj_reader import read_obj_object
+from .material_templates import get_material_template
+from .utils import compute_data_hash, compute_file_hash
 from .constants import MaterialConstants, ImportConstants, ViewportConstants
-from .logging_utils import get_logger, log_operation_start, log_operation_success, log_operation_error, log_file_operation
-
-def apply_textures(obj_path, texture_paths, base_name, ior=MaterialConstants.DEFAULT_IOR, configuration=ImportConstants.CONFIGURATION_DEFAULT, operator=None):
-    logger = get_logger(operator)
-    log_operation_start("texture application", logger)
-
-    # Import the .obj file
+from .logging_utils import get_logger, log_operation_start, log_operation_success, log_operation_error, log_file_operation, profile_stage
+
+def load_packed_image(name, data):
+    """Create a packed image from in-memory PNG bytes without touching the disk."""
+    image = bpy.data.images.new(name, 8, 8)
+    image.pack(data=data, data_len=len(data))
+    image.source = 'FILE'
+    return image
+
+def find_datablock(datablocks, content_key):
+    """Return the datablock tagged with content_key, or None."""
+    for datablock in datablocks:
+        if datablock.get(MaterialConstants.CONTENT_KEY_PROPERTY) == content_key:
+            return datablock
+    return None
+
+@profile_stage("images.load")
+def load_texture_image(texture_type, texture_key, texture_paths, texture_data=None, images=None):
+    """Load a texture from disk, or from texture_data when it was read into memory.
+
+    An image with the same content and colorspace that is already loaded is
+    shared instead of loading a duplicate. Images already present in images
+    (e.g. appended from the asset cache) are reused.
+    """
+    image = find_datablock(bpy.data.images, texture_key)
+    if image is not None:
+        return image
+
+    if images and texture_type in images:
+        image = images[texture_type]
+    elif texture_data is not None:
+        image = load_packed_image(os.path.basename(texture_paths[texture_type]), texture_data[texture_type])
+    else:
+        image = bpy.data.images.load(texture_paths[texture_type])
+    image.colorspace_settings.name = MaterialConstants.TEXTURE_COLOR_SPACES[texture_type]
+    image[MaterialConstants.CONTENT_KEY_PROPERTY] = texture_key
+    return image
+
+def has_texture(texture_type, texture_paths, texture_data=None, images=None):
+    """Check whether an optional texture is available on disk or in memory."""
+    if images and texture_type in images:
+        return True
+    if texture_data is not None:
+        return texture_type in texture_data
+    return texture_type in texture_paths and os.path.exists(texture_paths[texture_type])
+
+def get_texture_types(configuration, texture_paths, texture_data=None, images=None):
+    """Return the texture types the configuration uses for this set of maps."""
+    if configuration == ImportConstants.CONFIGURATION_UNREAL and 'orm' in texture_paths:
+        texture_types = ['color', 'normals', 'orm']
+    else:
+        texture_types = ['color', 'normals', 'metallic', 'roughness']
+    if 'emission' in texture_paths:
+        texture_types.append('emission')
+    elif has_texture('emissive', texture_paths, texture_data, images):
+        texture_types.append('emissive')
+    # Baked texture sets carry the AO in their color map
+    if configuration != ImportConstants.CONFIGURATION_UNREAL and 'ao' in texture_paths:
+        texture_types.append('ao')
+    return texture_types
+
+def get_texture_key(texture_type, content_hash):
+    """Return the key of a map: its content hash plus the colorspace it is loaded with."""
+    return f"{content_hash}:{MaterialConstants.TEXTURE_COLOR_SPACES[texture_type]}"
+
+@profile_stage("texture hashing")
+def get_texture_keys(configuration, texture_paths, texture_data=None, images=None):
+    """Return {texture type: content hash + colorspace} for the maps the configuration uses."""
+    texture_keys = {}
+    for texture_type in get_texture_types(configuration, texture_paths, texture_data, images):
+        if texture_data is not None and texture_type in texture_data:
+            content_hash = compute_data_hash(texture_data[texture_type])
+        else:
+            content_hash = compute_file_hash(texture_paths[texture_type])
+        texture_keys[texture_type] = get_texture_key(texture_type, content_hash)
+    return texture_keys
+
+def get_material_key(texture_keys, ior, configuration):
+    """Return a key identifying a (texture set, IOR, configuration) combination."""
+    digest = hashlib.blake2b(digest_size=16)
+    for texture_type in sorted(texture_keys):
+        digest.update(f"{texture_type}={texture_keys[texture_type]};".encode('utf-8'))
+    digest.update(f"ior={ior:.6f};configuration={configuration}".encode('utf-8'))
+    return digest.hexdigest()
+
+@profile_stage("obj_import")
+def import_obj(obj_path, logger, fast_obj_reader=False, sidecar_dir=None):
+    """Import the .obj file and return the mesh objects it created, or None on failure.
+
+    With fast_obj_reader, Titancraft OBJs are read straight into a new mesh
+    (through a binary sidecar in sidecar_dir, if given) and anything else,
+    including OBJs with several objects, falls back to bpy.ops.wm.obj_import.
+    """
+    if fast_obj_reader:
+        obj = read_obj_object(obj_path, logger, sidecar_dir)
+        if obj is not None:
+            return [obj]
+
+    # The importer selects exactly the objects it creates, so the selection identifies them without scanning the scene
+    for selected in bpy.context.selected_objects:
+        selected.select_set(False)
     try:
         log_file_operation("Importing OBJ", obj_path, logger)
         bpy.ops.wm.obj_import(filepath=obj_path)
         logger.info(f"Successfully imported OBJ file")
     except Exception as e:
         log_operation_error("OBJ import", e, logger)
-        return {'CANCELLED'}
+        return None
 
-    # Ensure the imported object is selected and active
-    imported_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+    imported_objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
     if not imported_objects:
         logger.error("No mesh objects found after import")
-        return {'CANCELLED'}
-
-    obj = imported_objects[-1]  # Get the last imported object
-    obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
-    logger.debug(f"Selected imported object: {obj.name}")
-
-    # Create a new material
-    material = bpy.data.materials.new(name=MaterialConstants.MATERIAL_NAME)
-    material.use_nodes = True
-    bsdf = material.node_tree.nodes.get(MaterialConstants.PRINCIPLED_BSDF_NAME)
-
-    # Create texture nodes
-    tex_color_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-    tex_normals_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-    tex_metallic_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-    tex_roughness_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-    normal_map_node = material.node_tree.nodes.new('ShaderNodeNormalMap')
-
-    # Load textures
-    tex_color_node.image = bpy.data.images.load(texture_paths['color'])
-    tex_normals_node.image = bpy.data.images.load(texture_paths['normals'])
-    tex_metallic_node.image = bpy.data.images.load(texture_paths['metallic'])
-    tex_roughness_node.image = bpy.data.images.load(texture_paths['roughness'])
-    
-    # Load emissive texture if it exists
-    tex_emissive_node = None
-    math_multiply_node = None
-    if 'emissive' in texture_paths and os.path.exists(texture_paths['emissive']):
-        tex_emissive_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-        tex_emissive_node.image = bpy.data.images.load(texture_paths['emissive'])
-        tex_emissive_node.image.colorspace_settings.name = MaterialConstants.SRGB_COLOR_SPACE
-        
-        # Create multiply math node for emission strength
-        math_multiply_node = material.node_tree.nodes.new('ShaderNodeMath')
-        math_multiply_node.operation = 'MULTIPLY'
-        math_multiply_node.inputs[1].default_value = 10.0  # Default multiplier value
-
-    # Set the color space of the Normal map to Non-Color
-    tex_normals_node.image.colorspace_settings.name = MaterialConstants.NON_COLOR_SPACE
-    tex_metallic_node.image.colorspace_settings.name = MaterialConstants.NON_COLOR_SPACE
-    tex_roughness_node.image.colorspace_settings.name = MaterialConstants.NON_COLOR_SPACE
-
-    # Connect texture nodes to the Principled BSDF shader
-    material.node_tree.links.new(bsdf.inputs['Base Color'], tex_color_node.outputs['Color'])
-    material.node_tree.links.new(normal_map_node.inputs['Color'], tex_normals_node.outputs['Color'])
-    material.node_tree.links.new(bsdf.inputs['Normal'], normal_map_node.outputs['Normal'])
-    material.node_tree.links.new(bsdf.inputs['Metallic'], tex_metallic_node.outputs['Color'])
-    material.node_tree.links.new(bsdf.inputs['Roughness'], tex_roughness_node.outputs['Color'])
-    
-    # Connect emissive texture if it exists
-    if tex_emissive_node and math_multiply_node:
-        material.node_tree.links.new(bsdf.inputs['Emission Color'], tex_color_node.outputs['Color'])
-        material.node_tree.links.new(math_multiply_node.inputs[0], tex_emissive_node.outputs['Color'])
-        material.node_tree.links.new(bsdf.inputs['Emission Strength'], math_multiply_node.outputs['Value'])
-
-    if configuration != ImportConstants.CONFIGURATION_UNREAL:
-        tex_ao_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-        tex_ao_node.image = bpy.data.images.load(texture_paths['ao'])
-        tex_ao_node.image.colorspace_settings.name = MaterialConstants.NON_COLOR_SPACE
-
-        mix_rgb_node = material.node_tree.nodes.new('ShaderNodeMixRGB')
-        mix_rgb_node.blend_type = 'MULTIPLY'
-        material.node_tree.links.new(mix_rgb_node.inputs['Color1'], tex_color_node.outputs['Color'])
-        material.node_tree.links.new(mix_rgb_node.inputs['Color2'], tex_ao_node.outputs['Color'])
-        material.node_tree.links.new(bsdf.inputs['Base Color'], mix_rgb_node.outputs['Color'])
-
-    # Set the IOR
-    bsdf.inputs['IOR'].default_value = ior
-
-    # Arrange nodes
-    arrange_nodes(material.node_tree, logger)
-
-    # Assign material to the object
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
+        return None
+    return imported_objects
+
+def copy_material_template(texture_types, ior, logger=None):
+    """Return a new material copied from the template for these texture types, with its IOR set."""
+    material = get_material_template(texture_types, logger).copy()
+    material.name = MaterialConstants.MATERIAL_NAME
+    del material[MaterialConstants.TEMPLATE_PROPERTY]
+    material.node_tree.nodes[MaterialConstants.PRINCIPLED_BSDF_NAME].inputs['IOR'].default_value = ior
+    return material
+
+@profile_stage("build_material")
+def build_material(material_key, texture_keys, texture_paths, ior, configuration, logger, texture_data=None, images=None):
+    """Create the PBR material for the given textures by copying the matching template and filling in its images."""
+    material = copy_material_template(texture_keys, ior, logger)
+    nodes = material.node_tree.nodes
+    for texture_type, texture_key in texture_keys.items():
+        nodes[f"tex_{texture_type}"].image = load_texture_image(texture_type, texture_key, texture_paths, texture_data, images)
+
+    material[MaterialConstants.CONTENT_KEY_PROPERTY] = material_key
+    return material
+
+def apply_textures(obj_path, texture_paths, base_name, ior=MaterialConstants.DEFAULT_IOR, configuration=ImportConstants.CONFIGURATION_DEFAULT, operator=None, texture_data=None, objects=None, images=None, fast_obj_reader=False, sidecar_dir=None, lazy_textures=False, on_textures_loaded=None):
+    """Import the OBJ and build its PBR material for every imported object.
+
+    Pass objects (e.g. from import_obj) to skip the OBJ import, and images
+    to reuse already loaded textures. With lazy_textures, the material
+    starts with placeholder images and the maps are read in the background
+    and attached afterwards from a timer. on_textures_loaded(objects,
+    material) is called once the real maps are in place, straight away
+    unless they load lazily.
+    """
+    logger = get_logger(operator)
+    log_operation_start("texture application", logger)
 
-    # Set viewport shading to Material Preview
-    for area in bpy.context.screen.areas:
+    if objects is None:
+        objects = import_obj(obj_path, logger, fast_obj_reader, sidecar_dir)
+        if not objects:
+            return {'CANCELLED'}
+
+    # Ensure the imported objects are selected, with the first one active
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+    logger.debug("Selected %d imported objects", len(objects))
+
+    # Timers do not run in background mode, and in-memory or cached images are already at hand
+    lazy_textures = lazy_textures and texture_data is None and not images and not bpy.app.background
+    if lazy_textures:
+        from .lazy_textures import build_placeholder_material
+        texture_types = get_texture_types(configuration, texture_paths)
+        material = build_placeholder_material(texture_types, ior, logger)
+    else:
+        # Reuse an identical material (same textures, IOR and configuration) if one exists
+        texture_keys = get_texture_keys(configuration, texture_paths, texture_data, images)
+        material_key = get_material_key(texture_keys, ior, configuration)
+        material = find_datablock(bpy.data.materials, material_key)
+        if material is not None:
+            logger.info(f"Reusing existing material '{material.name}'")
+        else:
+            material = build_material(material_key, texture_keys, texture_paths, ior, configuration, logger, texture_data, images)
+
+    for obj in objects:
+        if obj.data.materials:
+            obj.data.materials[0] = material
+        else:
+            obj.data.materials.append(material)
+
+    # Set viewport shading to Material Preview (there is no screen in background mode)
+    screen = bpy.context.screen
+    for area in (screen.areas if screen else []):
         if area.type == ViewportConstants.VIEW_3D_AREA_TYPE:
             for space in area.spaces:
                 if space.type == ViewportConstants.VIEW_3D_AREA_TYPE:
                     space.shading.type = ViewportConstants.MATERIAL_PREVIEW_SHADING
 
+    if lazy_textures:
+        from .lazy_textures import start_texture_loader
+        start_texture_loader(material, objects, texture_types, texture_paths, ior, configuration, on_textures_loaded)
+    elif on_textures_loaded is not None:
+        on_textures_loaded(objects, material)
+
     log_operation_success("texture application", logger)
     return {'FINISHED'}
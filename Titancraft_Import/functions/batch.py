@@ -0,0 +1,144 @@
+import bpy  # type: ignore
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from .apply_textures import apply_textures, import_obj
+from .constants import FileConstants, ImportConstants, MaterialConstants, ScalingConstants
+from .image_ops import add_orm_texture
+from .io import ExtractionStats, extract_zip, get_file_paths, rename_imported_object
+from .logging_utils import get_logger, log_operation_start, log_operation_success, profile_stage
+from .resize import resize_object
+from .utils import check_files_exist
+from .validation import preflight_textures
+
+class PreparedAsset:
+    """Result of the bpy-independent preparation of a single archive."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.archive_bytes = 0
+        self.base_name = None
+        self.extract_to = None
+        self.obj_path = None
+        self.texture_paths = {}
+        self.stats = ExtractionStats()
+        self.error = None
+
+def collect_archive_paths(directory, filenames=None):
+    """Return the selected zip files, or every zip file in directory if none were selected."""
+    filenames = [name for name in (filenames or []) if name]
+    if not filenames:
+        filenames = sorted(name for name in os.listdir(directory) if name.lower().endswith(ImportConstants.ZIP_EXTENSION))
+    return [os.path.join(directory, name) for name in filenames]
+
+@profile_stage("prepare_archive")
+def prepare_archive(filepath, extract_root):
+    """Validate, extract and pre-flight one archive. Safe to run on a worker thread.
+
+    Member CRCs are verified while the members are streamed out, so the
+    archive is not read twice for validation.
+    """
+    logger = get_logger()
+    asset = PreparedAsset(filepath)
+    try:
+        asset.archive_bytes = os.path.getsize(filepath)
+        if not zipfile.is_zipfile(filepath):
+            asset.error = "not a valid zip archive"
+            return asset
+
+        asset.base_name, asset.extract_to = extract_zip(filepath, logger, asset.stats, extract_root)
+        asset.obj_path, asset.texture_paths = get_file_paths(asset.base_name, asset.extract_to, logger)
+        if not check_files_exist(asset.obj_path, asset.texture_paths, logger):
+            asset.error = "missing OBJ or texture files"
+            return asset
+
+        report = preflight_textures(asset.texture_paths, logger=logger)
+        if not report.ok:
+            asset.error = f"invalid textures ({'; '.join(report.errors)})"
+            return asset
+    except (OSError, zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError) as e:
+        # RuntimeError: encrypted member, NotImplementedError: unsupported compression method
+        asset.error = str(e)
+    return asset
+
+def create_asset_collection(name):
+    """Create a collection for one model under the scene collection and make it active."""
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+    view_layer = bpy.context.view_layer
+    view_layer.active_layer_collection = view_layer.layer_collection.children[collection.name]
+    return collection
+
+@profile_stage("import_prepared_asset")
+def import_prepared_asset(asset, ior=MaterialConstants.DEFAULT_IOR, configuration=ImportConstants.CONFIGURATION_DEFAULT, operator=None, pack_orm=False, fast_obj_reader=False, sidecar_dir=None, journal=None):
+    """Run the bpy-bound import steps for a prepared asset, recording what they create in journal if given. Main thread only."""
+    logger = get_logger(operator)
+
+    texture_paths = asset.texture_paths
+    if configuration == ImportConstants.CONFIGURATION_UNREAL and pack_orm:
+        texture_paths = add_orm_texture(texture_paths, asset.base_name, logger)
+
+    collection = create_asset_collection(asset.base_name)
+    if journal is not None:
+        journal.record_datablocks([collection])
+    objects = import_obj(asset.obj_path, logger, fast_obj_reader, sidecar_dir)
+    if not objects:
+        return {'CANCELLED'}
+    if journal is not None:
+        journal.record_objects(objects)
+    result = apply_textures(asset.obj_path, texture_paths, asset.base_name, ior, configuration, operator, objects=objects)
+    if result == {'CANCELLED'}:
+        return result
+
+    rename_imported_object(asset.base_name, objects, logger)
+    if configuration == ImportConstants.CONFIGURATION_UNREAL:
+        return resize_object(scale=ScalingConstants.UNREAL_ENGINE_SCALE, logger=logger, objects=objects)
+    return {'FINISHED'}
+
+def format_throughput(imported_assets, total_count, seconds):
+    """Summarise a batch run as models/sec and MB/sec of archive data."""
+    total_mb = sum(asset.archive_bytes for asset in imported_assets) / 1048576
+    seconds = max(seconds, 1e-6)
+    return (f"Imported {len(imported_assets)}/{total_count} models in {seconds:.2f}s "
+            f"({len(imported_assets) / seconds:.2f} models/sec, {total_mb / seconds:.1f} MB/sec)")
+
+def batch_import_steps(filepaths, ior, configuration, max_workers=ImportConstants.BATCH_MAX_WORKERS, operator=None, pack_orm=False, fast_obj_reader=False, sidecar_dir=None, journal=None):
+    """Run a batch import as a generator of steps, for modal operators.
+
+    Yields (done, total, label) while the archives are prepared and after
+    each imported model, and returns the imported assets.
+    """
+    logger = get_logger(operator)
+    start_time = time.perf_counter()
+    total = 2 * len(filepaths)
+
+    extract_root = os.path.join(bpy.app.tempdir, FileConstants.EXTRACT_DIRECTORY_NAME)
+    log_operation_start(f"preparation of {len(filepaths)} archives", logger)
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = [executor.submit(prepare_archive, filepath, extract_root) for filepath in filepaths]
+    try:
+        pending = set(futures)
+        while pending:
+            yield len(futures) - len(pending), total, "Preparing archives"
+            pending = wait(pending, timeout=ImportConstants.MODAL_STEP_INTERVAL, return_when=FIRST_COMPLETED).not_done
+    finally:
+        # A cancelled import stops the archives that have not started yet
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+    assets = [future.result() for future in futures]
+    log_operation_success(f"preparation of {len(filepaths)} archives", logger)
+
+    imported_assets = []
+    for index, asset in enumerate(assets):
+        if asset.error:
+            logger.error(f"Skipping {os.path.basename(asset.filepath)}: {asset.error}")
+            continue
+        yield len(filepaths) + index, total, f"Importing {os.path.basename(asset.filepath)}"
+        if import_prepared_asset(asset, ior, configuration, operator, pack_orm, fast_obj_reader, sidecar_dir, journal) == {'FINISHED'}:
+            imported_assets.append(asset)
+
+    logger.info(format_throughput(imported_assets, len(filepaths), time.perf_counter() - start_time))
+    return imported_assets
@@ -0,0 +1,214 @@
+import bpy  # type: ignore
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from .constants import CacheConstants, ImportConstants
+from .io import ExtractionStats, extract_members, resolve_base_name, select_members
+from .logging_utils import get_logger, log_file_operation, profile_stage
+
+class CacheStats:
+    """Hit, miss and eviction counters for the asset cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.library_hits = 0
+        self.evictions = 0
+        self.bytes_evicted = 0
+
+    def summary(self):
+        """Return a one-line human readable summary of the counters."""
+        return (f"Asset cache: {self.hits} hits ({self.library_hits} from .blend library), "
+                f"{self.misses} misses, {self.evictions} entries evicted "
+                f"({self.bytes_evicted / 1048576:.1f} MB)")
+
+# Counters for the current Blender session
+session_stats = CacheStats()
+
+def get_cache_directory():
+    """Return the persistent cache directory, creating it if needed."""
+    cache_dir = os.environ.get(CacheConstants.DIRECTORY_ENV_VAR)
+    if not cache_dir:
+        cache_dir = bpy.utils.user_resource('DATAFILES', path=CacheConstants.DIRECTORY_NAME, create=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def compute_content_key(base_name, members):
+    """Hash the base name and the CRC32 and size of every member needed for the import.
+
+    The CRCs come from the zip central directory, so the key reflects the
+    member contents without decompressing anything.
+    """
+    digest = hashlib.sha256(f"{CacheConstants.CACHE_VERSION}:{base_name}".encode('utf-8'))
+    for name in sorted(members):
+        info = members[name]
+        digest.update(f"|{name}:{info.CRC:08x}:{info.file_size}".encode('utf-8'))
+    return digest.hexdigest()
+
+def get_sidecar_directory(cache_dir=None):
+    """Return the directory for binary mesh sidecars inside the cache, creating it if needed."""
+    sidecar_dir = os.path.join(cache_dir or get_cache_directory(), CacheConstants.SIDECAR_DIRECTORY_NAME)
+    os.makedirs(sidecar_dir, exist_ok=True)
+    return sidecar_dir
+
+def get_baked_directory(cache_dir=None):
+    """Return the directory for baked textures inside the cache, creating it if needed."""
+    baked_dir = os.path.join(cache_dir or get_cache_directory(), CacheConstants.BAKED_DIRECTORY_NAME)
+    os.makedirs(baked_dir, exist_ok=True)
+    return baked_dir
+
+def get_entry_size(entry_dir):
+    """Return the total size in bytes of the files in a cache entry, including its preview and baked subfolders."""
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(entry_dir) for name in names)
+
+def evict_entries(cache_dir, size_limit_bytes, keep_key=None, stats=None):
+    """Remove least recently used entries, mesh sidecars and baked textures until the cache fits within size_limit_bytes."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and len(entry.name) == CacheConstants.KEY_LENGTH:
+            entries.append((entry.stat().st_mtime, entry.name, get_entry_size(entry.path)))
+    for directory_name, extension in ((CacheConstants.SIDECAR_DIRECTORY_NAME, CacheConstants.SIDECAR_EXTENSION), (CacheConstants.BAKED_DIRECTORY_NAME, ImportConstants.PNG_EXTENSION)):
+        file_dir = os.path.join(cache_dir, directory_name)
+        if not os.path.isdir(file_dir):
+            continue
+        for entry in os.scandir(file_dir):
+            if entry.is_file() and entry.name.endswith(extension):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, os.path.join(directory_name, entry.name), stat.st_size))
+
+    total_bytes = sum(size for _, _, size in entries)
+    for _, key, size in sorted(entries):
+        if total_bytes <= size_limit_bytes:
+            break
+        if key == keep_key:
+            continue
+        path = os.path.join(cache_dir, key)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        total_bytes -= size
+        if stats is not None:
+            stats.evictions += 1
+            stats.bytes_evicted += size
+
+@profile_stage("extract_zip_cached")
+def extract_zip_cached(filepath, logger=None, stats=None, size_limit_mb=CacheConstants.DEFAULT_SIZE_LIMIT_MB, cache_dir=None):
+    """Return the base name and a cache entry directory holding the extracted members.
+
+    On a miss the members are extracted into a temporary folder inside the
+    cache and renamed into place, so an interrupted import never leaves a
+    half-written entry behind.
+    """
+    if logger is None:
+        logger = get_logger()
+    if stats is None:
+        stats = ExtractionStats()
+    if cache_dir is None:
+        cache_dir = get_cache_directory()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    start_time = time.perf_counter()
+    base_name = resolve_base_name(filepath)
+    logger.debug(f"Base name: {base_name}")
+    log_file_operation("Looking up ZIP in asset cache", filepath, logger)
+
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        members = select_members(zip_ref, base_name)
+        key = compute_content_key(base_name, members)
+        entry_dir = os.path.join(cache_dir, key)
+
+        if os.path.isdir(entry_dir):
+            os.utime(entry_dir)  # Mark as most recently used
+            session_stats.hits += 1
+            logger.info(f"Asset cache hit for '{base_name}'")
+        else:
+            session_stats.misses += 1
+            logger.info(f"Asset cache miss for '{base_name}', extracting")
+            partial_dir = tempfile.mkdtemp(prefix=CacheConstants.PARTIAL_PREFIX, dir=cache_dir)
+            try:
+                extract_members(zip_ref, members, partial_dir, stats)
+                os.rename(partial_dir, entry_dir)
+            except OSError:
+                shutil.rmtree(partial_dir, ignore_errors=True)
+                if not os.path.isdir(entry_dir):  # Another import may have won the race
+                    raise
+            stats.members_total += len(members)
+
+    evict_entries(cache_dir, size_limit_mb * 1048576, key, session_stats)
+    stats.seconds += time.perf_counter() - start_time
+    return base_name, entry_dir
+
+def get_library_path(entry_dir):
+    """Return the path of the prebuilt .blend library for a cache entry."""
+    return os.path.join(entry_dir, CacheConstants.LIBRARY_FILE_NAME)
+
+@profile_stage("write_library")
+def write_library(entry_dir, objects, logger=None):
+    """Store the objects' meshes (without materials) and their textures as a .blend library."""
+    if logger is None:
+        logger = get_logger()
+
+    images = set()
+    meshes = []
+    for obj in objects:
+        for material in obj.data.materials:
+            if material and material.node_tree:
+                images.update(node.image for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image)
+        mesh = obj.data.copy()
+        mesh.name = obj.name
+        mesh.materials.clear()
+        meshes.append(mesh)
+
+    library_path = get_library_path(entry_dir)
+    partial_path = f"{library_path}{CacheConstants.PARTIAL_PREFIX}"
+    try:
+        bpy.data.libraries.write(partial_path, {*meshes, *images}, fake_user=True)
+        os.replace(partial_path, library_path)
+        log_file_operation("Wrote cache library", library_path, logger)
+    finally:
+        for mesh in meshes:
+            bpy.data.meshes.remove(mesh)
+
+@profile_stage("load_library")
+def load_library(entry_dir, base_name, logger=None):
+    """Append the cached meshes and images; return ([objects], {texture type: image}) or (None, None)."""
+    if logger is None:
+        logger = get_logger()
+
+    library_path = get_library_path(entry_dir)
+    if not os.path.exists(library_path):
+        return None, None
+
+    with bpy.data.libraries.load(library_path, link=False) as (data_from, data_to):
+        data_to.meshes = data_from.meshes
+        data_to.images = data_from.images
+    if not data_to.meshes:
+        return None, None
+
+    # Match on the full path, so images of derived maps (previews, ORM) never stand in for the extracted maps
+    image_paths = {os.path.normpath(os.path.join(entry_dir, f"{base_name}_{texture_type}{ImportConstants.PNG_EXTENSION}")): texture_type
+                   for texture_type in ImportConstants.TEXTURE_TYPES}
+    images = {}
+    for image in data_to.images:
+        texture_type = image_paths.get(os.path.normpath(bpy.path.abspath(image.filepath)))
+        if texture_type:
+            images[texture_type] = image
+
+    for datablock in (*data_to.meshes, *data_to.images):
+        datablock.use_fake_user = False
+
+    objects = []
+    for mesh in data_to.meshes:
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        bpy.context.collection.objects.link(obj)
+        objects.append(obj)
+    session_stats.library_hits += 1
+    log_file_operation("Appended meshes and images from cache library", library_path, logger)
+    return objects, images
@@ -1,7 +1,13 @@
 import bpy  # type: ignore
 from .constants import FileConstants
+from .logging_utils import profile_stage
 
-def cleanup_default_objects():
+@profile_stage("cleanup_default_objects")
+def cleanup_default_objects(journal=None):
+    """Remove the default cube, light and camera. With a journal they are only unlinked until the import commits."""
+    if journal is not None:
+        journal.detach_objects(FileConstants.DEFAULT_OBJECTS)
+        return
     bpy.ops.object.select_all(action='DESELECT')
     # Check and select objects if they exist
     for obj_name in FileConstants.DEFAULT_OBJECTS:
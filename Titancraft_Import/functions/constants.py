@@ -3,16 +3,90 @@ Constants for Titancraft Import add-on.
 Contains all magic numbers and configuration values used throughout the add-on.
 """
 
+# Logging Constants
+class LoggingConstants:
+    """Constants related to logging."""
+    # Environment variable that overrides the log level set in the add-on preferences
+    LOG_LEVEL_ENV_VAR = 'TITANCRAFT_LOG_LEVEL'
+    DEFAULT_LOG_LEVEL = 'INFO'
+    LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
+
 # Material and Shader Constants
 class MaterialConstants:
     """Constants related to materials and shaders."""
     DEFAULT_IOR = 1.05
     MATERIAL_NAME = "Material"
     PRINCIPLED_BSDF_NAME = "Principled BSDF"
+    MATERIAL_OUTPUT_NAME = "Material Output"
+    
+    # Emissive maps are multiplied by this for the emission strength
+    EMISSION_STRENGTH = 10.0
+    
+    # Factor of the Mix node that multiplies AO into the base color
+    AO_MIX_FACTOR = 0.5
+    
+    # Weights Blender uses to turn a linear color into a float (Rec. 709 luminance)
+    LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+    
+    # Template materials are built once per session and copied for each import;
+    # the leading dot keeps them out of the material lists
+    TEMPLATE_NAME_PREFIX = ".Titancraft Template "
+    TEMPLATE_PROPERTY = 'titancraft_template'
+    # Bump when the template node graph changes
+    TEMPLATE_VERSION = 1
     
     # Color space settings
     NON_COLOR_SPACE = 'Non-Color'
     SRGB_COLOR_SPACE = 'sRGB'
+    
+    # Color space per texture type
+    TEXTURE_COLOR_SPACES = {
+        'color': SRGB_COLOR_SPACE,
+        'emissive': SRGB_COLOR_SPACE,
+        'emission': SRGB_COLOR_SPACE,  # Baked color x emissive strength
+        'normals': NON_COLOR_SPACE,
+        'metallic': NON_COLOR_SPACE,
+        'roughness': NON_COLOR_SPACE,
+        'ao': NON_COLOR_SPACE,
+        'orm': NON_COLOR_SPACE,
+    }
+    
+    # Custom property used to find identical images and materials across imports
+    CONTENT_KEY_PROPERTY = 'titancraft_content_key'
+
+# Texture Processing Constants
+class TextureConstants:
+    """Constants related to generated texture variants."""
+    # Preview resolution choices (largest side in pixels); 'FULL' keeps the original maps
+    FULL_RESOLUTION = 'FULL'
+    PREVIEW_RESOLUTIONS = ['512', '1024', '2048']
+    
+    # Downscaled maps are written to e.g. 'preview_1024' next to the extracted files
+    PREVIEW_DIRECTORY_PREFIX = 'preview_'
+    
+    # Custom property on preview images pointing back at the full resolution file
+    FULL_RESOLUTION_PROPERTY = 'titancraft_full_resolution_path'
+    # On a preview ORM image: the full resolution AO, roughness and metallic files to pack on restore
+    ORM_SOURCE_TYPES = ('ao', 'roughness', 'metallic')
+    ORM_SOURCES_PROPERTY = 'titancraft_orm_sources'
+    
+    # Lazy loading: tiny placeholder images stand in until the real maps are attached
+    PLACEHOLDER_NAME_PREFIX = ".Titancraft Placeholder "
+    PLACEHOLDER_SIZE = 4
+    PLACEHOLDER_COLORS = {
+        'color': (0.5, 0.5, 0.5, 1.0),
+        'emissive': (0.0, 0.0, 0.0, 1.0),
+        'emission': (0.0, 0.0, 0.0, 1.0),
+        'normals': (0.5, 0.5, 1.0, 1.0),
+        'metallic': (0.0, 0.0, 0.0, 1.0),
+        'roughness': (0.5, 0.5, 0.5, 1.0),
+        'ao': (1.0, 1.0, 1.0, 1.0),
+        'orm': (1.0, 0.5, 0.0, 1.0),
+    }
+    # Threads reading and hashing maps in the background
+    LAZY_LOAD_MAX_WORKERS = 4
+    # Seconds between attaching maps, so the viewport redraws (and decodes) one map at a time
+    LAZY_LOAD_INTERVAL = 0.1
 
 # Scaling Constants
 class ScalingConstants:
@@ -23,6 +97,24 @@ class ScalingConstants:
     # Default scale (no scaling)
     DEFAULT_SCALE = (1.0, 1.0, 1.0)
 
+# Level of Detail Constants
+class LODConstants:
+    """Constants related to LOD generation."""
+    # Unreal Engine picks up LODs named <mesh>_LOD0 .. <mesh>_LODn
+    LOD_SUFFIX = "_LOD"
+    DEFAULT_LOD_COUNT = 3
+    MAX_LOD_COUNT = 7
+    
+    # Triangle ratio of each LOD relative to the previous one
+    DEFAULT_LOD_RATIO = 0.5
+    
+    DECIMATE_MODIFIER_NAME = "Titancraft LOD"
+    
+    # Set on each LOD copy: the LOD0 object it was decimated from, its level and its triangle ratio to LOD0
+    SOURCE_PROPERTY = 'titancraft_lod_source'
+    LEVEL_PROPERTY = 'titancraft_lod_level'
+    RATIO_PROPERTY = 'titancraft_lod_ratio'
+
 # Animation Constants
 class AnimationConstants:
     """Constants related to turntable animation."""
@@ -35,14 +127,45 @@ class AnimationConstants:
     TURNTABLE_ROTATION_START = (0, 0, 0)
     TURNTABLE_ROTATION_END = (0, 0, 6.28319)  # 360 degrees in radians
 
+# Render Constants
+class RenderConstants:
+    """Constants related to headless turntable rendering."""
+    # CLI engine names; EEVEE resolves to the engine ID of the running Blender version
+    ENGINES = {
+        'CYCLES': 'CYCLES',
+        'WORKBENCH': 'BLENDER_WORKBENCH',
+        'EEVEE': 'BLENDER_EEVEE_NEXT',
+    }
+    EEVEE_LEGACY_ENGINE = 'BLENDER_EEVEE'
+    DEFAULT_ENGINE = 'CYCLES'
+    DEFAULT_RESOLUTION = (1280, 720)
+    DEFAULT_SAMPLES = 64
+    
+    # Per-asset layout below the output directory: <model>/<model>.blend, <model>/frames/frame_0001.png
+    FRAMES_DIRECTORY_NAME = 'frames'
+    FRAME_NAME_FORMAT = 'frame_{:04d}.png'
+    # Frames are rendered to this name and renamed when complete, so a killed worker leaves no partial frame
+    PARTIAL_FRAME_SUFFIX = '.partial.png'
+    
+    # Assembled outputs
+    OUTPUT_VIDEO = 'video'
+    OUTPUT_SHEET = 'sheet'
+    VIDEO_SUFFIX = '_turntable.mp4'
+    SHEET_SUFFIX = '_sheet.png'
+    SHEET_FRAME_COUNT = 16
+    SHEET_COLUMNS = 4
+    SHEET_TILE_SIZE = 480  # Largest side of each frame in the sheet
+    ASSEMBLE_SCENE_NAME = "Titancraft Assemble"
+
 # Lighting Constants
 class LightingConstants:
     """Constants related to lighting setup."""
     LIGHT_ENERGY = 1000
     LIGHT_DISTANCE = 5
-    LIGHT_HEIGHT = 2
+    LIGHT_HEIGHT = 1
     
-    # Light positions for turntable (N, E, S, W)
+    # Light positions for turntable (N, E, S, W), relative to the model centre for the default camera distance;
+    # they are scaled with the fitted distance, and the energy with its square
     LIGHT_POSITIONS = [
         (0, -LIGHT_DISTANCE, LIGHT_HEIGHT),
         (LIGHT_DISTANCE, 0, LIGHT_HEIGHT),
@@ -57,6 +180,12 @@ class CameraConstants:
     TURNTABLE_CAMERA_ROTATION = (1.1, 0, 0)
     TURNTABLE_EMPTY_LOCATION = (0, 0, 1)
     
+    # Rig placement when there is nothing to frame, and the fit around the imported objects
+    DEFAULT_CAMERA_DISTANCE = 5.1
+    CAMERA_ELEVATION = 0.2  # Radians above the model centre
+    FIELD_OF_VIEW = 0.6911  # 50 mm lens on a 36 mm sensor
+    FIT_MARGIN = 1.15
+    
     # Camera constraint settings
     TRACK_AXIS = 'TRACK_NEGATIVE_Z'
     UP_AXIS = 'UP_Y'
@@ -72,6 +201,9 @@ class NodeConstants:
         'tex_ao': (-900, 275),
         'tex_roughness': (-900, -100),
         'tex_emissive': (-600, -400),
+        'tex_emission': (-600, -400),
+        'tex_orm': (-600, -100),
+        'separate_color': (-300, -100),
         'math_multiply': (-300, -200),
         'normal_map': (-300, 200),
         'mix_rgb': (-300, 400),
@@ -93,12 +225,76 @@ class FileConstants:
     TURNTABLE_CAMERA_NAME = "Turntable_Camera"
     TURNTABLE_EMPTY_NAME = "Turntable_Empty"
     TURNTABLE_LIGHT_PREFIX = "Turntable_Light_"
+    TURNTABLE_COLLECTION_NAME = "Turntable"
+    TURNTABLE_LIGHT_DATA_NAME = "Turntable_Light"
+    
+    # Per-import extraction folders are created under this temp subdirectory
+    EXTRACT_DIRECTORY_NAME = 'titancraft_import'
+
+# Asset Cache Constants
+class CacheConstants:
+    """Constants related to the persistent asset cache."""
+    # Bump to invalidate every existing cache entry
+    CACHE_VERSION = 1
+    
+    DIRECTORY_NAME = 'titancraft_import_cache'
+    DIRECTORY_ENV_VAR = 'TITANCRAFT_CACHE_DIR'
+    LIBRARY_FILE_NAME = 'asset.blend'
+    PARTIAL_PREFIX = '.partial-'
+    
+    # Entries are named after the hex SHA-256 content key
+    KEY_LENGTH = 64
+    
+    # Least recently used entries are evicted above this size
+    DEFAULT_SIZE_LIMIT_MB = 2048
+    
+    # Binary mesh sidecars live in this cache subdirectory, named after the OBJ content hash
+    SIDECAR_DIRECTORY_NAME = 'meshes'
+    SIDECAR_EXTENSION = '.tcmesh'
+    # Bump when the sidecar layout changes
+    SIDECAR_VERSION = 1
+    
+    # Textures with AO and emission baked in live in this cache subdirectory, named after their source hashes
+    BAKED_DIRECTORY_NAME = 'baked'
+    # Bump when the baking changes
+    BAKED_VERSION = 1
+
+# Re-import Constants
+class ReimportConstants:
+    """Custom properties that let a later zip revision update an imported model in place."""
+    BASE_NAME_PROPERTY = 'titancraft_base_name'
+    # Name of the object in the OBJ, before the import renamed it
+    SOURCE_OBJECT_PROPERTY = 'titancraft_source_object'
+    # Member file name -> CRC32 and size from the zip's central directory
+    MEMBER_SIGNATURES_PROPERTY = 'titancraft_member_signatures'
 
 # Viewport Constants
 class ViewportConstants:
     """Constants related to viewport settings."""
     MATERIAL_PREVIEW_SHADING = 'MATERIAL'
     VIEW_3D_AREA_TYPE = 'VIEW_3D'
+    VIEWPORT_COMPOSITOR = 'ALWAYS'
+    # Set on a screen once its 3D viewports got compositing, so later imports skip it
+    COMPOSITOR_SET_PROPERTY = 'titancraft_viewport_compositor'
+
+# Glow Compositor Constants
+class GlowConstants:
+    """Constants related to the glow compositor."""
+    # The glare node is found by name, so later imports reuse the chain instead of rebuilding it
+    GLARE_NODE_NAME = "Titancraft Glare"
+    GLARE_NODE_LABEL = "Titancraft Glow"
+    GLARE_TYPE = 'BLOOM'
+    
+    # Glare quality per preset: Low computes the glare at a lower resolution
+    QUALITY_PREVIEW = 'PREVIEW'
+    QUALITY_FINAL = 'FINAL'
+    GLARE_QUALITIES = {
+        QUALITY_PREVIEW: 'LOW',
+        QUALITY_FINAL: 'HIGH',
+    }
+    
+    # Spacing of the nodes the glow stage adds
+    NODE_SPACING = 300
 
 # Import Configuration Constants
 class ImportConstants:
@@ -110,7 +306,26 @@ class ImportConstants:
     # Supported texture types
     TEXTURE_TYPES = ['color', 'normals', 'metallic', 'roughness', 'ao', 'emissive']
     
+    # Texture types a model may ship without
+    OPTIONAL_TEXTURE_TYPES = ['emissive']
+    
     # File extensions
     OBJ_EXTENSION = '.obj'
+    MTL_EXTENSION = '.mtl'
     ZIP_EXTENSION = '.zip'
     PNG_EXTENSION = '.png'
+    
+    # Upper bound for the batch import preparation thread pool
+    BATCH_MAX_WORKERS = 8
+    
+    # Upper bound for the texture pre-flight thread pool (one map per thread)
+    PREFLIGHT_MAX_WORKERS = 6
+    
+    # Zip members are streamed to disk in chunks of this size (bytes)
+    EXTRACT_CHUNK_SIZE = 1024 * 1024
+    
+    # The fast OBJ reader parses the file in chunks of this size (bytes)
+    OBJ_READ_CHUNK_SIZE = 16 * 1024 * 1024
+    
+    # Seconds between the steps of a cancellable (modal) import
+    MODAL_STEP_INTERVAL = 0.05
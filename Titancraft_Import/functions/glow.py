@@ -1,58 +1,99 @@
 import bpy  # type: ignore
-from .logging_utils import get_logger, log_operation_start, log_operation_success
+from .constants import GlowConstants, ViewportConstants
+from .logging_utils import get_logger, log_operation_start, log_operation_success, profile_stage
 
-def setup_glow_compositor(operator=None):
-    """Setup compositor with bloom/glow effect."""
-    logger = get_logger(operator)
-    log_operation_start("glow compositor setup", logger)
-    
-    # Enable use nodes in the compositor
-    bpy.context.scene.use_nodes = True
-    logger.info("Enabled compositor nodes")
-    
-    # Turn on realtime compositing
-    bpy.context.scene.render.use_compositing = True
-    logger.info("Enabled realtime compositing")
-    
-    # Enable viewport compositing shading (Always)
-    # Set for all workspaces (Layout, Shading, etc.)
+def enable_viewport_compositing(logger):
+    """Set compositing to 'Always' in the 3D viewports of every workspace, once per screen.
+
+    Screens that were already handled are marked and skipped, so a user who
+    turns viewport compositing off again keeps that choice. Returns the
+    number of screens changed.
+    """
+    changed = 0
     for workspace in bpy.data.workspaces:
         for screen in workspace.screens:
+            if screen.get(ViewportConstants.COMPOSITOR_SET_PROPERTY):
+                continue
             for area in screen.areas:
-                if area.type == 'VIEW_3D':
+                if area.type == ViewportConstants.VIEW_3D_AREA_TYPE:
                     for space in area.spaces:
-                        if space.type == 'VIEW_3D':
-                            space.shading.use_compositor = 'ALWAYS'
-                            logger.info(f"Enabled viewport compositing to 'ALWAYS' for workspace: {workspace.name}")
-                            break
-    
-    # Get the compositor node tree
-    node_tree = bpy.context.scene.node_tree
+                        if space.type == ViewportConstants.VIEW_3D_AREA_TYPE:
+                            space.shading.use_compositor = ViewportConstants.VIEWPORT_COMPOSITOR
+            screen[ViewportConstants.COMPOSITOR_SET_PROPERTY] = True
+            changed += 1
+    if changed:
+        logger.info(f"Enabled viewport compositing in {changed} screens")
+    return changed
+
+def find_node(nodes, bl_idname):
+    return next((node for node in nodes if node.bl_idname == bl_idname), None)
+
+def add_node(nodes, bl_idname, location):
+    node = nodes.new(type=bl_idname)
+    node.location = location
+    return node
+
+@profile_stage("setup_glow_compositor")
+def setup_glow_compositor(operator=None, quality=GlowConstants.QUALITY_FINAL):
+    """Add a bloom Glare node in front of the Composite output, keeping the rest of the compositor.
+
+    An existing Titancraft glare chain is reused and only missing nodes and
+    links are added. Whatever fed the Composite node before now feeds the
+    glare, so a user's own compositor setup stays intact. quality picks the
+    glare preset in GlowConstants.GLARE_QUALITIES.
+    """
+    logger = get_logger(operator)
+    log_operation_start("glow compositor setup", logger)
+
+    scene = bpy.context.scene
+    if not scene.use_nodes:
+        scene.use_nodes = True
+        logger.info("Enabled compositor nodes")
+    scene.render.use_compositing = True
+    if not bpy.app.background:  # There are no viewports to composite in background mode
+        enable_viewport_compositing(logger)
+
+    node_tree = scene.node_tree
     nodes = node_tree.nodes
     links = node_tree.links
-    
-    # Clear existing nodes
-    nodes.clear()
-    
-    # Create Render Layers node
-    render_layers_node = nodes.new(type='CompositorNodeRLayers')
-    render_layers_node.location = (0, 0)
-    logger.debug("Created Render Layers node")
-    
-    # Create Glare node and set to Fog Glow
-    glare_node = nodes.new(type='CompositorNodeGlare')
-    glare_node.glare_type = 'BLOOM'
-    glare_node.location = (300, 0)
-    logger.info("Created Glare node with BLOOM type")
-    
-    # Create Composite node
-    composite_node = nodes.new(type='CompositorNodeComposite')
-    composite_node.location = (600, 0)
-    logger.debug("Created Composite node")
-    
-    # Link nodes together
-    links.new(render_layers_node.outputs['Image'], glare_node.inputs['Image'])
-    links.new(glare_node.outputs['Image'], composite_node.inputs['Image'])
-    logger.info("Connected compositor nodes")
-    
+    spacing = GlowConstants.NODE_SPACING
+    added = []
+
+    glare_node = nodes.get(GlowConstants.GLARE_NODE_NAME)
+    composite_node = find_node(nodes, 'CompositorNodeComposite')
+    if composite_node is None:
+        composite_node = add_node(nodes, 'CompositorNodeComposite', (spacing, 0))
+        added.append("Composite")
+    image_input = composite_node.inputs['Image']
+    source_link = image_input.links[0] if image_input.is_linked else None
+
+    if glare_node is None or source_link is None or source_link.from_node != glare_node:
+        if glare_node is None:
+            glare_node = add_node(nodes, 'CompositorNodeGlare', (composite_node.location.x, composite_node.location.y))
+            glare_node.name = GlowConstants.GLARE_NODE_NAME
+            glare_node.label = GlowConstants.GLARE_NODE_LABEL
+            glare_node.glare_type = GlowConstants.GLARE_TYPE
+            composite_node.location.x += spacing
+            added.append("Glare")
+
+        if not glare_node.inputs['Image'].is_linked:
+            # The glare goes after whatever fed the output, or straight after the render
+            if source_link is not None:
+                source = source_link.from_socket
+            else:
+                render_layers_node = find_node(nodes, 'CompositorNodeRLayers')
+                if render_layers_node is None:
+                    render_layers_node = add_node(nodes, 'CompositorNodeRLayers', (glare_node.location.x - spacing, glare_node.location.y))
+                    added.append("Render Layers")
+                source = render_layers_node.outputs['Image']
+            links.new(source, glare_node.inputs['Image'])
+        links.new(glare_node.outputs['Image'], image_input)
+
+    if hasattr(glare_node, 'quality'):
+        glare_node.quality = GlowConstants.GLARE_QUALITIES[quality]
+
+    if added:
+        logger.info(f"Added {', '.join(added)} compositor nodes with {quality.lower()} glare quality")
+    else:
+        logger.debug("Glow compositor already set up")
     log_operation_success("glow compositor setup", logger)
@@ -0,0 +1,253 @@
+import bpy  # type: ignore
+import hashlib
+import numpy as np  # type: ignore
+import os
+from .constants import CacheConstants, ImportConstants, MaterialConstants, TextureConstants
+from .logging_utils import get_logger, log_file_operation, profile_stage
+from .png_utils import read_png_header
+from .utils import compute_file_hash
+
+def srgb_to_linear(values):
+    """Convert sRGB encoded values in [0, 1] to linear."""
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(values):
+    """Convert linear values in [0, 1] to sRGB encoding."""
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1.0 / 2.4) - 0.055)
+
+def read_image_pixels(image):
+    """Return an image's pixels as a (height, width, 4) float32 array."""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def load_pixels(path, texture_type):
+    """Decode a PNG through Blender and return its pixels in a space that is safe to filter.
+
+    Color maps are returned linear, normal maps as unit vectors in [-1, 1],
+    and data maps unchanged.
+    """
+    image = bpy.data.images.load(path)
+    try:
+        image.colorspace_settings.name = MaterialConstants.TEXTURE_COLOR_SPACES[texture_type]
+        pixels = read_image_pixels(image)
+        is_float = image.is_float
+    finally:
+        bpy.data.images.remove(image)
+
+    if MaterialConstants.TEXTURE_COLOR_SPACES[texture_type] == MaterialConstants.SRGB_COLOR_SPACE and not is_float:
+        pixels[..., :3] = srgb_to_linear(pixels[..., :3])
+    elif texture_type == 'normals':
+        pixels[..., :3] = pixels[..., :3] * 2.0 - 1.0
+    return pixels
+
+def save_pixels(pixels, path, texture_type):
+    """Encode pixels produced by load_pixels back into an 8-bit PNG."""
+    pixels = pixels.copy()
+    if MaterialConstants.TEXTURE_COLOR_SPACES[texture_type] == MaterialConstants.SRGB_COLOR_SPACE:
+        pixels[..., :3] = linear_to_srgb(pixels[..., :3])
+    elif texture_type == 'normals':
+        pixels[..., :3] = pixels[..., :3] * 0.5 + 0.5
+
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(os.path.basename(path), width, height, alpha=True)
+    try:
+        image.pixels.foreach_set(np.clip(pixels, 0.0, 1.0).ravel())
+        image.filepath_raw = path
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+def downsample_half(pixels):
+    """Halve the resolution with a 2x2 box filter, replicating the edge for odd sizes."""
+    height, width = pixels.shape[:2]
+    if height % 2 or width % 2:
+        pixels = np.pad(pixels, ((0, height % 2), (0, width % 2), (0, 0)), mode='edge')
+    height, width = pixels.shape[:2]
+    return pixels.reshape(height // 2, 2, width // 2, 2, pixels.shape[2]).mean(axis=(1, 3))
+
+def downscale_pixels(pixels, max_resolution, texture_type):
+    """Halve repeatedly (like a mip chain) until the largest side fits max_resolution."""
+    while max(pixels.shape[:2]) > max_resolution:
+        pixels = downsample_half(pixels)
+        if texture_type == 'normals':
+            # Averaged normals get shorter; renormalise so the shading keeps its strength
+            length = np.linalg.norm(pixels[..., :3], axis=2, keepdims=True)
+            pixels[..., :3] /= np.maximum(length, 1e-6)
+    return pixels
+
+@profile_stage("preview textures")
+def get_preview_texture_paths(texture_paths, max_resolution, logger=None):
+    """Return texture paths with maps larger than max_resolution swapped for downscaled copies.
+
+    The copies are written once into a folder next to the extracted files
+    and reused by later imports from the same folder (e.g. the asset cache).
+    """
+    if logger is None:
+        logger = get_logger()
+
+    preview_paths = {}
+    for texture_type, path in texture_paths.items():
+        header = read_png_header(path) if os.path.exists(path) else None
+        if header is None or max(header['width'], header['height']) <= max_resolution:
+            preview_paths[texture_type] = path
+            continue
+
+        preview_dir = os.path.join(os.path.dirname(path), f"{TextureConstants.PREVIEW_DIRECTORY_PREFIX}{max_resolution}")
+        preview_path = os.path.join(preview_dir, os.path.basename(path))
+        if not os.path.exists(preview_path):
+            os.makedirs(preview_dir, exist_ok=True)
+            pixels = downscale_pixels(load_pixels(path, texture_type), max_resolution, texture_type)
+            save_pixels(pixels, preview_path, texture_type)
+            log_file_operation(f"Wrote {pixels.shape[1]}x{pixels.shape[0]} preview", preview_path, logger)
+        preview_paths[texture_type] = preview_path
+    return preview_paths
+
+def tag_full_resolution_paths(material, preview_paths, texture_paths):
+    """Record the full-resolution file on each preview image of the material.
+
+    An ORM map packed from previews is tagged with the full-resolution ORM
+    path next to the source maps and with the maps to pack it from.
+    """
+    full_paths = {bpy.path.abspath(preview_paths[texture_type]): path for texture_type, path in texture_paths.items() if preview_paths[texture_type] != path}
+    orm_sources = None
+    if 'orm' in preview_paths and 'orm' not in texture_paths:
+        orm_sources = [texture_paths[texture_type] for texture_type in TextureConstants.ORM_SOURCE_TYPES]
+        if any(bpy.path.abspath(preview_paths[texture_type]) in full_paths for texture_type in TextureConstants.ORM_SOURCE_TYPES):
+            full_orm_path = os.path.join(os.path.dirname(texture_paths['metallic']), os.path.basename(preview_paths['orm']))
+            full_paths[bpy.path.abspath(preview_paths['orm'])] = full_orm_path
+
+    for node in material.node_tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.image:
+            full_path = full_paths.get(bpy.path.abspath(node.image.filepath))
+            if full_path:
+                node.image[TextureConstants.FULL_RESOLUTION_PROPERTY] = full_path
+                if node.name == 'tex_orm':
+                    node.image[TextureConstants.ORM_SOURCES_PROPERTY] = orm_sources
+
+def restore_full_resolution(images, logger=None):
+    """Swap preview images back to their full-resolution files. Returns the number restored."""
+    if logger is None:
+        logger = get_logger()
+
+    restored = 0
+    for image in images:
+        full_path = image.get(TextureConstants.FULL_RESOLUTION_PROPERTY)
+        if not full_path:
+            continue
+        orm_sources = image.get(TextureConstants.ORM_SOURCES_PROPERTY)
+        if orm_sources is not None and not os.path.exists(full_path):
+            try:
+                write_orm_texture(list(orm_sources), full_path, logger)
+            except (RuntimeError, ValueError) as e:
+                logger.warning(f"Could not pack the full resolution ORM texture: {e}")
+                continue
+        if not os.path.exists(full_path):
+            logger.warning(f"Full resolution texture is missing: {full_path}")
+            continue
+        image.filepath = full_path
+        image.reload()
+        # The content changed, so the image must not be shared as the preview any more
+        image[MaterialConstants.CONTENT_KEY_PROPERTY] = f"{compute_file_hash(full_path)}:{image.colorspace_settings.name}"
+        del image[TextureConstants.FULL_RESOLUTION_PROPERTY]
+        if orm_sources is not None:
+            del image[TextureConstants.ORM_SOURCES_PROPERTY]
+        log_file_operation("Restored full resolution texture", full_path, logger)
+        restored += 1
+    return restored
+
+def pack_orm_pixels(ao, roughness, metallic):
+    """Pack AO, roughness and metallic (first channel of each) into one RGBA array."""
+    shapes = {ao.shape[:2], roughness.shape[:2], metallic.shape[:2]}
+    if len(shapes) > 1:
+        raise ValueError(f"AO, roughness and metallic maps have different sizes: {sorted(shapes)}")
+    packed = np.ones(ao.shape[:2] + (4,), dtype=np.float32)
+    packed[..., 0] = ao[..., 0]
+    packed[..., 1] = roughness[..., 0]
+    packed[..., 2] = metallic[..., 0]
+    return packed
+
+def write_orm_texture(source_paths, orm_path, logger):
+    """Pack the AO, roughness and metallic files (in that order) into an ORM file. Raises RuntimeError or ValueError."""
+    packed = pack_orm_pixels(*(load_pixels(path, texture_type) for path, texture_type in zip(source_paths, TextureConstants.ORM_SOURCE_TYPES)))
+    save_pixels(packed, orm_path, 'orm')
+    log_file_operation("Wrote packed ORM texture", orm_path, logger)
+
+@profile_stage("pack ORM texture")
+def add_orm_texture(texture_paths, base_name, logger=None):
+    """Return texture paths with a channel-packed ORM map (AO, Roughness, Metallic) added.
+
+    The map is written next to the source maps and reused if it already
+    exists. On failure the original paths are returned unchanged.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    orm_path = os.path.join(os.path.dirname(texture_paths['metallic']), f"{base_name}_orm{ImportConstants.PNG_EXTENSION}")
+    if not os.path.exists(orm_path):
+        try:
+            write_orm_texture([texture_paths[texture_type] for texture_type in TextureConstants.ORM_SOURCE_TYPES], orm_path, logger)
+        except (RuntimeError, ValueError) as e:
+            logger.warning(f"Could not pack ORM texture, using separate maps: {e}")
+            return texture_paths
+    return {**texture_paths, 'orm': orm_path}
+
+def bake_base_color_pixels(color, ao):
+    """Multiply AO into linear color pixels the way the template's Mix node does."""
+    if color.shape[:2] != ao.shape[:2]:
+        raise ValueError(f"color and AO maps have different sizes: {color.shape[:2]} and {ao.shape[:2]}")
+    baked = color.copy()
+    baked[..., :3] *= 1.0 - MaterialConstants.AO_MIX_FACTOR + MaterialConstants.AO_MIX_FACTOR * ao[..., :3]
+    return baked
+
+def bake_emission_pixels(color, emissive):
+    """Multiply linear color pixels by the emissive luminance, as the Emission Color and Strength inputs combine them."""
+    if color.shape[:2] != emissive.shape[:2]:
+        raise ValueError(f"color and emissive maps have different sizes: {color.shape[:2]} and {emissive.shape[:2]}")
+    baked = color.copy()
+    baked[..., :3] *= (emissive[..., :3] @ np.asarray(MaterialConstants.LUMINANCE_WEIGHTS, dtype=np.float32))[..., np.newaxis]
+    return baked
+
+def get_baked_path(baked_dir, texture_type, source_paths):
+    """Return the cache path of a baked map, named after the hashes of its source maps."""
+    digest = hashlib.blake2b(f"{CacheConstants.BAKED_VERSION}:{texture_type}".encode('utf-8'), digest_size=16)
+    for path in source_paths:
+        digest.update(compute_file_hash(path).encode('utf-8'))
+    return os.path.join(baked_dir, f"{texture_type}_{digest.hexdigest()}{ImportConstants.PNG_EXTENSION}")
+
+@profile_stage("bake textures")
+def add_baked_textures(texture_paths, baked_dir, logger=None):
+    """Return texture paths with AO multiplied into the color map and the emission precomputed.
+
+    'color' points at the baked color and 'ao' is dropped; 'emissive' is
+    replaced by an 'emission' map holding color times emissive strength.
+    Baked maps are reused by any later import of the same source maps.
+    On failure the original paths are returned unchanged.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    bakes = [('color', bake_base_color_pixels, ('color', 'ao'))]
+    if 'emissive' in texture_paths and os.path.exists(texture_paths['emissive']):
+        bakes.append(('emission', bake_emission_pixels, ('color', 'emissive')))
+
+    baked_paths = {texture_type: path for texture_type, path in texture_paths.items() if texture_type not in ('ao', 'emissive')}
+    for texture_type, bake, source_types in bakes:
+        path = get_baked_path(baked_dir, texture_type, [texture_paths[source_type] for source_type in source_types])
+        if os.path.exists(path):
+            os.utime(path)  # Keep it recent for cache eviction
+        else:
+            try:
+                pixels = bake(*(load_pixels(texture_paths[source_type], source_type) for source_type in source_types))
+            except (RuntimeError, ValueError) as e:
+                logger.warning(f"Could not bake textures, using the separate maps: {e}")
+                return texture_paths
+            partial_path = f"{path}{CacheConstants.PARTIAL_PREFIX}"
+            save_pixels(pixels, partial_path, texture_type)
+            os.replace(partial_path, path)
+            log_file_operation(f"Wrote baked {texture_type} texture", path, logger)
+        baked_paths[texture_type] = path
+    return baked_paths
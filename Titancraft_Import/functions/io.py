@@ -1,28 +1,165 @@
 import bpy  # type: ignore
 import os
+import posixpath
+import shutil
+import tempfile
+import time
 import zipfile
 from .constants import FileConstants, ImportConstants
-from .logging_utils import get_logger, log_file_operation, log_operation_start, log_operation_success
+from .logging_utils import get_logger, log_file_operation, log_operation_start, log_operation_success, profile_stage
 from .utils import get_subdirectory_path
 
-def extract_zip(filepath, logger=None):
-    """Extract zip file to Blender's temp directory."""
+class ExtractionStats:
+    """Byte and time counters for a single archive extraction."""
+
+    def __init__(self):
+        self.members_total = 0
+        self.members_extracted = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.bytes_in_memory = 0
+        self.seconds = 0.0
+
+    def summary(self):
+        """Return a one-line human readable summary of the counters."""
+        summary = (f"Extracted {self.members_extracted}/{self.members_total} members: "
+                   f"{self.bytes_written / 1048576:.1f} MB written, "
+                   f"{self.bytes_skipped / 1048576:.1f} MB skipped")
+        if self.bytes_in_memory:
+            summary += f", {self.bytes_in_memory / 1048576:.1f} MB read into memory instead of written"
+        return f"{summary} in {self.seconds:.2f}s"
+
+def resolve_base_name(filepath):
+    """Derive the model base name from the zip file name."""
+    zip_filename = os.path.splitext(os.path.basename(filepath))[0]
+    return '_'.join(zip_filename.split('_')[:-1])  # Join all parts except the last one
+
+def get_member_names(base_name):
+    """Return the file names an import of base_name needs from the archive."""
+    names = [
+        f"{base_name}{ImportConstants.OBJ_EXTENSION}",
+        f"{base_name}{ImportConstants.MTL_EXTENSION}",
+    ]
+    names.extend(f"{base_name}_{texture_type}{ImportConstants.PNG_EXTENSION}" for texture_type in ImportConstants.TEXTURE_TYPES)
+    return names
+
+def select_members(zip_ref, base_name):
+    """Pick the archive members needed for base_name from the central directory.
+
+    Returns a dict of file name -> ZipInfo. When a name appears more than once,
+    the shallowest member wins so that flat and single-subdirectory layouts
+    both resolve to the model files rather than nested extras.
+    """
+    wanted = set(get_member_names(base_name))
+    selected = {}
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        name = posixpath.basename(info.filename)
+        if name not in wanted:
+            continue
+        current = selected.get(name)
+        if current is None or info.filename.count('/') < current.filename.count('/'):
+            selected[name] = info
+    return selected
+
+def get_member_signatures(members):
+    """Return file name -> 'crc32:size' for the selected members, read from the central directory only."""
+    return {name: f"{info.CRC:08x}:{info.file_size}" for name, info in members.items()}
+
+def read_member_signatures(filepath, base_name):
+    """Return the member signatures of the files an import of base_name uses from the archive."""
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        return get_member_signatures(select_members(zip_ref, base_name))
+
+def create_extract_directory(base_name, root=None):
+    """Create a fresh per-import directory below Blender's temp directory."""
+    if root is None:
+        root = os.path.join(bpy.app.tempdir, FileConstants.EXTRACT_DIRECTORY_NAME)
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"{base_name}_", dir=root)
+
+def extract_members(zip_ref, members, extract_to, stats=None):
+    """Stream the given members into extract_to in fixed-size chunks."""
+    for name, info in members.items():
+        with zip_ref.open(info) as source, open(os.path.join(extract_to, name), 'wb') as target:
+            shutil.copyfileobj(source, target, ImportConstants.EXTRACT_CHUNK_SIZE)
+        if stats is not None:
+            stats.members_extracted += 1
+            stats.bytes_written += info.file_size
+
+@profile_stage("extract_zip")
+def extract_zip(filepath, logger=None, stats=None, extract_root=None):
+    """Extract the members needed for the model into a per-import temp directory.
+
+    Pass extract_root to avoid reading bpy.app.tempdir, e.g. from a worker thread.
+    """
     if logger is None:
         logger = get_logger()
+    if stats is None:
+        stats = ExtractionStats()
     
-    extract_to = bpy.app.tempdir
+    start_time = time.perf_counter()
+    base_name = resolve_base_name(filepath)
+    logger.debug(f"Base name: {base_name}")
     log_file_operation("Extracting ZIP", filepath, logger)
-    logger.debug(f"Extracting to: {extract_to}")
-    
+
     with zipfile.ZipFile(filepath, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+        members = select_members(zip_ref, base_name)
+        extract_to = create_extract_directory(base_name, extract_root)
+        logger.debug(f"Extracting to: {extract_to}")
+        extract_members(zip_ref, members, extract_to, stats)
 
-    zip_filename = os.path.splitext(os.path.basename(filepath))[0]
-    base_name = '_'.join(zip_filename.split('_')[:-1])  # Join all parts except the last one
-    logger.debug(f"Base name: {base_name}")
+    stats.members_total += len(infos)
+    stats.bytes_skipped += sum(info.file_size for info in infos) - sum(info.file_size for info in members.values())
+    stats.seconds += time.perf_counter() - start_time
+    logger.info(stats.summary())
 
     return base_name, extract_to
 
+@profile_stage("read_zip_in_memory")
+def read_zip_in_memory(filepath, logger=None, stats=None):
+    """Read the textures into memory and extract only the OBJ to a per-import temp directory.
+
+    Returns the base name, the extraction directory and a dict of texture type -> PNG bytes.
+    The MTL is left in the archive so the OBJ importer does not load the textures from disk.
+    """
+    if logger is None:
+        logger = get_logger()
+    if stats is None:
+        stats = ExtractionStats()
+    
+    start_time = time.perf_counter()
+    base_name = resolve_base_name(filepath)
+    logger.debug(f"Base name: {base_name}")
+    log_file_operation("Reading ZIP into memory", filepath, logger)
+
+    obj_name = f"{base_name}{ImportConstants.OBJ_EXTENSION}"
+    texture_data = {}
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+        members = select_members(zip_ref, base_name)
+        extract_to = create_extract_directory(base_name)
+        logger.debug(f"Extracting OBJ to: {extract_to}")
+        used = {name: info for name, info in members.items() if name == obj_name}
+        extract_members(zip_ref, used, extract_to, stats)
+
+        for texture_type in ImportConstants.TEXTURE_TYPES:
+            name = f"{base_name}_{texture_type}{ImportConstants.PNG_EXTENSION}"
+            info = members.get(name)
+            if info is not None:
+                texture_data[texture_type] = zip_ref.read(info)
+                stats.bytes_in_memory += info.file_size
+                used[name] = info
+
+    stats.members_total += len(infos)
+    stats.bytes_skipped += sum(info.file_size for info in infos) - sum(info.file_size for info in used.values())
+    stats.seconds += time.perf_counter() - start_time
+    logger.info(stats.summary())
+
+    return base_name, extract_to, texture_data
+
 def get_file_paths(base_name, extract_to, logger=None):
     """Get file paths for OBJ and texture files."""
     if logger is None:
@@ -63,12 +200,14 @@ def rename_collection(old_name, new_name, logger=None):
         bpy.data.collections[old_name].name = new_name
         logger.info(f"Renamed collection '{old_name}' to '{new_name}'")
 
-def rename_imported_object(new_name, logger=None):
-    """Rename the last imported mesh object."""
+def rename_imported_object(new_name, objects, logger=None):
+    """Rename the imported objects: a single object gets new_name, several keep their own name behind it as a suffix."""
     if logger is None:
         logger = get_logger()
     
-    imported_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
-    if imported_objects:
-        imported_objects[-1].name = new_name
-        logger.info(f"Renamed imported object to '{new_name}'")
+    if len(objects) == 1:
+        objects[0].name = new_name
+    else:
+        for obj in objects:
+            obj.name = f"{new_name}_{obj.name}"
+    logger.info(f"Renamed {len(objects)} imported objects to '{new_name}'")
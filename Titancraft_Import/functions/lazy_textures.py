@@ -0,0 +1,123 @@
+import bpy  # type: ignore
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .apply_textures import copy_material_template, find_datablock, get_material_key, get_texture_key, load_texture_image
+from .constants import MaterialConstants, TextureConstants
+from .logging_utils import get_logger, log_progress, profile_stage
+from .utils import compute_file_hash
+
+def get_placeholder_image(texture_type):
+    """Return the shared placeholder image for a texture type, creating it on first use."""
+    name = f"{TextureConstants.PLACEHOLDER_NAME_PREFIX}{texture_type}"
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, TextureConstants.PLACEHOLDER_SIZE, TextureConstants.PLACEHOLDER_SIZE, alpha=True)
+        image.generated_color = TextureConstants.PLACEHOLDER_COLORS[texture_type]
+        image.colorspace_settings.name = MaterialConstants.TEXTURE_COLOR_SPACES[texture_type]
+    return image
+
+@profile_stage("build_placeholder_material")
+def build_placeholder_material(texture_types, ior, logger=None):
+    """Create the material straight away, with placeholder images in every texture node."""
+    material = copy_material_template(texture_types, ior, logger)
+    for texture_type in texture_types:
+        material.node_tree.nodes[f"tex_{texture_type}"].image = get_placeholder_image(texture_type)
+    return material
+
+class TextureLoader:
+    """Reads and hashes maps on worker threads and attaches them to a material from a timer.
+
+    bpy is only touched on the main thread: the workers read each file
+    (which also warms the OS cache for Blender's own decode) and compute
+    its content key; the timer attaches one map per tick, so the viewport
+    redraws, and decodes, one map at a time instead of freezing for all
+    of them. The material is looked up by name on every tick, so an undo
+    or a removed material stops the loader instead of touching freed data.
+    """
+
+    def __init__(self, material, objects, texture_types, texture_paths, ior, configuration, on_complete=None):
+        self.material_name = material.name
+        self.object_names = [obj.name for obj in objects]
+        self.texture_paths = {texture_type: texture_paths[texture_type] for texture_type in texture_types}
+        self.ior = ior
+        self.configuration = configuration
+        self.on_complete = on_complete
+        self.texture_keys = {}
+        self.failed = []
+        self.results = queue.Queue()
+        self.start_time = time.perf_counter()
+        self.logger = get_logger()  # The operator is gone by the time the timer runs
+        self.executor = ThreadPoolExecutor(max_workers=min(TextureConstants.LAZY_LOAD_MAX_WORKERS, len(self.texture_paths)))
+        for texture_type, path in self.texture_paths.items():
+            self.executor.submit(self.read_texture, texture_type, path)
+
+    def read_texture(self, texture_type, path):
+        """Worker thread: hash the map and queue the result for the main thread."""
+        try:
+            self.results.put((texture_type, compute_file_hash(path), None))
+        except OSError as e:
+            self.results.put((texture_type, None, str(e)))
+
+    def stop(self):
+        self.executor.shutdown(wait=False)
+        bpy.context.window_manager.progress_end()
+
+    def tick(self):
+        """Timer callback: attach the next finished map. Returns the next interval, or None when done."""
+        material = bpy.data.materials.get(self.material_name)
+        if material is None or material.node_tree is None:
+            self.logger.warning("Material '%s' was removed before its textures finished loading", self.material_name)
+            self.stop()
+            return None
+
+        try:
+            texture_type, content_hash, error = self.results.get_nowait()
+        except queue.Empty:
+            return TextureConstants.LAZY_LOAD_INTERVAL
+
+        if error:
+            self.failed.append(texture_type)
+            self.logger.error("Could not load %s texture, keeping the placeholder: %s", texture_type, error)
+        else:
+            texture_key = get_texture_key(texture_type, content_hash)
+            self.texture_keys[texture_type] = texture_key
+            material.node_tree.nodes[f"tex_{texture_type}"].image = load_texture_image(texture_type, texture_key, self.texture_paths)
+
+        done, total = len(self.texture_keys) + len(self.failed), len(self.texture_paths)
+        log_progress(done, total, "Loading textures", self.logger, bpy.context.window_manager)
+        if done < total:
+            return TextureConstants.LAZY_LOAD_INTERVAL
+        self.finish(material)
+        return None
+
+    def finish(self, material):
+        """Share an identical existing material if there is one, then report completion."""
+        self.stop()
+        if self.failed:
+            return
+
+        objects = [bpy.data.objects.get(name) for name in self.object_names]
+        users = [obj for obj in objects if obj is not None and any(slot_material == material for slot_material in obj.data.materials)]
+        material_key = get_material_key(self.texture_keys, self.ior, self.configuration)
+        existing = find_datablock(bpy.data.materials, material_key)
+        if existing is not None:
+            for obj in users:
+                for index, slot_material in enumerate(obj.data.materials):
+                    if slot_material == material:
+                        obj.data.materials[index] = existing
+            bpy.data.materials.remove(material)
+            material = existing
+            self.logger.info("Reusing existing material '%s'", material.name)
+        else:
+            material[MaterialConstants.CONTENT_KEY_PROPERTY] = material_key
+
+        self.logger.info("Loaded %d textures in the background in %.2fs", len(self.texture_keys), time.perf_counter() - self.start_time)
+        if self.on_complete is not None and users:
+            self.on_complete(users, material)
+
+def start_texture_loader(material, objects, texture_types, texture_paths, ior, configuration, on_complete=None):
+    """Start loading the real maps for the placeholder material of objects in the background."""
+    loader = TextureLoader(material, objects, texture_types, texture_paths, ior, configuration, on_complete)
+    bpy.app.timers.register(loader.tick, first_interval=0)
+    return loader
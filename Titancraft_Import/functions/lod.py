@@ -0,0 +1,108 @@
+import bpy  # type: ignore
+import numpy as np  # type: ignore
+import time
+from .constants import LODConstants
+from .logging_utils import get_logger, log_operation_start, log_operation_success, profile_stage
+
+def count_triangles(mesh):
+    """Return the triangle count of a mesh, counting an n-gon as n - 2 triangles."""
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+    return int(np.sum(loop_totals - 2))
+
+def get_lod_name(name, level):
+    """Return the Unreal LOD name of an object, e.g. 'Knight_LOD2'."""
+    return f"{name}{LODConstants.LOD_SUFFIX}{level}"
+
+def get_lod_copies(objects):
+    """Return the LOD copies generated from the given objects."""
+    sources = set(objects)
+    return [obj for obj in bpy.data.objects if obj.get(LODConstants.SOURCE_PROPERTY) in sources]
+
+def decimate_copies(copies):
+    """Replace each copy's mesh with its source mesh decimated to the copy's ratio. Returns the total triangle count.
+
+    Every copy gets a Decimate modifier, the depsgraph is evaluated once,
+    and the evaluated meshes replace the copies' data.
+    """
+    for copy in copies:
+        # The copy shares the full mesh until the decimated one replaces it
+        copy.data = copy[LODConstants.SOURCE_PROPERTY].data
+        copy.modifiers.clear()
+        modifier = copy.modifiers.new(LODConstants.DECIMATE_MODIFIER_NAME, 'DECIMATE')
+        modifier.ratio = copy[LODConstants.RATIO_PROPERTY]
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    triangles = 0
+    for copy in copies:
+        mesh = bpy.data.meshes.new_from_object(copy.evaluated_get(depsgraph))
+        mesh.name = copy.name
+        copy.modifiers.clear()
+        copy.data = mesh
+        triangles += count_triangles(mesh)
+    return triangles
+
+@profile_stage("generate_lods")
+def generate_lods(objects, lod_count=LODConstants.DEFAULT_LOD_COUNT, ratio=LODConstants.DEFAULT_LOD_RATIO, logger=None):
+    """Add decimated copies of the objects as LOD1..LODn next to them and rename the objects to LOD0.
+
+    LODn keeps ratio ** n of the triangles, decimated from the full mesh.
+    Each level is built for all objects at once. The copies remember their
+    source and ratio, so rebuild_lods() can refresh them after the source
+    changes. Returns {level: [objects]}.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    log_operation_start("LOD generation", logger)
+    names = [obj.name for obj in objects]
+    source_triangles = sum(count_triangles(obj.data) for obj in objects)
+    for obj, name in zip(objects, names):
+        obj.name = get_lod_name(name, 0)
+    logger.info("LOD0: %d triangles", source_triangles)
+
+    lods = {0: list(objects)}
+    for level in range(1, lod_count + 1):
+        start_time = time.perf_counter()
+        copies = []
+        for obj, name in zip(objects, names):
+            copy = bpy.data.objects.new(get_lod_name(name, level), obj.data)
+            copy.matrix_world = obj.matrix_world
+            for collection in obj.users_collection:
+                collection.objects.link(copy)
+            copy[LODConstants.SOURCE_PROPERTY] = obj
+            copy[LODConstants.LEVEL_PROPERTY] = level
+            copy[LODConstants.RATIO_PROPERTY] = ratio ** level
+            copies.append(copy)
+
+        triangles = decimate_copies(copies)
+        for copy in copies:
+            # The levels overlap the full mesh, in the viewport and in renders
+            copy.hide_set(True)
+            copy.hide_render = True
+
+        lods[level] = copies
+        logger.info("LOD%d: %d triangles (%.1f%% of LOD0) in %.2fs", level, triangles, 100.0 * triangles / max(source_triangles, 1), time.perf_counter() - start_time)
+
+    log_operation_success("LOD generation", logger)
+    return lods
+
+@profile_stage("rebuild_lods")
+def rebuild_lods(objects, logger=None):
+    """Decimate the existing LOD copies of the objects again from their current meshes. Returns the number of copies rebuilt."""
+    if logger is None:
+        logger = get_logger()
+
+    copies = get_lod_copies(objects)
+    if not copies:
+        return 0
+    old_meshes = {copy.data for copy in copies}
+    start_time = time.perf_counter()
+    triangles = decimate_copies(copies)
+    for mesh in old_meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+    for copy in copies:
+        copy.data.name = copy.name  # The old mesh held the name until it was removed
+    logger.info("Rebuilt %d LOD copies (%d triangles) in %.2fs", len(copies), triangles, time.perf_counter() - start_time)
+    return len(copies)
@@ -4,58 +4,272 @@ Provides proper error reporting and logging functionality.
 """
 
 import bpy  # type: ignore
+import contextlib
+import functools
+import json
 import logging
-from typing import Optional, Union
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from .constants import LoggingConstants
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# The add-on logs through its own logger and handler so Blender's root logger is left alone
 logger = logging.getLogger(__name__)
 
+LOG_LEVEL_ENV_VAR = LoggingConstants.LOG_LEVEL_ENV_VAR
+DEFAULT_LOG_LEVEL = LoggingConstants.DEFAULT_LOG_LEVEL
+LOG_LEVELS = LoggingConstants.LOG_LEVELS
+
+# Name of the add-on package, under which Blender keeps its preferences
+ADDON_PACKAGE = __package__.rpartition('.')[0]
+
+# When True, info/success messages are collected and sent to the UI as one report per operator run
+_batch_ui_reports = True
+
+def configure_logging(level: Optional[str] = None, batch_ui_reports: bool = True) -> None:
+    """Set the add-on log level (the environment variable wins) and the UI report batching."""
+    global _batch_ui_reports
+    level = os.environ.get(LOG_LEVEL_ENV_VAR) or level or DEFAULT_LOG_LEVEL
+    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s:Titancraft: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    _batch_ui_reports = batch_ui_reports
+
+def configure_from_preferences() -> None:
+    """Configure logging from the saved add-on preferences, or the defaults when the add-on is not registered (e.g. in cli.py)."""
+    try:
+        addon = bpy.context.preferences.addons.get(ADDON_PACKAGE)
+    except AttributeError:
+        addon = None
+    preferences = addon.preferences if addon else None
+    if preferences is None:
+        configure_logging()
+    else:
+        configure_logging(preferences.log_level, preferences.batch_ui_reports)
+
+# Runs on the first import, which is the first import run rather than add-on registration
+configure_from_preferences()
+
+# Environment variable that turns profiling on for every import
+PROFILE_ENV_VAR = 'TITANCRAFT_PROFILE'
+
+def _read_peak_rss() -> Optional[int]:
+    """Return the peak resident set size of the process in bytes, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+def _read_io_counters() -> Optional[Dict[str, int]]:
+    """Return bytes read and written by the process so far (Linux only)."""
+    try:
+        with open('/proc/self/io', 'r') as io_file:
+            counters = dict(line.split(': ') for line in io_file.read().splitlines())
+        return {'read': int(counters['rchar']), 'written': int(counters['wchar'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+class Profiler:
+    """Collects timing and resource spans for the stages of one import."""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Record wall time, CPU time, peak RSS growth and I/O bytes for a block."""
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        start_rss = _read_peak_rss()
+        start_io = _read_io_counters()
+        try:
+            yield
+        finally:
+            end_rss = _read_peak_rss()
+            end_io = _read_io_counters()
+            self.spans.append({
+                'name': name,
+                'thread': threading.get_ident(),
+                'start': start_wall - self.origin,
+                'wall': time.perf_counter() - start_wall,
+                'cpu': time.process_time() - start_cpu,
+                'peak_rss_delta': end_rss - start_rss if start_rss is not None else None,
+                'bytes_read': end_io['read'] - start_io['read'] if start_io and end_io else None,
+                'bytes_written': end_io['written'] - start_io['written'] if start_io and end_io else None,
+            })
+
+    def summary_table(self) -> str:
+        """Return the spans as a fixed-width text table, in start order."""
+        def megabytes(value: Optional[int]) -> str:
+            return f"{value / 1048576:.1f}" if value is not None else "-"
+
+        lines = [f"{'Stage':<28} {'Wall s':>8} {'CPU s':>8} {'RSS+ MB':>8} {'Read MB':>8} {'Write MB':>8}"]
+        for span in sorted(self.spans, key=lambda span: span['start']):
+            lines.append(f"{span['name']:<28} {span['wall']:>8.3f} {span['cpu']:>8.3f} {megabytes(span['peak_rss_delta']):>8} "
+                         f"{megabytes(span['bytes_read']):>8} {megabytes(span['bytes_written']):>8}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str) -> None:
+        """Write the spans as a Chrome trace (chrome://tracing, Perfetto) JSON file."""
+        events = [{
+            'name': span['name'],
+            'ph': 'X',
+            'pid': os.getpid(),
+            'tid': span['thread'],
+            'ts': span['start'] * 1e6,
+            'dur': span['wall'] * 1e6,
+            'args': {key: span[key] for key in ('cpu', 'peak_rss_delta', 'bytes_read', 'bytes_written')},
+        } for span in self.spans]
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+# Profiler of the import in progress; None when profiling is off
+_active_profiler: Optional[Profiler] = None
+_null_span = contextlib.nullcontext()
+
+def profile_stage(name: str) -> Callable:
+    """Decorator recording each call of a pipeline stage while profiling is active."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return func(*args, **kwargs)
+            with _active_profiler.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def is_profiling_requested(enabled: bool = False) -> bool:
+    """Return True if profiling is enabled by the caller or the environment."""
+    return enabled or os.environ.get(PROFILE_ENV_VAR, '') not in ('', '0')
+
 class TitancraftLogger:
-    """Custom logger for Titancraft Import add-on."""
+    """Custom logger for Titancraft Import add-on.
+
+    Messages accept %-style arguments that are only formatted when the
+    message is actually emitted. Info and success messages for an operator
+    are queued and sent as one report by flush_reports(); warnings and
+    errors are reported immediately.
+    """
     
     def __init__(self, operator_instance: Optional[bpy.types.Operator] = None):
         self.operator = operator_instance
+        self.pending_reports: List[str] = []
+    
+    def span(self, name: str):
+        """Context manager recording a stage on the active profiler; a no-op when profiling is off."""
+        if _active_profiler is None:
+            return _null_span
+        return _active_profiler.span(name)
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """Return True if messages of the given logging level are emitted; use to guard costly arguments."""
+        return logger.isEnabledFor(level)
+    
+    def _report(self, report_type: str, message: str) -> None:
+        if report_type == 'INFO' and _batch_ui_reports:
+            self.pending_reports.append(message)
+        else:
+            self.operator.report({report_type}, message)
     
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args: Any) -> None:
         """Log info message and report to Blender if operator available."""
+        if self.operator is None and not logger.isEnabledFor(logging.INFO):
+            return
+        message = message % args if args else message
         logger.info(message)
         if self.operator:
-            self.operator.report({'INFO'}, message)
+            self._report('INFO', message)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args: Any) -> None:
         """Log warning message and report to Blender if operator available."""
+        message = message % args if args else message
         logger.warning(message)
         if self.operator:
-            self.operator.report({'WARNING'}, message)
+            self._report('WARNING', message)
     
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args: Any) -> None:
         """Log error message and report to Blender if operator available."""
+        message = message % args if args else message
         logger.error(message)
         if self.operator:
-            self.operator.report({'ERROR'}, message)
+            self._report('ERROR', message)
     
-    def debug(self, message: str) -> None:
+    def debug(self, message: str, *args: Any) -> None:
         """Log debug message (only to console, not Blender UI)."""
-        logger.debug(message)
+        logger.debug(message, *args)
     
-    def success(self, message: str) -> None:
+    def success(self, message: str, *args: Any) -> None:
         """Log success message and report to Blender if operator available."""
-        logger.info(f"SUCCESS: {message}")
+        if self.operator is None and not logger.isEnabledFor(logging.INFO):
+            return
+        message = message % args if args else message
+        logger.info("SUCCESS: %s", message)
         if self.operator:
-            self.operator.report({'INFO'}, f"✓ {message}")
+            self._report('INFO', f"✓ {message}")
+    
+    def flush_reports(self) -> None:
+        """Send the queued info messages to Blender as a single report.
+
+        The last message goes first, since it is the one shown in the status bar.
+        """
+        if self.operator and self.pending_reports:
+            self.operator.report({'INFO'}, "\n".join([self.pending_reports[-1], *self.pending_reports[:-1]]))
+        self.pending_reports.clear()
+
+@contextlib.contextmanager
+def profiling_session(enabled: bool, logger: TitancraftLogger, name: str = "import") -> Iterator[Optional[Profiler]]:
+    """Profile the enclosed import, then report a summary table and write a Chrome trace.
+
+    Yields None and does nothing when profiling is off.
+    """
+    global _active_profiler
+    if not is_profiling_requested(enabled):
+        yield None
+        return
+
+    profiler = Profiler()
+    _active_profiler = profiler
+    try:
+        with profiler.span(name):
+            yield profiler
+    finally:
+        _active_profiler = None
+        trace_path = os.path.join(bpy.app.tempdir, f"titancraft_profile_{name}_{int(time.time())}.json")
+        profiler.write_trace(trace_path)
+        logger.info(f"Import profile (trace written to {trace_path}):\n{profiler.summary_table()}")
 
 def get_logger(operator_instance: Optional[bpy.types.Operator] = None) -> TitancraftLogger:
-    """Get a logger instance, optionally with operator for Blender reporting."""
-    return TitancraftLogger(operator_instance)
+    """Get a logger instance, optionally with operator for Blender reporting.
+
+    Every call for the same operator returns the same logger, so its queued reports are shared.
+    """
+    if operator_instance is None:
+        return TitancraftLogger()
+    operator_logger = getattr(operator_instance, '_titancraft_logger', None)
+    if operator_logger is None:
+        operator_logger = TitancraftLogger(operator_instance)
+        operator_instance._titancraft_logger = operator_logger
+    return operator_logger
 
 def log_operation_start(operation_name: str, logger: TitancraftLogger) -> None:
     """Log the start of an operation."""
-    logger.info(f"Starting {operation_name}...")
+    logger.info("Starting %s...", operation_name)
 
 def log_operation_success(operation_name: str, logger: TitancraftLogger) -> None:
     """Log successful completion of an operation."""
-    logger.success(f"{operation_name} completed successfully")
+    logger.success("%s completed successfully", operation_name)
 
 def log_operation_error(operation_name: str, error: Union[str, Exception], logger: TitancraftLogger) -> None:
     """Log an operation error."""
@@ -64,13 +278,14 @@ def log_operation_error(operation_name: str, error: Union[str, Exception], logge
 
 def log_file_operation(operation: str, file_path: str, logger: TitancraftLogger) -> None:
     """Log file operations with path information."""
-    logger.debug(f"{operation}: {file_path}")
-
-def log_node_operation(node_name: str, operation: str, logger: TitancraftLogger) -> None:
-    """Log node operations in material editor."""
-    logger.debug(f"Node '{node_name}': {operation}")
+    logger.debug("%s: %s", operation, file_path)
 
-def log_progress(current: int, total: int, operation: str, logger: TitancraftLogger) -> None:
-    """Log progress for long operations."""
-    percentage = (current / total) * 100
-    logger.debug(f"{operation}: {current}/{total} ({percentage:.1f}%)")
+def log_progress(current: int, total: int, operation: str, logger: TitancraftLogger, window_manager: Optional[bpy.types.WindowManager] = None) -> None:
+    """Log progress for long operations, and show it on the window manager's progress indicator if given."""
+    logger.debug("%s: %d/%d (%.1f%%)", operation, current, total, (current / total) * 100)
+    if window_manager is not None:
+        if current >= total:
+            window_manager.progress_end()
+        else:
+            window_manager.progress_begin(0, total)
+            window_manager.progress_update(current)
@@ -0,0 +1,91 @@
+import bpy  # type: ignore
+from .constants import MaterialConstants, NodeConstants
+from .logging_utils import get_logger, profile_stage
+
+def get_template_variant(texture_types):
+    """Return the template variant name for the set of maps a material uses."""
+    parts = ['AO' if 'ao' in texture_types else 'NoAO', 'ORM' if 'orm' in texture_types else 'MR']
+    if 'emissive' in texture_types:
+        parts.append('Emissive')
+    elif 'emission' in texture_types:
+        parts.append('BakedEmission')
+    return '_'.join(parts)
+
+def add_node(nodes, node_type, name):
+    """Add a node named after its NODE_POSITIONS entry, at that position."""
+    node = nodes.new(node_type)
+    node.name = name
+    node.location = NodeConstants.NODE_POSITIONS[name]
+    return node
+
+@profile_stage("build_material_template")
+def build_template(name, variant, texture_types):
+    """Build the PBR node graph once, with empty image nodes named tex_<texture type>."""
+    material = bpy.data.materials.new(name=name)
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    bsdf = nodes.get(MaterialConstants.PRINCIPLED_BSDF_NAME)
+    bsdf.location = NodeConstants.NODE_POSITIONS['bsdf']
+    nodes.get(MaterialConstants.MATERIAL_OUTPUT_NAME).location = NodeConstants.NODE_POSITIONS['output']
+
+    texture_nodes = {texture_type: add_node(nodes, 'ShaderNodeTexImage', f"tex_{texture_type}") for texture_type in texture_types}
+    normal_map_node = add_node(nodes, 'ShaderNodeNormalMap', 'normal_map')
+    links.new(bsdf.inputs['Base Color'], texture_nodes['color'].outputs['Color'])
+    links.new(normal_map_node.inputs['Color'], texture_nodes['normals'].outputs['Color'])
+    links.new(bsdf.inputs['Normal'], normal_map_node.outputs['Normal'])
+
+    if 'orm' in texture_nodes:
+        # Channel-packed ORM map: AO in R (unused here), Roughness in G, Metallic in B
+        separate_color_node = add_node(nodes, 'ShaderNodeSeparateColor', 'separate_color')
+        links.new(separate_color_node.inputs['Color'], texture_nodes['orm'].outputs['Color'])
+        links.new(bsdf.inputs['Roughness'], separate_color_node.outputs['Green'])
+        links.new(bsdf.inputs['Metallic'], separate_color_node.outputs['Blue'])
+    else:
+        links.new(bsdf.inputs['Metallic'], texture_nodes['metallic'].outputs['Color'])
+        links.new(bsdf.inputs['Roughness'], texture_nodes['roughness'].outputs['Color'])
+
+    if 'emissive' in texture_nodes:
+        # Multiply node for the emission strength
+        math_multiply_node = add_node(nodes, 'ShaderNodeMath', 'math_multiply')
+        math_multiply_node.operation = 'MULTIPLY'
+        math_multiply_node.inputs[1].default_value = MaterialConstants.EMISSION_STRENGTH
+        links.new(bsdf.inputs['Emission Color'], texture_nodes['color'].outputs['Color'])
+        links.new(math_multiply_node.inputs[0], texture_nodes['emissive'].outputs['Color'])
+        links.new(bsdf.inputs['Emission Strength'], math_multiply_node.outputs['Value'])
+    elif 'emission' in texture_nodes:
+        # Baked emission map: color times emissive strength, so the strength is a constant
+        links.new(bsdf.inputs['Emission Color'], texture_nodes['emission'].outputs['Color'])
+        bsdf.inputs['Emission Strength'].default_value = MaterialConstants.EMISSION_STRENGTH
+
+    if 'ao' in texture_nodes:
+        mix_rgb_node = add_node(nodes, 'ShaderNodeMixRGB', 'mix_rgb')
+        mix_rgb_node.blend_type = 'MULTIPLY'
+        mix_rgb_node.inputs['Fac'].default_value = MaterialConstants.AO_MIX_FACTOR
+        links.new(mix_rgb_node.inputs['Color1'], texture_nodes['color'].outputs['Color'])
+        links.new(mix_rgb_node.inputs['Color2'], texture_nodes['ao'].outputs['Color'])
+        links.new(bsdf.inputs['Base Color'], mix_rgb_node.outputs['Color'])
+
+    material[MaterialConstants.TEMPLATE_PROPERTY] = f"{MaterialConstants.TEMPLATE_VERSION}:{variant}"
+    return material
+
+def get_material_template(texture_types, logger=None):
+    """Return the session's template material for this set of maps, building it on first use.
+
+    Templates are looked up by name, so the cost does not grow with the
+    number of materials in the file. A template from an older layout
+    version is rebuilt.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    variant = get_template_variant(texture_types)
+    name = f"{MaterialConstants.TEMPLATE_NAME_PREFIX}{variant}"
+    template = bpy.data.materials.get(name)
+    if template is not None and template.get(MaterialConstants.TEMPLATE_PROPERTY) == f"{MaterialConstants.TEMPLATE_VERSION}:{variant}":
+        return template
+    if template is not None:
+        bpy.data.materials.remove(template)
+
+    logger.debug("Building material template %s", name)
+    return build_template(name, variant, texture_types)
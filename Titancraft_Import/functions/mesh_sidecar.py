@@ -0,0 +1,101 @@
+"""
+Binary mesh sidecars for Titancraft Import add-on.
+
+A sidecar holds a parsed OBJ as little-endian arrays, already in the layout
+foreach_set expects, so a re-import memory-maps the file instead of parsing
+text. Layout, every section aligned to 16 bytes:
+
+    header    magic, version, face size, counts, name length, OBJ content hash
+    name      UTF-8 object name
+    positions float32 (vertices, 3), Blender axes
+    vertices  int32 (corners,), vertex index per corner
+    uvs       float32 (corners, 2)
+    normals   float32 (corners, 3), Blender axes
+"""
+
+import os
+import struct
+import tempfile
+import numpy as np  # type: ignore
+from .constants import CacheConstants
+
+SIDECAR_MAGIC = b'TCMESH\x00\x00'
+SIDECAR_HEADER = struct.Struct('<8sHHIII16s')  # magic, version, face size, vertex count, corner count, name length, hash
+SECTION_ALIGNMENT = 16
+
+class MeshArrays:
+    """Mesh data laid out the way foreach_set expects it: Blender axes, one UV and normal per corner."""
+
+    def __init__(self, name, face_size, positions, loop_vertices, loop_uvs, loop_normals):
+        self.name = name
+        self.face_size = face_size
+        self.positions = positions          # (vertices, 3) float32
+        self.loop_vertices = loop_vertices  # (corners,) int32
+        self.loop_uvs = loop_uvs            # (corners, 2) float32
+        self.loop_normals = loop_normals    # (corners, 3) float32
+
+    @property
+    def face_count(self):
+        return len(self.loop_vertices) // self.face_size
+
+def align(offset):
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+def get_sidecar_path(sidecar_dir, content_hash):
+    """Return the sidecar path for an OBJ with the given content hash."""
+    return os.path.join(sidecar_dir, f"{content_hash}{CacheConstants.SIDECAR_EXTENSION}")
+
+def get_sections(vertex_count, corner_count, name_length):
+    """Return [(offset, dtype, shape)] for the name and the four arrays, and the total file size."""
+    sections = []
+    offset = align(SIDECAR_HEADER.size)
+    for dtype, shape in (('u1', (name_length,)), ('<f4', (vertex_count, 3)), ('<i4', (corner_count,)),
+                         ('<f4', (corner_count, 2)), ('<f4', (corner_count, 3))):
+        sections.append((offset, dtype, shape))
+        offset = align(offset + np.dtype(dtype).itemsize * int(np.prod(shape)))
+    return sections, offset
+
+def write_sidecar(path, content_hash, arrays):
+    """Write mesh arrays to a sidecar, atomically."""
+    name = arrays.name.encode('utf-8')
+    sections, size = get_sections(len(arrays.positions), len(arrays.loop_vertices), len(name))
+    header = SIDECAR_HEADER.pack(SIDECAR_MAGIC, CacheConstants.SIDECAR_VERSION, arrays.face_size,
+                                 len(arrays.positions), len(arrays.loop_vertices), len(name), bytes.fromhex(content_hash))
+
+    # A unique partial file, so concurrent imports of the same OBJ never write into each other's file
+    descriptor, partial_path = tempfile.mkstemp(prefix=CacheConstants.PARTIAL_PREFIX, dir=os.path.dirname(path))
+    try:
+        with os.fdopen(descriptor, 'wb') as sidecar_file:
+            sidecar_file.write(header)
+            values = (np.frombuffer(name, dtype='u1'), arrays.positions, arrays.loop_vertices, arrays.loop_uvs, arrays.loop_normals)
+            for (offset, dtype, _), value in zip(sections, values):
+                sidecar_file.seek(offset)
+                sidecar_file.write(np.ascontiguousarray(value, dtype=dtype).tobytes())
+            sidecar_file.truncate(size)
+        os.replace(partial_path, path)
+    except OSError:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def read_sidecar(path, content_hash):
+    """Memory-map a sidecar and return MeshArrays viewing it, or None if it is missing, stale or damaged."""
+    try:
+        with open(path, 'rb') as sidecar_file:
+            header = sidecar_file.read(SIDECAR_HEADER.size)
+        magic, version, face_size, vertex_count, corner_count, name_length, stored_hash = SIDECAR_HEADER.unpack(header)
+    except (OSError, struct.error):
+        return None
+    if magic != SIDECAR_MAGIC or version != CacheConstants.SIDECAR_VERSION or stored_hash.hex() != content_hash or not face_size:
+        return None
+
+    sections, size = get_sections(vertex_count, corner_count, name_length)
+    if os.path.getsize(path) != size:
+        return None
+    mapped = np.memmap(path, dtype='u1', mode='r')
+    name, positions, loop_vertices, loop_uvs, loop_normals = (
+        mapped[offset:offset + np.dtype(dtype).itemsize * int(np.prod(shape))].view(dtype).reshape(shape)
+        for offset, dtype, shape in sections
+    )
+    os.utime(path)  # Mark as most recently used for cache eviction
+    return MeshArrays(name.tobytes().decode('utf-8', 'replace'), face_size, positions, loop_vertices, loop_uvs, loop_normals)
@@ -0,0 +1,216 @@
+import bpy  # type: ignore
+import numpy as np  # type: ignore
+from .constants import ImportConstants
+from .logging_utils import get_logger, log_file_operation, profile_stage
+from .mesh_sidecar import MeshArrays, get_sidecar_path, read_sidecar, write_sidecar
+from .utils import compute_file_hash
+
+# Records of the Titancraft export that carry no geometry; any other record sends the file to bpy.ops.wm.obj_import
+SKIPPED_RECORDS = (b'#', b'mtllib ', b'usemtl ', b's ', b'g ')
+
+class ObjData:
+    """Arrays parsed from an OBJ, with 0-based indices per face corner."""
+
+    def __init__(self):
+        self.name = None
+        self.positions = []
+        self.uvs = []
+        self.normals = []
+        self.corners = []  # (N, 3) arrays of position, uv and normal indices
+        self.face_size = None
+
+# Line types found from the first two bytes of each line
+OTHER, POSITION, UV, NORMAL, FACE = range(5)
+SPACE, SLASH, NEWLINE = ord(' '), ord('/'), ord('\n')
+
+def parse_numbers(text, mask, dtype, columns, count):
+    """Parse the bytes of text selected by mask into a (count, columns) array."""
+    values = np.fromstring(text[mask].tobytes(), dtype=dtype, sep=' ')
+    if values.size != count * columns:
+        raise ValueError(f"expected {columns} values per record")
+    return values.reshape(count, columns)
+
+def parse_chunk(chunk, data):
+    """Classify the lines of one chunk by record type and parse each type in one NumPy call.
+
+    Instead of splitting the chunk into millions of Python strings, line
+    starts are located in the raw bytes, record keywords and separators are
+    blanked out, and the bytes of each record type are parsed together.
+    """
+    if not chunk.endswith(b'\n'):
+        chunk += b'\n'
+    raw = np.frombuffer(chunk, dtype=np.uint8)
+    ends = np.flatnonzero(raw == NEWLINE)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    seconds = np.minimum(starts + 1, len(raw) - 1)  # An empty last line has no second byte
+    first, second = raw[starts], raw[seconds]
+
+    line_types = np.full(len(starts), OTHER, dtype=np.uint8)
+    line_types[(first == ord('v')) & (second == SPACE)] = POSITION
+    line_types[(first == ord('v')) & (second == ord('t'))] = UV
+    line_types[(first == ord('v')) & (second == ord('n'))] = NORMAL
+    line_types[(first == ord('f')) & (second == SPACE)] = FACE
+
+    # The few remaining lines (comments, object name, material and smoothing records) are checked one by one
+    for index in np.flatnonzero(line_types == OTHER):
+        line = chunk[starts[index]:ends[index]].strip()
+        if line.startswith(b'o '):
+            if data.name is not None:
+                raise ValueError("more than one object")
+            data.name = line[2:].strip().decode('utf-8', 'replace')
+        elif line and not line.startswith(SKIPPED_RECORDS):
+            raise ValueError(f"unsupported OBJ record '{line.split()[0].decode('utf-8', 'replace')}'")
+
+    byte_types = np.repeat(line_types, ends - starts + 1)
+    text = raw.copy()
+    text[starts] = SPACE
+    text[seconds] = SPACE  # vt/vn keywords are two bytes; v and f are followed by a space anyway
+    text[(text == SLASH) | (text == NEWLINE) | (text == ord('\r'))] = SPACE
+
+    counts = np.bincount(line_types, minlength=5)
+    # Titancraft writes vertex positions with three values (no vertex colors) and 2D texture coordinates
+    data.positions.append(parse_numbers(text, byte_types == POSITION, np.float32, 3, counts[POSITION]))
+    data.uvs.append(parse_numbers(text, byte_types == UV, np.float32, 2, counts[UV]))
+    data.normals.append(parse_numbers(text, byte_types == NORMAL, np.float32, 3, counts[NORMAL]))
+
+    if counts[FACE]:
+        face_lines = np.flatnonzero(line_types == FACE)
+        face_size = len(chunk[starts[face_lines[0]]:ends[face_lines[0]]].split()) - 1
+        if data.face_size not in (None, face_size):
+            raise ValueError("faces with different corner counts")
+        data.face_size = face_size
+        # Every corner must be a full v/vt/vn triple: two slashes per corner and three indices
+        slashes = np.add.reduceat((raw == SLASH).astype(np.int32), starts)[face_lines]
+        if np.any(slashes != 2 * face_size):
+            raise ValueError("faces are not uniform v/vt/vn polygons")
+        indices = parse_numbers(text, byte_types == FACE, np.int64, 3, counts[FACE] * face_size)
+        data.corners.append(indices - 1)
+
+@profile_stage("read_obj")
+def read_obj(obj_path, chunk_size=ImportConstants.OBJ_READ_CHUNK_SIZE):
+    """Stream an OBJ in the Titancraft export format into NumPy arrays.
+
+    Raises ValueError for anything outside that format (several objects,
+    lines or curves, mixed polygon sizes, missing vt/vn indices, negative
+    indices, faces that repeat a vertex), so the caller can fall back to
+    Blender's importer.
+    """
+    data = ObjData()
+    with open(obj_path, 'rb') as obj_file:
+        remainder = b''
+        while True:
+            chunk = obj_file.read(chunk_size)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            cut = chunk.rfind(b'\n') + 1  # Keep the trailing partial line for the next chunk
+            remainder = chunk[cut:]
+            parse_chunk(chunk[:cut], data)
+        if remainder:
+            parse_chunk(remainder, data)
+
+    data.positions = np.concatenate(data.positions)
+    data.uvs = np.concatenate(data.uvs)
+    data.normals = np.concatenate(data.normals)
+    if not data.corners:
+        raise ValueError("no faces")
+    data.corners = np.concatenate(data.corners)
+
+    limits = (len(data.positions), len(data.uvs), len(data.normals))
+    if data.corners.min() < 0 or any(data.corners[:, column].max() >= limit for column, limit in enumerate(limits)):
+        raise ValueError("face indices out of range")
+    # Blender's importer drops faces that use a vertex twice; built directly they would leave an invalid mesh
+    face_vertices = np.sort(data.corners[:, 0].reshape(-1, data.face_size), axis=1)
+    if data.face_size < 3 or np.any(face_vertices[:, 1:] == face_vertices[:, :-1]):
+        raise ValueError("degenerate faces")
+    return data
+
+def to_blender_axes(vectors):
+    """Convert OBJ Y-up coordinates to Blender Z-up, as obj_import does by default."""
+    return np.column_stack((vectors[:, 0], -vectors[:, 2], vectors[:, 1]))
+
+def to_mesh_arrays(data, name):
+    """Expand parsed OBJ arrays into per-corner Blender arrays."""
+    return MeshArrays(
+        name,
+        data.face_size,
+        np.ascontiguousarray(to_blender_axes(data.positions), dtype=np.float32),
+        data.corners[:, 0].astype(np.int32),
+        np.ascontiguousarray(data.uvs[data.corners[:, 1]], dtype=np.float32),
+        np.ascontiguousarray(to_blender_axes(data.normals[data.corners[:, 2]]), dtype=np.float32),
+    )
+
+@profile_stage("build_mesh")
+def build_mesh_object(arrays):
+    """Create a mesh object from mesh arrays, filling each attribute with one foreach_set call."""
+    corner_count = len(arrays.loop_vertices)
+    face_count = arrays.face_count
+
+    mesh = bpy.data.meshes.new(arrays.name)
+    mesh.vertices.add(len(arrays.positions))
+    mesh.vertices.foreach_set('co', arrays.positions.reshape(-1))
+    mesh.loops.add(corner_count)
+    mesh.loops.foreach_set('vertex_index', arrays.loop_vertices)
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, corner_count, arrays.face_size, dtype=np.int32))
+    if not mesh.polygons.bl_rna.properties['loop_total'].is_readonly:  # Derived from loop_start in Blender 4.0+
+        mesh.polygons.foreach_set('loop_total', np.full(face_count, arrays.face_size, dtype=np.int32))
+
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set('uv', arrays.loop_uvs.reshape(-1))
+
+    mesh.update(calc_edges=True)
+    mesh.polygons.foreach_set('use_smooth', np.ones(face_count, dtype=bool))
+    if hasattr(mesh, 'use_auto_smooth'):  # Custom normals need auto smooth before Blender 4.1
+        mesh.use_auto_smooth = True
+    mesh.normals_split_custom_set(arrays.loop_normals)
+
+    obj = bpy.data.objects.new(arrays.name, mesh)
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+def load_mesh_arrays(obj_path, logger, sidecar_dir=None):
+    """Return mesh arrays for the OBJ, from its binary sidecar when one exists.
+
+    Raises ValueError if the OBJ is not in the Titancraft format.
+    """
+    sidecar_path = None
+    if sidecar_dir:
+        content_hash = compute_file_hash(obj_path)
+        sidecar_path = get_sidecar_path(sidecar_dir, content_hash)
+        arrays = read_sidecar(sidecar_path, content_hash)
+        if arrays is not None:
+            log_file_operation("Mapped mesh sidecar", sidecar_path, logger)
+            return arrays
+
+    data = read_obj(obj_path)
+    arrays = to_mesh_arrays(data, data.name or bpy.path.display_name_from_filepath(obj_path))
+    if sidecar_path:
+        try:
+            write_sidecar(sidecar_path, content_hash, arrays)
+            log_file_operation("Wrote mesh sidecar", sidecar_path, logger)
+        except OSError as e:
+            logger.warning("Could not write mesh sidecar: %s", e)
+    return arrays
+
+def read_obj_object(obj_path, logger=None, sidecar_dir=None):
+    """Import a Titancraft OBJ without the operator. Returns the object, or None if the file is not in the expected format.
+
+    With sidecar_dir, a binary copy of the parsed mesh is written there on
+    first import and memory-mapped instead of parsing the OBJ next time.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    log_file_operation("Reading OBJ", obj_path, logger)
+    try:
+        arrays = load_mesh_arrays(obj_path, logger, sidecar_dir)
+    except ValueError as e:
+        logger.info("OBJ not in the Titancraft format (%s), using Blender's OBJ importer", e)
+        return None
+
+    for selected in bpy.context.selected_objects:
+        selected.select_set(False)
+    obj = build_mesh_object(arrays)
+    logger.info("Read OBJ with %d vertices and %d faces", len(arrays.positions), arrays.face_count)
+    return obj
@@ -0,0 +1,96 @@
+"""
+PNG helpers for Titancraft Import add-on.
+Reads texture metadata straight from the file bytes, without bpy.
+"""
+
+import struct
+import zlib
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Samples per pixel for each PNG color type
+PNG_CHANNELS = {
+    0: 1,  # Grayscale
+    2: 3,  # RGB
+    3: 1,  # Palette
+    4: 2,  # Grayscale + alpha
+    6: 4,  # RGBA
+}
+
+def parse_png_header(data):
+    """Parse the IHDR chunk from the first bytes of a PNG.
+
+    Returns a dict with width, height, bit_depth, color_type and channels,
+    or None if the data is not a PNG.
+    """
+    if len(data) < 33 or data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', data[16:26])
+    return {
+        'width': width,
+        'height': height,
+        'bit_depth': bit_depth,
+        'color_type': color_type,
+        'channels': PNG_CHANNELS.get(color_type, 0),
+    }
+
+def read_png_header(path):
+    """Read and parse the PNG header of a file on disk."""
+    with open(path, 'rb') as png_file:
+        return parse_png_header(png_file.read(33))
+
+# Adam7 interlace passes as (x start, y start, x step, y step)
+ADAM7_PASSES = [(0, 0, 8, 8), (4, 0, 8, 8), (0, 4, 4, 8), (2, 0, 4, 4), (0, 2, 2, 4), (1, 0, 2, 2), (0, 1, 1, 2)]
+
+def get_expected_data_size(header, interlaced=False):
+    """Return the size of the decompressed image data (scanlines plus filter bytes)."""
+    bits_per_pixel = header['bit_depth'] * header['channels']
+    passes = ADAM7_PASSES if interlaced else [(0, 0, 1, 1)]
+    size = 0
+    for x_start, y_start, x_step, y_step in passes:
+        pass_width = (header['width'] - x_start + x_step - 1) // x_step
+        pass_height = (header['height'] - y_start + y_step - 1) // y_step
+        if pass_width > 0 and pass_height > 0:
+            size += pass_height * (1 + (pass_width * bits_per_pixel + 7) // 8)
+    return size
+
+def verify_png(data):
+    """Verify a whole PNG: signature, chunk CRCs, IHDR, IEND and decompressed data size.
+
+    Returns the parsed header; raises ValueError describing the first problem found.
+    """
+    header = parse_png_header(data)
+    if header is None:
+        raise ValueError("not a PNG file")
+    if header['channels'] == 0:
+        raise ValueError(f"invalid color type {header['color_type']}")
+
+    interlaced = data[28] == 1
+    view = memoryview(data)  # Chunk slices below do not copy the image data
+    decompressor = zlib.decompressobj()
+    decompressed_size = 0
+    offset = len(PNG_SIGNATURE)
+    while True:
+        if offset + 8 > len(data):
+            raise ValueError("truncated before IEND")
+        length, chunk_type = struct.unpack_from('>I4s', data, offset)
+        chunk_end = offset + 8 + length
+        if chunk_end + 4 > len(data):
+            raise ValueError(f"truncated {chunk_type.decode('latin-1')} chunk")
+        (crc,) = struct.unpack_from('>I', data, chunk_end)
+        if zlib.crc32(view[offset + 4:chunk_end]) != crc:
+            raise ValueError(f"CRC mismatch in {chunk_type.decode('latin-1')} chunk")
+        if chunk_type == b'IDAT':
+            try:
+                decompressed_size += len(decompressor.decompress(view[offset + 8:chunk_end]))
+            except zlib.error as e:
+                raise ValueError(f"corrupt image data: {e}") from e
+        elif chunk_type == b'IEND':
+            break
+        offset = chunk_end + 4
+
+    decompressed_size += len(decompressor.flush())
+    expected_size = get_expected_data_size(header, interlaced)
+    if decompressed_size != expected_size:
+        raise ValueError(f"image data is {decompressed_size} bytes, expected {expected_size}")
+    return header
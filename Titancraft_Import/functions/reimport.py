@@ -0,0 +1,212 @@
+import bpy  # type: ignore
+import numpy as np  # type: ignore
+import os
+import time
+import zipfile
+from .apply_textures import get_texture_key, import_obj, load_texture_image
+from .constants import CacheConstants, ImportConstants, MaterialConstants, ReimportConstants, TextureConstants
+from .io import create_extract_directory, extract_members, get_member_signatures, resolve_base_name, select_members
+from .lod import get_lod_copies, rebuild_lods
+from .logging_utils import get_logger, log_operation_start, log_operation_success, profile_stage
+from .utils import compute_file_hash
+
+def record_import(objects, base_name, signatures):
+    """Tag freshly imported objects with their model, OBJ object name and member signatures."""
+    for obj in objects:
+        obj[ReimportConstants.BASE_NAME_PROPERTY] = base_name
+        obj[ReimportConstants.SOURCE_OBJECT_PROPERTY] = obj.name
+        obj[ReimportConstants.MEMBER_SIGNATURES_PROPERTY] = signatures
+
+def find_imported_objects(base_name):
+    """Return the objects an earlier import of base_name created."""
+    return [obj for obj in bpy.data.objects if obj.type == 'MESH' and obj.get(ReimportConstants.BASE_NAME_PROPERTY) == base_name]
+
+def get_recorded_signatures(obj):
+    signatures = obj.get(ReimportConstants.MEMBER_SIGNATURES_PROPERTY)
+    return signatures.to_dict() if signatures is not None else {}
+
+def get_texture_type(base_name, member_name):
+    """Return the texture type of a member file name, or None for the OBJ and MTL."""
+    for texture_type in ImportConstants.TEXTURE_TYPES:
+        if member_name == f"{base_name}_{texture_type}{ImportConstants.PNG_EXTENSION}":
+            return texture_type
+    return None
+
+def read_corner_normals(mesh):
+    """Return the per-corner normals of a mesh as an (N, 3) array."""
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if hasattr(mesh, 'corner_normals'):  # Blender 4.1+
+        mesh.corner_normals.foreach_get('vector', normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get('normal', normals)
+    return normals.reshape(-1, 3)
+
+def has_same_topology(mesh, other):
+    if (len(mesh.vertices), len(mesh.loops), len(mesh.polygons)) != (len(other.vertices), len(other.loops), len(other.polygons)):
+        return False
+    corners, other_corners = (np.empty(len(mesh.loops), dtype=np.int32) for _ in range(2))
+    mesh.loops.foreach_get('vertex_index', corners)
+    other.loops.foreach_get('vertex_index', other_corners)
+    return bool(np.array_equal(corners, other_corners))
+
+def update_mesh(obj, new_mesh, logger):
+    """Give obj the geometry of new_mesh, keeping its transform, modifiers and materials.
+
+    With unchanged topology the positions, UVs and normals are copied into
+    the existing mesh, which keeps vertex weights and shape keys. Otherwise
+    the mesh is replaced. Returns True if new_mesh is still needed.
+    """
+    mesh = obj.data
+    if has_same_topology(mesh, new_mesh):
+        positions = np.empty(len(new_mesh.vertices) * 3, dtype=np.float32)
+        new_mesh.vertices.foreach_get('co', positions)
+        mesh.vertices.foreach_set('co', positions)
+        if mesh.uv_layers.active and new_mesh.uv_layers.active:
+            uvs = np.empty(len(new_mesh.loops) * 2, dtype=np.float32)
+            new_mesh.uv_layers.active.data.foreach_get('uv', uvs)
+            mesh.uv_layers.active.data.foreach_set('uv', uvs)
+        mesh.update()
+        mesh.normals_split_custom_set(read_corner_normals(new_mesh))
+        return False
+
+    new_mesh.materials.clear()
+    for material in mesh.materials:
+        new_mesh.materials.append(material)
+    new_mesh.name = mesh.name
+    obj.data = new_mesh
+    if mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+    if obj.vertex_groups:
+        logger.warning(f"The topology of '{obj.name}' changed, so its vertex weights were not kept")
+    return True
+
+def update_meshes(objects, obj_path, logger, fast_obj_reader=False):
+    """Import the new OBJ and move its geometry into the matching existing objects. Returns the number updated."""
+    new_objects = import_obj(obj_path, logger, fast_obj_reader)
+    if not new_objects:
+        return 0
+
+    by_source = {obj.get(ReimportConstants.SOURCE_OBJECT_PROPERTY): obj for obj in objects}
+    updated = 0
+    for new_obj in new_objects:
+        # A single object is matched whatever its name; several are matched by their name in the OBJ
+        obj = objects[0] if len(objects) == 1 and len(new_objects) == 1 else by_source.get(new_obj.name)
+        new_mesh = new_obj.data
+        bpy.data.objects.remove(new_obj)
+        if obj is None:
+            logger.warning(f"'{new_mesh.name}' is new in this revision; run a full import to add it")
+            bpy.data.meshes.remove(new_mesh)
+            continue
+        if not update_mesh(obj, new_mesh, logger):
+            bpy.data.meshes.remove(new_mesh)
+        updated += 1
+    return updated
+
+def get_own_material(material, objects):
+    """Return a copy of material for objects if other objects share it, so the update does not reach them."""
+    slots = [(obj.data, index) for obj in objects for index, slot_material in enumerate(obj.data.materials) if slot_material == material]
+    if material.users <= len(slots):
+        return material
+    own_material = material.copy()
+    for mesh, index in slots:
+        mesh.materials[index] = own_material
+    return own_material
+
+def is_source_image(image, path):
+    """Check that an image shows the member file itself, not a preview, ORM or baked map made from it."""
+    if image.packed_file is not None and not image.filepath:
+        return image.name == os.path.basename(path)
+    image_path = bpy.path.abspath(image.filepath)
+    return (os.path.basename(image_path) == os.path.basename(path)
+            and not os.path.basename(os.path.dirname(image_path)).startswith(TextureConstants.PREVIEW_DIRECTORY_PREFIX))
+
+def feeds_derived_texture(nodes, texture_type):
+    """Check whether a map reaches the material only through a packed ORM or baked map."""
+    if texture_type in ('ao', 'roughness', 'metallic') and 'tex_orm' in nodes:
+        return True
+    if texture_type in ('color', 'emissive') and 'tex_emission' in nodes:
+        return True
+    color_node = nodes.get('tex_color')
+    if texture_type == 'ao' and color_node is not None and color_node.image is not None:
+        return os.path.basename(os.path.dirname(bpy.path.abspath(color_node.image.filepath))) == CacheConstants.BAKED_DIRECTORY_NAME
+    return False
+
+def update_textures(objects, texture_paths, logger):
+    """Load the changed maps into the objects' materials. Returns the texture types that were updated and those that were skipped."""
+    materials = {slot.material for obj in objects for slot in obj.material_slots if slot.material and slot.material.node_tree}
+    updated, skipped = set(), set()
+    for material in materials:
+        material = get_own_material(material, objects)
+        nodes = material.node_tree.nodes
+        for texture_type, path in texture_paths.items():
+            node = nodes.get(f"tex_{texture_type}")
+            if feeds_derived_texture(nodes, texture_type) or (node is not None and node.image is not None and not is_source_image(node.image, path)):
+                logger.warning(f"The {texture_type} map is used through a preview, ORM or baked texture; run a full import to refresh it")
+                skipped.add(texture_type)
+                continue
+            if node is None or node.image is None:
+                continue  # Not used by this configuration
+
+            texture_key = get_texture_key(texture_type, compute_file_hash(path))
+            image = node.image
+            if image.users > 1 or image.packed_file is not None:
+                # Other materials show this image too: give this one its own
+                node.image = load_texture_image(texture_type, texture_key, texture_paths)
+            else:
+                image.filepath = path
+                image.reload()
+                image[MaterialConstants.CONTENT_KEY_PROPERTY] = texture_key
+            updated.add(texture_type)
+        if MaterialConstants.CONTENT_KEY_PROPERTY in material:
+            # The material no longer matches the texture set its key describes
+            del material[MaterialConstants.CONTENT_KEY_PROPERTY]
+    return updated, skipped - updated
+
+@profile_stage("update_asset")
+def update_asset(filepath, objects, logger=None, fast_obj_reader=False):
+    """Refresh imported objects from a new revision of their zip, touching only the members that changed."""
+    if logger is None:
+        logger = get_logger()
+
+    log_operation_start("model update", logger)
+    start_time = time.perf_counter()
+    base_name = resolve_base_name(filepath)
+    recorded = get_recorded_signatures(objects[0])
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        members = select_members(zip_ref, base_name)
+        signatures = get_member_signatures(members)
+        changed = {name: info for name, info in members.items() if recorded.get(name) != signatures[name]}
+        if not changed:
+            logger.info(f"'{base_name}' is already up to date")
+            return {'FINISHED'}
+        extract_to = create_extract_directory(base_name)
+        extract_members(zip_ref, changed, extract_to)
+
+    texture_paths = {}
+    for name in changed:
+        texture_type = get_texture_type(base_name, name)
+        if texture_type:
+            texture_paths[texture_type] = os.path.join(extract_to, name)
+
+    obj_name = f"{base_name}{ImportConstants.OBJ_EXTENSION}"
+    meshes_updated = update_meshes(objects, os.path.join(extract_to, obj_name), logger, fast_obj_reader) if obj_name in changed else 0
+    # LOD copies share the materials of their source, so they are updated together
+    lod_copies = get_lod_copies(objects)
+    textures_updated, textures_skipped = update_textures(objects + lod_copies, texture_paths, logger) if texture_paths else (set(), set())
+    if meshes_updated and lod_copies:
+        rebuild_lods(objects, logger)
+
+    # Skipped maps keep their old signature, so the next update still sees them as changed
+    for texture_type in textures_skipped:
+        name = os.path.basename(texture_paths[texture_type])
+        if name in recorded:
+            signatures[name] = recorded[name]
+        else:
+            del signatures[name]
+    for obj in objects:
+        obj[ReimportConstants.MEMBER_SIGNATURES_PROPERTY] = signatures
+    logger.info(f"Updated {len(textures_updated)} textures ({', '.join(sorted(textures_updated)) or 'none'}) "
+                f"and {meshes_updated} meshes of '{base_name}' in {time.perf_counter() - start_time:.2f}s")
+    log_operation_success("model update", logger)
+    return {'FINISHED'}
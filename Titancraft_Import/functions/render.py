@@ -0,0 +1,140 @@
+import bpy  # type: ignore
+import numpy as np  # type: ignore
+import os
+import time
+from .constants import RenderConstants
+from .image_ops import downscale_pixels, load_pixels, save_pixels
+from .logging_utils import get_logger, log_operation_start, log_operation_success, log_operation_error, profile_stage
+
+def get_render_directory(output_dir, base_name):
+    return os.path.join(os.path.abspath(output_dir), base_name)
+
+def get_scene_path(output_dir, base_name):
+    """Return the .blend file the render workers open for an asset."""
+    return os.path.join(get_render_directory(output_dir, base_name), f"{base_name}.blend")
+
+def get_frame_path(output_dir, base_name, frame):
+    return os.path.join(get_render_directory(output_dir, base_name), RenderConstants.FRAMES_DIRECTORY_NAME, RenderConstants.FRAME_NAME_FORMAT.format(frame))
+
+def get_assembled_path(output_dir, base_name, render_output):
+    suffix = RenderConstants.VIDEO_SUFFIX if render_output == RenderConstants.OUTPUT_VIDEO else RenderConstants.SHEET_SUFFIX
+    return os.path.join(get_render_directory(output_dir, base_name), f"{base_name}{suffix}")
+
+def split_frames(frame_start, frame_end, shard, shards):
+    """Return the contiguous part of the frame range that shard (of shards) renders."""
+    frames = list(range(frame_start, frame_end + 1))
+    return frames[shard * len(frames) // shards:(shard + 1) * len(frames) // shards]
+
+def get_engine_id(engine):
+    """Return the render engine ID for a CLI engine name in the running Blender version."""
+    engine_id = RenderConstants.ENGINES[engine]
+    available = {item.identifier for item in bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items}
+    if engine_id not in available and engine == 'EEVEE':
+        return RenderConstants.EEVEE_LEGACY_ENGINE
+    return engine_id
+
+def configure_render(scene, engine=RenderConstants.DEFAULT_ENGINE, resolution=RenderConstants.DEFAULT_RESOLUTION, samples=RenderConstants.DEFAULT_SAMPLES):
+    """Set the engine, resolution and sampling a turntable is rendered with. Cycles renders on the CPU."""
+    scene.render.engine = get_engine_id(engine)
+    scene.render.resolution_x, scene.render.resolution_y = resolution
+    scene.render.resolution_percentage = 100
+    scene.render.image_settings.file_format = 'PNG'
+    if engine == 'CYCLES':
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = samples
+    elif engine == 'EEVEE':
+        scene.eevee.taa_render_samples = samples
+
+@profile_stage("render_frames")
+def render_frames(scene, frames, output_dir, base_name, threads=0, logger=None):
+    """Render the given frames of a scene to PNGs, skipping frames that are already on disk.
+
+    Each frame is written under a partial name and renamed once complete,
+    so frames left by an earlier run are always whole. threads=0 lets
+    Blender use every core. Returns the number of frames rendered.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    missing = [frame for frame in frames if not os.path.exists(get_frame_path(output_dir, base_name, frame))]
+    logger.info(f"{base_name}: {len(frames) - len(missing)} of {len(frames)} frames already rendered")
+    if threads:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = threads
+
+    for frame in missing:
+        start_time = time.perf_counter()
+        frame_path = get_frame_path(output_dir, base_name, frame)
+        os.makedirs(os.path.dirname(frame_path), exist_ok=True)
+        partial_path = os.path.splitext(frame_path)[0] + RenderConstants.PARTIAL_FRAME_SUFFIX
+        scene.frame_set(frame)
+        bpy.ops.render.render(scene=scene.name)
+        # save_render writes to the exact path, where write_still would add frame numbers
+        bpy.data.images['Render Result'].save_render(partial_path, scene=scene)
+        os.replace(partial_path, frame_path)
+        logger.info(f"{base_name}: frame {frame} in {time.perf_counter() - start_time:.2f}s")
+    return len(missing)
+
+def get_strips(sequence_editor):
+    # Blender 5.0 renamed sequences to strips
+    return sequence_editor.strips if hasattr(sequence_editor, 'strips') else sequence_editor.sequences
+
+@profile_stage("write_video")
+def write_video(frame_paths, video_path, fps, logger=None):
+    """Encode the frames into an H.264 MP4 through the sequencer of a temporary scene."""
+    if logger is None:
+        logger = get_logger()
+
+    log_operation_start("video encoding", logger)
+    probe = bpy.data.images.load(frame_paths[0])
+    width, height = probe.size
+    bpy.data.images.remove(probe)
+
+    scene = bpy.data.scenes.new(RenderConstants.ASSEMBLE_SCENE_NAME)
+    try:
+        strip = get_strips(scene.sequence_editor_create()).new_image("frames", frame_paths[0], 1, 1)
+        for path in frame_paths[1:]:
+            strip.elements.append(os.path.basename(path))
+        scene.frame_start, scene.frame_end = 1, len(frame_paths)
+        scene.render.fps = fps
+        scene.render.resolution_x, scene.render.resolution_y = width, height
+        scene.render.resolution_percentage = 100
+        image_settings = scene.render.image_settings
+        if hasattr(image_settings, 'media_type'):  # Blender 5.0+
+            image_settings.media_type = 'VIDEO'
+        image_settings.file_format = 'FFMPEG'
+        scene.render.ffmpeg.format = 'MPEG4'
+        scene.render.ffmpeg.codec = 'H264'
+        scene.render.ffmpeg.constant_rate_factor = 'HIGH'
+        scene.render.filepath = video_path
+        bpy.ops.render.render(animation=True, scene=scene.name)
+    finally:
+        bpy.data.scenes.remove(scene)
+
+    if not os.path.exists(video_path):
+        log_operation_error("video encoding", f"Blender did not write {video_path}", logger)
+        return False
+    log_operation_success("video encoding", logger)
+    return True
+
+@profile_stage("write_contact_sheet")
+def write_contact_sheet(frame_paths, sheet_path, frame_count=RenderConstants.SHEET_FRAME_COUNT, columns=RenderConstants.SHEET_COLUMNS,
+                        tile_size=RenderConstants.SHEET_TILE_SIZE, logger=None):
+    """Tile evenly spaced frames into one PNG, left to right and top to bottom."""
+    if logger is None:
+        logger = get_logger()
+
+    log_operation_start("contact sheet", logger)
+    picks = np.linspace(0, len(frame_paths) - 1, min(frame_count, len(frame_paths))).round().astype(int)
+    tiles = [downscale_pixels(load_pixels(frame_paths[index], 'color'), tile_size, 'color') for index in picks]
+    tile_height, tile_width = tiles[0].shape[:2]
+    rows = -(-len(tiles) // columns)
+    sheet = np.zeros((rows * tile_height, columns * tile_width, 4), dtype=np.float32)
+    sheet[..., 3] = 1.0
+    for index, tile in enumerate(tiles):
+        # Blender stores rows bottom to top, so the first row of tiles goes at the end
+        row, column = rows - 1 - index // columns, index % columns
+        sheet[row * tile_height:(row + 1) * tile_height, column * tile_width:(column + 1) * tile_width] = tile
+    save_pixels(sheet, sheet_path, 'color')
+    log_operation_success("contact sheet", logger)
+    return True
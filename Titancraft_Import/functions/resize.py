@@ -1,22 +1,25 @@
 import bpy  # type: ignore
-from .logging_utils import get_logger, log_operation_start, log_operation_success, log_operation_error
+from .logging_utils import get_logger, log_operation_start, log_operation_success, log_operation_error, profile_stage
 
-def resize_object(scale=(1, 1, 1), logger=None):
-    """Resize the active object to the specified scale."""
+@profile_stage("resize_object")
+def resize_object(scale=(1, 1, 1), logger=None, objects=None):
+    """Resize the given objects, or the active object if none are given, to the specified scale."""
     if logger is None:
         logger = get_logger()
     
     log_operation_start("object resizing", logger)
 
-    # Ensure the object is selected
-    obj = bpy.context.view_layer.objects.active
-    if not obj:
+    if objects is None:
+        active = bpy.context.view_layer.objects.active
+        objects = [active] if active else []
+    if not objects:
         log_operation_error("object resizing", "No active object to resize", logger)
         return {'CANCELLED'}
     
-    obj.scale = scale
+    for obj in objects:
+        obj.scale = scale
     bpy.context.view_layer.update()  # Update the view layer
     
-    logger.info(f"Resized object to scale: {scale}")
+    logger.info(f"Resized {len(objects)} objects to scale: {scale}")
     log_operation_success("object resizing", logger)
     return {'FINISHED'}
@@ -0,0 +1,112 @@
+import bpy  # type: ignore
+from .logging_utils import get_logger
+
+def is_valid(datablock):
+    """Check that a datablock was not removed since it was recorded (e.g. by the user while a modal import runs)."""
+    try:
+        datablock.name
+    except ReferenceError:
+        return False
+    return True
+
+class ImportJournal:
+    """Records what a cancellable import creates or changes, so it can be undone.
+
+    The import steps record the datablocks they create, objects as soon as
+    they exist. Materials and images the recorded meshes use when the
+    rollback runs are removed only if nothing else uses them any more, so
+    datablocks shared with earlier imports or the user's own work are kept. Destructive steps go through the journal
+    instead of deleting: default objects are only unlinked from the scene
+    until commit().
+    """
+
+    def __init__(self):
+        self.created = []  # Datablocks the import created
+        self.renamed = []  # (datablock, old name)
+        self.detached = []  # (object, collections it was linked to)
+        scene = bpy.context.scene
+        self.frame_range = (scene.frame_start, scene.frame_end)
+
+    def record_datablocks(self, datablocks):
+        """Remember datablocks the import created."""
+        self.created.extend(datablock for datablock in datablocks if datablock is not None)
+
+    def record_objects(self, objects):
+        """Remember new objects and their meshes, before materials are applied to them."""
+        for obj in objects:
+            self.record_datablocks((obj, obj.data))
+
+    def get_used(self):
+        """Return the materials and images the recorded meshes use, created or shared."""
+        used = []
+        for mesh in self.created:
+            if not isinstance(mesh, bpy.types.Mesh) or not is_valid(mesh):
+                continue
+            for material in mesh.materials:
+                if material is None:
+                    continue
+                used.append(material)
+                if material.node_tree:
+                    used.extend(node.image for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image)
+        return used
+
+    def record_name(self, datablock):
+        """Remember a datablock's current name before the import renames it."""
+        if datablock is not None:
+            self.renamed.append((datablock, datablock.name))
+
+    def detach_objects(self, names):
+        """Unlink the named objects from every collection, keeping them for rollback."""
+        for name in names:
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                continue
+            collections = list(obj.users_collection)
+            for collection in collections:
+                collection.objects.unlink(obj)
+            self.detached.append((obj, collections))
+
+    def remove_unused(self, used):
+        """Remove the used materials, then images, that lost their last user. Returns the number removed."""
+        removed = 0
+        for kind in (bpy.types.Material, bpy.types.Image):
+            unused = {datablock for datablock in used if isinstance(datablock, kind) and is_valid(datablock) and datablock.users == 0}
+            bpy.data.batch_remove(unused)
+            removed += len(unused)
+        return removed
+
+    def rollback(self, logger=None):
+        """Remove everything the import created and restore what it changed. Returns the number of removed datablocks."""
+        if logger is None:
+            logger = get_logger()
+
+        screen = bpy.context.screen
+        if screen is not None and screen.is_animation_playing:
+            bpy.ops.screen.animation_cancel(restore_frame=True)
+
+        used = self.get_used()  # Before the meshes that use them are removed
+        created = {datablock for datablock in self.created if is_valid(datablock)}
+        bpy.data.batch_remove(created)
+        removed = len(created) + self.remove_unused(used)
+        for datablock, old_name in reversed(self.renamed):
+            if is_valid(datablock):
+                datablock.name = old_name
+        for obj, collections in self.detached:
+            for collection in collections:
+                if is_valid(collection):
+                    collection.objects.link(obj)
+        scene = bpy.context.scene
+        scene.frame_start, scene.frame_end = self.frame_range
+
+        logger.debug("Rolled back %d datablocks, %d renames and %d removed objects", removed, len(self.renamed), len(self.detached))
+        self.created.clear()
+        self.renamed.clear()
+        self.detached.clear()
+        return removed
+
+    def commit(self):
+        """Delete the detached objects for good once the import has finished."""
+        for obj, _ in self.detached:
+            if is_valid(obj):
+                bpy.data.objects.remove(obj)
+        self.detached.clear()
@@ -1,41 +1,123 @@
 import bpy  # type: ignore
+import math
+from mathutils import Vector  # type: ignore
 from .constants import AnimationConstants, LightingConstants, CameraConstants, FileConstants
+from .logging_utils import profile_stage
 
-def setup_turntable_camera():
-    # Add a camera
-    bpy.ops.object.camera_add(location=CameraConstants.TURNTABLE_CAMERA_LOCATION, rotation=CameraConstants.TURNTABLE_CAMERA_ROTATION)
-    camera = bpy.context.active_object
-    camera.name = FileConstants.TURNTABLE_CAMERA_NAME
+def get_turntable_collection(created):
+    """Return the collection holding the turntable rig, creating it and linking it to the scene if needed."""
+    collection = bpy.data.collections.get(FileConstants.TURNTABLE_COLLECTION_NAME)
+    if collection is None:
+        collection = bpy.data.collections.new(FileConstants.TURNTABLE_COLLECTION_NAME)
+        created.append(collection)
+    scene_collection = bpy.context.scene.collection
+    if collection.name not in scene_collection.children:
+        scene_collection.children.link(collection)
+    return collection
 
-    # Add an empty object at the center of the model
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=CameraConstants.TURNTABLE_EMPTY_LOCATION)
-    empty = bpy.context.active_object
-    empty.name = FileConstants.TURNTABLE_EMPTY_NAME
+def get_rig_data(collection, name, created, *args):
+    """Return the named camera or light datablock from collection, creating it with args if it does not exist."""
+    data = collection.get(name)
+    if data is None:
+        data = collection.new(name, *args)
+        created.append(data)
+    return data
 
-    # Set the camera to look at the empty object
-    constraint = camera.constraints.new(type='TRACK_TO')
-    constraint.target = empty
-    constraint.track_axis = CameraConstants.TRACK_AXIS
-    constraint.up_axis = CameraConstants.UP_AXIS
+def get_rig_object(name, data, collection, created):
+    """Return the named rig object, creating it with data if it does not exist. Returns (object, is new)."""
+    obj = bpy.data.objects.get(name)
+    is_new = obj is None
+    if is_new:
+        obj = bpy.data.objects.new(name, data)
+        created.append(obj)
+    if collection not in obj.users_collection:
+        collection.objects.link(obj)
+    return obj, is_new
 
-    # Parent the camera to the empty object
-    camera.parent = empty
+def get_turntable_fit(objects=None):
+    """Return the centre of the objects' bounding box and the camera distance that keeps it in frame.
 
-    # Set up the animation for the empty object
-    bpy.context.scene.frame_start = AnimationConstants.TURNTABLE_FRAME_START
-    bpy.context.scene.frame_end = AnimationConstants.TURNTABLE_FRAME_END
+    The distance fits the bounding sphere into the narrower field of view of
+    the render aspect. Without objects the default rig placement is returned.
+    """
+    corners = [obj.matrix_world @ Vector(corner) for obj in objects or [] for corner in obj.bound_box]
+    if not corners:
+        return Vector(CameraConstants.TURNTABLE_EMPTY_LOCATION), CameraConstants.DEFAULT_CAMERA_DISTANCE
 
-    empty.rotation_euler = AnimationConstants.TURNTABLE_ROTATION_START
-    empty.keyframe_insert(data_path="rotation_euler", frame=AnimationConstants.TURNTABLE_FRAME_START)
-    empty.rotation_euler = AnimationConstants.TURNTABLE_ROTATION_END
-    empty.keyframe_insert(data_path="rotation_euler", frame=AnimationConstants.TURNTABLE_FRAME_END)
+    low = Vector([min(axis) for axis in zip(*corners)])
+    high = Vector([max(axis) for axis in zip(*corners)])
+    radius = max((high - low).length / 2, 1e-3)
+    render = bpy.context.scene.render
+    aspect = min(render.resolution_x, render.resolution_y) / max(render.resolution_x, render.resolution_y)
+    half_angle = math.atan(math.tan(CameraConstants.FIELD_OF_VIEW / 2) * aspect)
+    return (low + high) / 2, radius / math.sin(half_angle) * CameraConstants.FIT_MARGIN
 
-    # Set the scene to play the animation
-    bpy.ops.screen.animation_play()
+@profile_stage("setup_turntable_camera")
+def setup_turntable_camera(objects=None):
+    """Aim the turntable camera rig at the objects, building it on first use and reusing it afterwards.
 
-def add_lights():
+    Returns the datablocks that were created.
+    """
+    created = []
+    collection = get_turntable_collection(created)
+    center, distance = get_turntable_fit(objects)
+
+    # The empty sits at the centre of the model and carries the rotation
+    empty, empty_created = get_rig_object(FileConstants.TURNTABLE_EMPTY_NAME, None, collection, created)
+    if empty_created:
+        empty.empty_display_type = 'PLAIN_AXES'
+    empty.location = center
+
+    camera_data = get_rig_data(bpy.data.cameras, FileConstants.TURNTABLE_CAMERA_NAME, created)
+    camera, camera_created = get_rig_object(FileConstants.TURNTABLE_CAMERA_NAME, camera_data, collection, created)
+    if camera_created:
+        camera.data.angle = CameraConstants.FIELD_OF_VIEW
+        camera.rotation_euler = CameraConstants.TURNTABLE_CAMERA_ROTATION
+        # Set the camera to look at the empty object
+        constraint = camera.constraints.new(type='TRACK_TO')
+        constraint.target = empty
+        constraint.track_axis = CameraConstants.TRACK_AXIS
+        constraint.up_axis = CameraConstants.UP_AXIS
+        camera.parent = empty
+
+    # Relative to the empty, so the camera circles the model as the empty turns
+    camera.location = (0, -distance * math.cos(CameraConstants.CAMERA_ELEVATION), distance * math.sin(CameraConstants.CAMERA_ELEVATION))
+    camera.data.clip_end = max(camera.data.clip_end, distance * 4)
+
+    scene = bpy.context.scene
+    scene.camera = camera
+    scene.frame_start = AnimationConstants.TURNTABLE_FRAME_START
+    scene.frame_end = AnimationConstants.TURNTABLE_FRAME_END
+
+    # Set up the animation for the empty object once; reused rigs keep their keyframes
+    if empty.animation_data is None or empty.animation_data.action is None:
+        empty.rotation_euler = AnimationConstants.TURNTABLE_ROTATION_START
+        empty.keyframe_insert(data_path="rotation_euler", frame=AnimationConstants.TURNTABLE_FRAME_START)
+        empty.rotation_euler = AnimationConstants.TURNTABLE_ROTATION_END
+        empty.keyframe_insert(data_path="rotation_euler", frame=AnimationConstants.TURNTABLE_FRAME_END)
+        created.append(empty.animation_data.action)
+
+    # Play the animation unless it already runs (there is no screen to play it in background mode)
+    screen = bpy.context.screen
+    if not bpy.app.background and screen is not None and not screen.is_animation_playing:
+        bpy.ops.screen.animation_play()
+    return created
+
+@profile_stage("add_lights")
+def add_lights(objects=None):
+    """Place the four turntable lights around the objects. They share one light datablock and are reused across imports.
+
+    Returns the datablocks that were created.
+    """
+    created = []
+    collection = get_turntable_collection(created)
+    center, distance = get_turntable_fit(objects)
+    scale = distance / CameraConstants.DEFAULT_CAMERA_DISTANCE
+
+    light_data = get_rig_data(bpy.data.lights, FileConstants.TURNTABLE_LIGHT_DATA_NAME, created, 'POINT')
+    # Point lights fall off with the square of the distance
+    light_data.energy = LightingConstants.LIGHT_ENERGY * scale ** 2
     for i, position in enumerate(LightingConstants.LIGHT_POSITIONS):
-        bpy.ops.object.light_add(type='POINT', location=position)
-        light = bpy.context.active_object
-        light.name = f"{FileConstants.TURNTABLE_LIGHT_PREFIX}{i+1}"
-        light.data.energy = LightingConstants.LIGHT_ENERGY
+        light, _ = get_rig_object(f"{FileConstants.TURNTABLE_LIGHT_PREFIX}{i+1}", light_data, collection, created)
+        light.location = center + Vector(position) * scale
+    return created
@@ -1,68 +1,21 @@
-import bpy  # type: ignore
+import hashlib
+import logging
 import os
-from .constants import NodeConstants, FileConstants
-from .logging_utils import get_logger, log_node_operation, log_file_operation
-
-def arrange_nodes(node_tree, logger=None):
-    """Arrange shader nodes in the material editor for better organization."""
-    if logger is None:
-        logger = get_logger()
-    
-    # Use constants for node positioning
-    positions = NodeConstants.NODE_POSITIONS
-
-    for node in node_tree.nodes:
-        log_node_operation(node.name, f"processing {node.type} at {node.location}", logger)
-        
-        if node.type == 'TEX_IMAGE':
-            if node.image.name.endswith('normals.png'):
-                node.location = positions['tex_normals']
-                log_node_operation(node.name, f"moved to {positions['tex_normals']}", logger)
-            elif node.image.name.endswith('metallic.png'):
-                node.location = positions['tex_metallic']
-                log_node_operation(node.name, f"moved to {positions['tex_metallic']}", logger)
-            elif node.image.name.endswith('ao.png'):
-                node.location = positions['tex_ao']
-                log_node_operation(node.name, f"moved to {positions['tex_ao']}", logger)
-            elif node.image.name.endswith('roughness.png'):
-                node.location = positions['tex_roughness']
-                log_node_operation(node.name, f"moved to {positions['tex_roughness']}", logger)
-            elif node.image.name.endswith('emissive.png'):
-                node.location = positions['tex_emissive']
-                log_node_operation(node.name, f"moved to {positions['tex_emissive']}", logger)
-            else:
-                node.location = positions['tex_color']
-                log_node_operation(node.name, f"moved to {positions['tex_color']}", logger)
-        elif isinstance(node, bpy.types.ShaderNodeNormalMap):
-            node.location = positions['normal_map']
-            log_node_operation(node.name, f"moved to {positions['normal_map']}", logger)
-        elif isinstance(node, bpy.types.ShaderNodeMixRGB):
-            node.location = positions['mix_rgb']
-            log_node_operation(node.name, f"moved to {positions['mix_rgb']}", logger)
-        elif node.type == 'BSDF_PRINCIPLED':
-            node.location = positions['bsdf']
-            log_node_operation(node.name, f"moved to {positions['bsdf']}", logger)
-        elif node.type == 'OUTPUT_MATERIAL':
-            node.location = positions['output']
-            log_node_operation(node.name, f"moved to {positions['output']}", logger)
-        elif node.type == 'MATH' and node.operation == 'MULTIPLY':
-            node.location = positions['math_multiply']
-            log_node_operation(node.name, f"moved to {positions['math_multiply']}", logger)
-        else:
-            log_node_operation(node.name, f"not moved (unsupported type: {node.type})", logger)
+from .constants import ImportConstants
+from .logging_utils import get_logger, log_file_operation, profile_stage
 
+@profile_stage("check_files_exist")
 def check_files_exist(obj_path, texture_paths, logger=None):
     """Check if all required files exist and log the results."""
     if logger is None:
         logger = get_logger()
     
-    extracted_files = os.listdir(os.path.dirname(obj_path))
-    logger.debug(f"Extracted files: {extracted_files}")
-
-    # Log file paths for debugging
-    log_file_operation("Checking OBJ file", obj_path, logger)
-    for key, path in texture_paths.items():
-        log_file_operation(f"Checking {key} texture", path, logger)
+    # Log file paths for debugging; listing the folder is only worth it when debug output is on
+    if logger.is_enabled_for(logging.DEBUG):
+        logger.debug("Extracted files: %s", os.listdir(os.path.dirname(obj_path)))
+        log_file_operation("Checking OBJ file", obj_path, logger)
+        for key, path in texture_paths.items():
+            log_file_operation(f"Checking {key} texture", path, logger)
 
     if not os.path.exists(obj_path):
         logger.error(f"OBJ file not found: {obj_path}")
@@ -70,7 +23,7 @@ def check_files_exist(obj_path, texture_paths, logger=None):
     
     missing_textures = []
     for key, path in texture_paths.items():
-        if not os.path.exists(path):
+        if key not in ImportConstants.OPTIONAL_TEXTURE_TYPES and not os.path.exists(path):
             missing_textures.append(f"{key}: {path}")
     
     if missing_textures:
@@ -80,6 +33,24 @@ def check_files_exist(obj_path, texture_paths, logger=None):
     logger.info("All required files found")
     return True
 
+def check_texture_data(obj_path, texture_data, logger=None):
+    """Check the OBJ exists on disk and every texture was read into memory."""
+    if logger is None:
+        logger = get_logger()
+    
+    log_file_operation("Checking OBJ file", obj_path, logger)
+    if not os.path.exists(obj_path):
+        logger.error(f"OBJ file not found: {obj_path}")
+        return False
+    
+    missing_textures = [key for key in ImportConstants.TEXTURE_TYPES if key not in texture_data and key not in ImportConstants.OPTIONAL_TEXTURE_TYPES]
+    if missing_textures:
+        logger.error(f"Missing texture files in archive: {', '.join(missing_textures)}")
+        return False
+    
+    logger.info("All required files found")
+    return True
+
 def get_subdirectory_path(extract_to, logger=None):
     """Find subdirectory if files are not in root of extracted folder."""
     if logger is None:
@@ -91,3 +62,23 @@ def get_subdirectory_path(extract_to, logger=None):
         logger.debug(f"Found subdirectory: {subdirectory_path}")
         return subdirectory_path
     return None
+
+def compute_data_hash(data):
+    """Return a content hash of in-memory bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def compute_file_hash(path):
+    """Return a content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(ImportConstants.EXTRACT_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def run_steps(steps):
+    """Run a step generator to completion and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .constants import ImportConstants
+from .logging_utils import get_logger, log_operation_start, log_operation_success, profile_stage
+from .png_utils import verify_png
+
+# Maps that must carry at least three channels to be usable
+RGB_TEXTURE_TYPES = ('color', 'normals')
+
+class PreflightReport:
+    """Structured result of the texture pre-flight checks."""
+
+    def __init__(self):
+        self.textures = {}  # Texture type -> PNG header
+        self.errors = []
+        self.warnings = []
+        self.seconds = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        """Return a one-line human readable summary of the report."""
+        resolutions = sorted({f"{header['width']}x{header['height']}" for header in self.textures.values()})
+        bit_depths = sorted({f"{header['bit_depth']}-bit" for header in self.textures.values()})
+        return (f"Pre-flight checked {len(self.textures) + len(self.errors)} maps "
+                f"({', '.join(resolutions + bit_depths) or 'none valid'}) in {self.seconds:.3f}s: "
+                f"{len(self.errors)} errors, {len(self.warnings)} warnings")
+
+def verify_texture(texture_type, path=None, data=None):
+    """Verify a single map from disk or memory. Returns (texture type, header, error)."""
+    try:
+        if data is None:
+            with open(path, 'rb') as png_file:
+                data = png_file.read()
+        return texture_type, verify_png(data), None
+    except (OSError, ValueError) as e:
+        return texture_type, None, str(e)
+
+@profile_stage("preflight_textures")
+def preflight_textures(texture_paths, texture_data=None, max_workers=ImportConstants.PREFLIGHT_MAX_WORKERS, logger=None):
+    """Verify every map concurrently before anything is imported into Blender.
+
+    Each PNG is fully checked (chunk CRCs, IHDR, IEND, decompressed size),
+    then bit depth, channel count and resolution consistency are compared
+    across the maps. Corrupt or unusable maps are errors; maps that merely
+    disagree on resolution are warnings.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    log_operation_start("texture pre-flight", logger)
+    start_time = time.perf_counter()
+    report = PreflightReport()
+
+    if texture_data is not None:
+        tasks = [(texture_type, None, data) for texture_type, data in texture_data.items()]
+    else:
+        tasks = [(texture_type, path, None) for texture_type, path in texture_paths.items()
+                 if texture_type not in ImportConstants.OPTIONAL_TEXTURE_TYPES or os.path.exists(path)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks) or 1))) as executor:
+        results = list(executor.map(lambda task: verify_texture(*task), tasks))
+
+    for texture_type, header, error in results:
+        if error:
+            report.errors.append(f"{texture_type}: {error}")
+            continue
+        report.textures[texture_type] = header
+        logger.debug(f"{texture_type}: {header['width']}x{header['height']}, {header['bit_depth']}-bit, {header['channels']} channels")
+        if texture_type in RGB_TEXTURE_TYPES and header['channels'] < 3:
+            report.errors.append(f"{texture_type}: expected an RGB map, found {header['channels']} channel(s)")
+
+    resolutions = {(header['width'], header['height']) for header in report.textures.values()}
+    if len(resolutions) > 1:
+        details = ', '.join(f"{texture_type} {header['width']}x{header['height']}" for texture_type, header in report.textures.items())
+        report.warnings.append(f"Maps have different resolutions: {details}")
+
+    report.seconds = time.perf_counter() - start_time
+    for warning in report.warnings:
+        logger.warning(warning)
+    for error in report.errors:
+        logger.error(f"Invalid texture {error}")
+
+    if report.ok:
+        log_operation_success("texture pre-flight", logger)
+    logger.info(report.summary())
+    return report
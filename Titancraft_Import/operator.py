@@ -1,16 +1,88 @@
 import bpy  # type: ignore
-from bpy.props import StringProperty, FloatProperty, EnumProperty, BoolProperty  # type: ignore
+import os
+from bpy.props import StringProperty, FloatProperty, EnumProperty, BoolProperty, IntProperty, CollectionProperty  # type: ignore
 from bpy_extras.io_utils import ImportHelper  # type: ignore
-from .functions.cleanup import cleanup_default_objects
-from .functions.apply_textures import apply_textures
-from .functions.resize import resize_object
-from .functions.turntable import setup_turntable_camera, add_lights
-from .functions.glow import setup_glow_compositor
-from .functions.utils import check_files_exist, get_subdirectory_path
-from .functions.io import extract_zip, get_file_paths, rename_collection, rename_imported_object
-from .functions.constants import MaterialConstants, ScalingConstants, ImportConstants
-
-class ImportApplyTexturesOperator(bpy.types.Operator, ImportHelper):  # type: ignore
+from . import preferences
+# The pipeline modules (and NumPy) are imported on first use in execute(), so registering the add-on stays cheap
+from .functions.constants import MaterialConstants, ScalingConstants, ImportConstants, TextureConstants, FileConstants, LODConstants, GlowConstants
+
+class ModalImportMixin:
+    """Runs an operator's import_steps() generator, either in one call or on a timer with progress and Esc to cancel.
+
+    import_steps(context, logger, journal) yields (done, total, label)
+    before each stage and returns the operator result. A cancellable import
+    gets a journal, and what the steps record in it is rolled back if the
+    import is cancelled or fails; otherwise journal is None.
+    """
+
+    def run_import_steps(self, context, profile_name):
+        from .functions.logging_utils import get_logger, profiling_session
+        from .functions.utils import run_steps
+        logger = get_logger(self)
+        if self.cancellable and context.window is not None and not bpy.app.background:
+            return self.start_modal(context, logger, profile_name)
+
+        try:
+            with profiling_session(self.profile_import, logger, profile_name):
+                return run_steps(self.import_steps(context, logger, None))
+        finally:
+            logger.flush_reports()
+
+    def end_journal(self, journal, result, logger):
+        if result == {'FINISHED'}:
+            journal.commit()
+        else:
+            journal.rollback(logger)
+
+    def start_modal(self, context, logger, profile_name):
+        from .functions.logging_utils import profiling_session
+        from .functions.rollback import ImportJournal
+        self._journal = ImportJournal()
+        self._profiling = profiling_session(self.profile_import, logger, profile_name)
+        self._profiling.__enter__()
+        self._steps = self.import_steps(context, logger, self._journal)
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(ImportConstants.MODAL_STEP_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        from .functions.logging_utils import get_logger, log_operation_error, log_progress
+        logger = get_logger(self)
+        if event.type == 'ESC':
+            self._steps.close()
+            removed = self._journal.rollback(logger)
+            logger.warning(f"Import cancelled, removed {removed} new datablocks")
+            return self.finish_modal(context, logger, {'CANCELLED'})
+        if event.type == 'Z' and (event.ctrl or event.oskey):
+            # Undo would free the datablocks the journal refers to
+            return {'RUNNING_MODAL'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        try:
+            done, total, label = next(self._steps)
+        except StopIteration as stop:
+            self.end_journal(self._journal, stop.value, logger)
+            return self.finish_modal(context, logger, stop.value)
+        except Exception as e:
+            log_operation_error("Import", e, logger)
+            self._journal.rollback(logger)
+            return self.finish_modal(context, logger, {'CANCELLED'})
+
+        log_progress(done, total, label, logger, context.window_manager)
+        context.workspace.status_text_set(f"Titancraft Import: {label} ({done}/{total}), Esc to cancel")
+        return {'RUNNING_MODAL'}
+
+    def finish_modal(self, context, logger, result):
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+        context.workspace.status_text_set(None)
+        self._profiling.__exit__(None, None, None)
+        logger.flush_reports()
+        return result
+
+class ImportApplyTexturesOperator(bpy.types.Operator, ImportHelper, ModalImportMixin):  # type: ignore
     bl_idname = "titancraft_import.zip"
     bl_label = "Titancraft Import"
     bl_options = {'REGISTER', 'UNDO'}
@@ -47,53 +119,397 @@ class ImportApplyTexturesOperator(bpy.types.Operator, ImportHelper):  # type: ig
         description="Enable bloom/glow effect with compositor",
         default=True,
     )
+    glow_quality: EnumProperty(  # type: ignore
+        name="Glow Quality",
+        description="Quality of the glare in the glow compositor",
+        items=[
+            (GlowConstants.QUALITY_PREVIEW, "Preview", "Compute the glare at low resolution, for a responsive viewport"),
+            (GlowConstants.QUALITY_FINAL, "Final", "Compute the glare at full resolution, for final renders"),
+        ],
+        default=GlowConstants.QUALITY_FINAL
+    )
+    load_in_memory: BoolProperty(  # type: ignore
+        name="Load Textures In Memory",
+        description="Read textures straight from the zip into packed images instead of extracting them to disk",
+        default=False,
+    )
+    use_cache: BoolProperty(  # type: ignore
+        name="Use Asset Cache",
+        description="Reuse extracted files from earlier imports of the same zip contents",
+        default=False,
+    )
+    cache_blend_library: BoolProperty(  # type: ignore
+        name="Cache Mesh Library",
+        description="Also cache the imported mesh and images as a .blend library and append from it on re-import",
+        default=False,
+    )
+    max_texture_resolution: EnumProperty(  # type: ignore
+        name="Max Texture Resolution",
+        description="Use downscaled copies of larger maps for lightweight previews; restore them later with Restore Full Resolution Textures",
+        items=[(TextureConstants.FULL_RESOLUTION, "Full", "Use the original maps")] + [
+            (resolution, f"{resolution} px", f"Downscale maps larger than {resolution} pixels") for resolution in TextureConstants.PREVIEW_RESOLUTIONS
+        ],
+        default=TextureConstants.FULL_RESOLUTION,
+    )
+    pack_orm: BoolProperty(  # type: ignore
+        name="Pack ORM Texture",
+        description="Unreal only: pack AO, Roughness and Metallic into one ORM texture (R, G, B) and wire it through a Separate Color node",
+        default=True,
+    )
+    fast_obj_reader: BoolProperty(  # type: ignore
+        name="Fast OBJ Reader",
+        description="Read Titancraft OBJs straight into a mesh with NumPy instead of the OBJ import operator; other OBJs still use the operator",
+        default=True,
+    )
+    use_mesh_sidecar: BoolProperty(  # type: ignore
+        name="Mesh Sidecar",
+        description="With the fast OBJ reader, keep a binary copy of each parsed mesh in the asset cache and memory-map it on re-import instead of parsing the OBJ",
+        default=True,
+    )
+    bake_textures: BoolProperty(  # type: ignore
+        name="Bake AO And Emission",
+        description="Default and Turntable only: multiply AO into the color map and precompute the emission map once, cached by source hash, so the material needs no Mix or Math nodes",
+        default=False,
+    )
+    lazy_load_textures: BoolProperty(  # type: ignore
+        name="Load Textures In Background",
+        description="Show the model straight away with placeholder textures and attach the real maps one by one as they finish loading",
+        default=False,
+    )
+    generate_lods: BoolProperty(  # type: ignore
+        name="Generate LODs",
+        description="Add decimated copies of the model named <model>_LOD1 .. _LODn for Unreal Engine, and rename the model to <model>_LOD0",
+        default=False,
+    )
+    lod_count: IntProperty(  # type: ignore
+        name="LOD Count",
+        description="Number of LODs to generate besides LOD0",
+        default=LODConstants.DEFAULT_LOD_COUNT,
+        min=1,
+        max=LODConstants.MAX_LOD_COUNT,
+    )
+    lod_ratio: FloatProperty(  # type: ignore
+        name="LOD Ratio",
+        description="Triangle ratio of each LOD relative to the previous one",
+        default=LODConstants.DEFAULT_LOD_RATIO,
+        min=0.01,
+        max=0.99,
+    )
+    validate_textures: BoolProperty(  # type: ignore
+        name="Validate Textures",
+        description="Fully check every PNG (CRCs, headers, image data) before importing anything",
+        default=True,
+    )
+    update_existing: BoolProperty(  # type: ignore
+        name="Update Existing",
+        description="If this model was imported before, refresh only the textures and mesh that changed in the zip, keeping transforms, modifiers and materials",
+        default=False,
+    )
+    cancellable: BoolProperty(  # type: ignore
+        name="Cancellable",
+        description="Run the import step by step in the background with progress in the status bar; press Esc to cancel and undo everything it created",
+        default=False,
+    )
+
+    profile_import: BoolProperty(  # type: ignore
+        name="Profile Import",
+        description="Record wall time, CPU time, memory and I/O per stage, report a summary table and write a Chrome trace to the temp folder",
+        default=False,
+    )
 
     def execute(self, context):
-        from .functions.logging_utils import get_logger
-        logger = get_logger(self)
-        
-        base_name, extract_to = extract_zip(self.filepath, logger)
-        obj_path, texture_paths = get_file_paths(base_name, extract_to, logger)
+        return self.run_import_steps(context, os.path.splitext(os.path.basename(self.filepath))[0])
+
+    def import_steps(self, context, logger, journal):
+        """Import the zip stage by stage, yielding (done, total, label) before each stage."""
+        from .functions.apply_textures import apply_textures, import_obj
+        from .functions.cache import (extract_zip_cached, load_library, write_library, session_stats, evict_entries,
+                                      get_cache_directory, get_sidecar_directory, get_baked_directory)
+        from .functions.cleanup import cleanup_default_objects
+        from .functions.glow import setup_glow_compositor
+        from .functions.io import extract_zip, read_zip_in_memory, get_file_paths, rename_collection, rename_imported_object, resolve_base_name, read_member_signatures
+        from .functions.reimport import find_imported_objects, record_import, update_asset
+        from .functions.resize import resize_object
+        from .functions.turntable import setup_turntable_camera, add_lights
+        from .functions.utils import check_files_exist, check_texture_data
+        from .functions.validation import preflight_textures
+        total = 4
+        if self.update_existing:
+            existing_objects = find_imported_objects(resolve_base_name(self.filepath))
+            if existing_objects:
+                yield 0, total, "Updating model"
+                return update_asset(self.filepath, existing_objects, logger, self.fast_obj_reader)
+
+        yield 0, total, "Extracting archive"
+        texture_data = None
+        cache_entry = None
+        if self.use_cache:
+            base_name, cache_entry = extract_zip_cached(self.filepath, logger, size_limit_mb=preferences.get_cache_size_limit_mb())
+            obj_path, texture_paths = get_file_paths(base_name, cache_entry, logger)
+            if not check_files_exist(obj_path, texture_paths, logger):
+                return {'CANCELLED'}
+        elif self.load_in_memory:
+            base_name, extract_to, texture_data = read_zip_in_memory(self.filepath, logger)
+            obj_path, texture_paths = get_file_paths(base_name, extract_to, logger)
+            if not check_texture_data(obj_path, texture_data, logger):
+                return {'CANCELLED'}
+        else:
+            base_name, extract_to = extract_zip(self.filepath, logger)
+            obj_path, texture_paths = get_file_paths(base_name, extract_to, logger)
+            if not check_files_exist(obj_path, texture_paths, logger):
+                return {'CANCELLED'}
 
-        if not check_files_exist(obj_path, texture_paths, logger):
+        yield 1, total, "Checking textures"
+        if self.validate_textures and not preflight_textures(texture_paths, texture_data, logger=logger).ok:
             return {'CANCELLED'}
 
+        yield 2, total, "Preparing scene"
         if self.rename_objects:
-            from .functions.constants import FileConstants
+            if journal is not None:
+                journal.record_name(bpy.data.collections.get(FileConstants.DEFAULT_COLLECTION_NAME))
             rename_collection(FileConstants.DEFAULT_COLLECTION_NAME, FileConstants.CHARACTER_COLLECTION_NAME, logger)
         if self.remove_default_objects:
-            cleanup_default_objects()
+            cleanup_default_objects(journal)
 
-        result = apply_textures(obj_path, texture_paths, base_name, self.ior, self.import_for, self)
+        cached_objects, cached_images = None, None
+        if cache_entry and self.cache_blend_library:
+            cached_objects, cached_images = load_library(cache_entry, base_name, logger)
+
+        baked_dir = None
+        if self.bake_textures and self.import_for != ImportConstants.CONFIGURATION_UNREAL:
+            if texture_data is not None:
+                logger.warning("Bake AO And Emission is ignored when textures are loaded in memory")
+            else:
+                from .functions.image_ops import add_baked_textures
+                baked_dir = get_baked_directory()
+                texture_paths = add_baked_textures(texture_paths, baked_dir, logger)
+                cached_images = None  # The cached images are not baked
+
+        material_texture_paths = texture_paths
+        if self.max_texture_resolution != TextureConstants.FULL_RESOLUTION:
+            if texture_data is not None:
+                logger.warning("Max Texture Resolution is ignored when textures are loaded in memory")
+            else:
+                from .functions.image_ops import get_preview_texture_paths
+                material_texture_paths = get_preview_texture_paths(texture_paths, int(self.max_texture_resolution), logger)
+                cached_images = None  # The cached images are full resolution
+
+        if self.import_for == ImportConstants.CONFIGURATION_UNREAL and self.pack_orm:
+            if texture_data is not None:
+                logger.warning("Pack ORM Texture is ignored when textures are loaded in memory")
+            else:
+                from .functions.image_ops import add_orm_texture
+                material_texture_paths = add_orm_texture(material_texture_paths, base_name, logger)
+
+        uses_preview_textures = self.max_texture_resolution != TextureConstants.FULL_RESOLUTION and texture_data is None
+        # Only full resolution source maps go into the library, never previews or baked maps
+        writes_cache_library = cache_entry is not None and self.cache_blend_library and cached_objects is None and material_texture_paths == texture_paths and baked_dir is None
+
+        def on_textures_loaded(objects, material):
+            # With background loading this runs from a timer after execute() returned, so it must not use the operator
+            if uses_preview_textures:
+                from .functions.image_ops import tag_full_resolution_paths
+                tag_full_resolution_paths(material, material_texture_paths, texture_paths)
+            if writes_cache_library:
+                write_library(cache_entry, objects)
+
+        yield 3, total, "Importing model"
+        sidecar_dir = get_sidecar_directory() if self.fast_obj_reader and self.use_mesh_sidecar else None
+        objects = cached_objects or import_obj(obj_path, logger, self.fast_obj_reader, sidecar_dir)
+        if not objects:
+            return {'CANCELLED'}
+        if journal is not None:
+            journal.record_objects(objects)
+        result = apply_textures(obj_path, material_texture_paths, base_name, self.ior, self.import_for, self, texture_data, objects, cached_images,
+                                lazy_textures=self.lazy_load_textures, on_textures_loaded=on_textures_loaded)
         if result == {'CANCELLED'}:
             return {'CANCELLED'}
+        if sidecar_dir or baked_dir:
+            keep_key = os.path.basename(cache_entry) if cache_entry else None
+            evict_entries(get_cache_directory(), preferences.get_cache_size_limit_mb() * 1048576, keep_key=keep_key, stats=session_stats)
+
+        if cache_entry:
+            logger.info(session_stats.summary())
 
+        record_import(objects, base_name, read_member_signatures(self.filepath, base_name))
         if self.rename_objects:
-            rename_imported_object(base_name, logger)
+            rename_imported_object(base_name, objects, logger)
         if self.import_for in [ImportConstants.CONFIGURATION_UNREAL, ImportConstants.CONFIGURATION_TURNTABLE]:
-            result = resize_object(scale=ScalingConstants.UNREAL_ENGINE_SCALE, logger=logger)
+            result = resize_object(scale=ScalingConstants.UNREAL_ENGINE_SCALE, logger=logger, objects=objects)
             if result == {'CANCELLED'}:
                 return {'CANCELLED'}
 
+        if self.generate_lods:
+            from .functions.lod import generate_lods
+            lods = generate_lods(objects, self.lod_count, self.lod_ratio, logger)
+            if journal is not None:
+                journal.record_objects([copy for level, copies in lods.items() if level for copy in copies])
+
         if self.import_for == ImportConstants.CONFIGURATION_TURNTABLE:
-            setup_turntable_camera()
-            add_lights()
-        
+            rig = setup_turntable_camera(objects) + add_lights(objects)
+            if journal is not None:
+                journal.record_datablocks(rig)
+
         if self.implement_glow:
-            setup_glow_compositor(self)
+            setup_glow_compositor(self, self.glow_quality)
 
         return {'FINISHED'}
 
+class ImportTitancraftBatchOperator(bpy.types.Operator, ImportHelper, ModalImportMixin):  # type: ignore
+    bl_idname = "titancraft_import.zip_batch"
+    bl_label = "Titancraft Batch Import"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filename_ext = ".zip"
+    filter_glob: StringProperty(default="*.zip", options={'HIDDEN'})  # type: ignore
+    directory: StringProperty(subtype='DIR_PATH')  # type: ignore
+    files: CollectionProperty(type=bpy.types.OperatorFileListElement, options={'HIDDEN', 'SKIP_SAVE'})  # type: ignore
+    ior: FloatProperty(  # type: ignore
+        name="IOR",
+        description="Index of Refraction for the materials",
+        default=MaterialConstants.DEFAULT_IOR,
+    )
+    import_for: EnumProperty(  # type: ignore
+        name="Import For",
+        description="Select the configuration type",
+        items=[
+            (ImportConstants.CONFIGURATION_DEFAULT, "Default", "Default configuration"),
+            (ImportConstants.CONFIGURATION_UNREAL, "Unreal", "Configure the models for Unreal Engine"),
+        ],
+        default=ImportConstants.CONFIGURATION_DEFAULT
+    )
+    remove_default_objects: BoolProperty(  # type: ignore
+        name="Remove Default Objects",
+        description="Remove the default camera, cube, and light",
+        default=True,
+    )
+    implement_glow: BoolProperty(  # type: ignore
+        name="Implement Glow",
+        description="Enable bloom/glow effect with compositor",
+        default=True,
+    )
+    glow_quality: EnumProperty(  # type: ignore
+        name="Glow Quality",
+        description="Quality of the glare in the glow compositor",
+        items=[
+            (GlowConstants.QUALITY_PREVIEW, "Preview", "Compute the glare at low resolution, for a responsive viewport"),
+            (GlowConstants.QUALITY_FINAL, "Final", "Compute the glare at full resolution, for final renders"),
+        ],
+        default=GlowConstants.QUALITY_FINAL
+    )
+    pack_orm: BoolProperty(  # type: ignore
+        name="Pack ORM Texture",
+        description="Unreal only: pack AO, Roughness and Metallic into one ORM texture (R, G, B) and wire it through a Separate Color node",
+        default=True,
+    )
+    fast_obj_reader: BoolProperty(  # type: ignore
+        name="Fast OBJ Reader",
+        description="Read Titancraft OBJs straight into a mesh with NumPy instead of the OBJ import operator; other OBJs still use the operator",
+        default=True,
+    )
+    use_mesh_sidecar: BoolProperty(  # type: ignore
+        name="Mesh Sidecar",
+        description="With the fast OBJ reader, keep a binary copy of each parsed mesh in the asset cache and memory-map it on re-import instead of parsing the OBJ",
+        default=True,
+    )
+    max_workers: IntProperty(  # type: ignore
+        name="Worker Threads",
+        description="Number of threads used to validate and extract archives before import",
+        default=ImportConstants.BATCH_MAX_WORKERS,
+        min=1,
+    )
+    cancellable: BoolProperty(  # type: ignore
+        name="Cancellable",
+        description="Run the import step by step in the background with progress in the status bar; press Esc to cancel and undo everything it created",
+        default=False,
+    )
+
+    profile_import: BoolProperty(  # type: ignore
+        name="Profile Import",
+        description="Record wall time, CPU time, memory and I/O per stage, report a summary table and write a Chrome trace to the temp folder",
+        default=False,
+    )
+
+    def execute(self, context):
+        from .functions.batch import collect_archive_paths
+        from .functions.logging_utils import get_logger
+        logger = get_logger(self)
+
+        self._filepaths = collect_archive_paths(self.directory, [file.name for file in self.files])
+        if not self._filepaths:
+            logger.error(f"No zip files found in {self.directory}")
+            logger.flush_reports()
+            return {'CANCELLED'}
+        return self.run_import_steps(context, "batch")
+
+    def import_steps(self, context, logger, journal):
+        """Import the selected zips, yielding (done, total, label) while archives are prepared and after each model."""
+        from .functions.batch import batch_import_steps
+        from .functions.cache import session_stats, evict_entries, get_cache_directory, get_sidecar_directory
+        from .functions.cleanup import cleanup_default_objects
+        from .functions.glow import setup_glow_compositor
+        if self.remove_default_objects:
+            cleanup_default_objects(journal)
+
+        sidecar_dir = get_sidecar_directory() if self.fast_obj_reader and self.use_mesh_sidecar else None
+        imported_assets = yield from batch_import_steps(self._filepaths, self.ior, self.import_for, self.max_workers, self, self.pack_orm, self.fast_obj_reader, sidecar_dir, journal)
+        if sidecar_dir:
+            evict_entries(get_cache_directory(), preferences.get_cache_size_limit_mb() * 1048576, stats=session_stats)
+        if not imported_assets:
+            return {'CANCELLED'}
+
+        if self.implement_glow:
+            setup_glow_compositor(self, self.glow_quality)
+        return {'FINISHED'}
+
+class RestoreFullResolutionTexturesOperator(bpy.types.Operator):  # type: ignore
+    bl_idname = "titancraft_import.restore_full_textures"
+    bl_label = "Restore Full Resolution Textures"
+    bl_description = "Swap preview textures on the selected objects back to their full resolution maps"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        from .functions.logging_utils import get_logger
+        from .functions.image_ops import restore_full_resolution
+        logger = get_logger(self)
+
+        materials = {slot.material for obj in context.selected_objects for slot in obj.material_slots if slot.material and slot.material.node_tree}
+        images = {node.image for material in materials for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image}
+        restored = restore_full_resolution(images, logger)
+        if not restored:
+            logger.warning("No preview textures found on the selected objects")
+            return {'CANCELLED'}
+
+        # The materials now show different images, so they must not be shared as preview materials
+        for material in materials:
+            if MaterialConstants.CONTENT_KEY_PROPERTY in material:
+                del material[MaterialConstants.CONTENT_KEY_PROPERTY]
+        logger.info(f"Restored {restored} full resolution textures")
+        logger.flush_reports()
+        return {'FINISHED'}
+
 def menu_func_import(self, context):
     self.layout.operator(ImportApplyTexturesOperator.bl_idname, text="Titancraft (.zip)")
+    self.layout.operator(ImportTitancraftBatchOperator.bl_idname, text="Titancraft Batch (.zip)")
+
+def menu_func_object(self, context):
+    self.layout.operator(RestoreFullResolutionTexturesOperator.bl_idname)
 
 def register():
+    preferences.register()
     bpy.utils.register_class(ImportApplyTexturesOperator)
+    bpy.utils.register_class(ImportTitancraftBatchOperator)
+    bpy.utils.register_class(RestoreFullResolutionTexturesOperator)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.VIEW3D_MT_object.append(menu_func_object)
 
 def unregister():
+    bpy.utils.unregister_class(RestoreFullResolutionTexturesOperator)
+    bpy.utils.unregister_class(ImportTitancraftBatchOperator)
     bpy.utils.unregister_class(ImportApplyTexturesOperator)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    bpy.types.VIEW3D_MT_object.remove(menu_func_object)
+    preferences.unregister()
 
 if __name__ == "__main__":
     register()
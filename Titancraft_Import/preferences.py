@@ -0,0 +1,48 @@
+import bpy  # type: ignore
+from bpy.props import EnumProperty, BoolProperty, IntProperty  # type: ignore
+from .functions.constants import CacheConstants, LoggingConstants
+
+def update_logging(self, context):
+    from .functions.logging_utils import configure_logging
+    configure_logging(self.log_level, self.batch_ui_reports)
+
+class TitancraftPreferences(bpy.types.AddonPreferences):  # type: ignore
+    bl_idname = __package__
+
+    log_level: EnumProperty(  # type: ignore
+        name="Log Level",
+        description=f"Lowest level written to the console (the {LoggingConstants.LOG_LEVEL_ENV_VAR} environment variable overrides this)",
+        items=[(level, level.title(), f"Log {level.lower()} messages and above") for level in LoggingConstants.LOG_LEVELS],
+        default=LoggingConstants.DEFAULT_LOG_LEVEL,
+        update=update_logging,
+    )
+    batch_ui_reports: BoolProperty(  # type: ignore
+        name="Batch UI Reports",
+        description="Send one summary report per import instead of one report per step; warnings and errors are always reported immediately",
+        default=True,
+        update=update_logging,
+    )
+    cache_size_limit: IntProperty(  # type: ignore
+        name="Cache Size Limit (MB)",
+        description="Least recently used asset cache entries are removed above this size, by single and batch imports alike",
+        default=CacheConstants.DEFAULT_SIZE_LIMIT_MB,
+        min=0,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "log_level")
+        layout.prop(self, "batch_ui_reports")
+        layout.prop(self, "cache_size_limit")
+
+def get_cache_size_limit_mb():
+    """Return the asset cache size limit, or the default when the add-on is not registered."""
+    addon = bpy.context.preferences.addons.get(__package__)
+    return addon.preferences.cache_size_limit if addon else CacheConstants.DEFAULT_SIZE_LIMIT_MB
+
+def register():
+    # Logging reads these preferences when the pipeline is first loaded
+    bpy.utils.register_class(TitancraftPreferences)
+
+def unregister():
+    bpy.utils.unregister_class(TitancraftPreferences)
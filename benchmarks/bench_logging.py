@@ -0,0 +1,96 @@
+"""
+Logging overhead benchmark for Titancraft Import add-on.
+
+Times check_files_exist and preflight_textures (the per-file logging loops) at
+every log level, plus the number of UI reports one operator run sends with
+and without batched reporting. Console output goes to os.devnull so the
+numbers show formatting cost, not terminal speed.
+
+Run inside Blender:
+    blender --background --factory-startup --python benchmarks/bench_logging.py -- --iterations 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from synthetic import get_script_args, make_png
+from Titancraft_Import.functions import logging_utils, utils, validation
+from Titancraft_Import.functions.constants import ImportConstants
+
+class ReportCounter:
+    """Stands in for an operator and counts the reports sent to the UI."""
+
+    def __init__(self):
+        self.reports = 0
+
+    def report(self, report_type, message):
+        self.reports += 1
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="bench_logging.py")
+    parser.add_argument('--iterations', type=int, default=2000, help="Calls per measurement")
+    return parser.parse_args(argv)
+
+def build_file_set(directory):
+    """Write an empty OBJ and a set of small PNG maps and return their paths."""
+    obj_path = os.path.join(directory, "bench.obj")
+    open(obj_path, 'wb').close()
+    texture_paths = {}
+    for seed, texture_type in enumerate(ImportConstants.TEXTURE_TYPES):
+        texture_paths[texture_type] = os.path.join(directory, f"bench_{texture_type}.png")
+        with open(texture_paths[texture_type], 'wb') as png_file:
+            png_file.write(make_png(16, seed))  # Tiny maps keep the numbers about logging, not PNG checks
+    return obj_path, texture_paths
+
+def time_calls(function, iterations):
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start_time) / iterations * 1e6
+
+def count_reports(batch_ui_reports, obj_path, texture_paths):
+    """Return the number of UI reports one import-sized sequence of calls sends."""
+    operator = ReportCounter()
+    logging_utils.configure_logging('INFO', batch_ui_reports)
+    logger = logging_utils.get_logger(operator)
+    utils.check_files_exist(obj_path, texture_paths, logger)
+    validation.preflight_textures(texture_paths, logger=logger)
+    for step in ("Extract", "Import OBJ", "Apply textures", "Rename", "Resize"):
+        logging_utils.log_operation_start(step, logger)
+        logging_utils.log_operation_success(step, logger)
+    logger.flush_reports()
+    return operator.reports
+
+def main():
+    args = parse_args(get_script_args())
+    os.environ.pop(logging_utils.LOG_LEVEL_ENV_VAR, None)
+    handler = logging_utils.logger.handlers[0]
+
+    with tempfile.TemporaryDirectory(prefix="titancraft_bench_") as directory, open(os.devnull, 'w') as devnull:
+        obj_path, texture_paths = build_file_set(directory)
+        stream = handler.setStream(devnull)
+        logger = logging_utils.get_logger()
+
+        print(f"{'Level':<8}{'check_files_exist (us)':>24}{'preflight_textures (us)':>25}")
+        for level in reversed(logging_utils.LOG_LEVELS):
+            logging_utils.configure_logging(level)
+            check = time_calls(lambda: utils.check_files_exist(obj_path, texture_paths, logger), args.iterations)
+            preflight = time_calls(lambda: validation.preflight_textures(texture_paths, logger=logger), args.iterations)
+            print(f"{level:<8}{check:>24.1f}{preflight:>25.1f}")
+
+        batched = count_reports(True, obj_path, texture_paths)
+        unbatched = count_reports(False, obj_path, texture_paths)
+        handler.setStream(stream)
+
+    print(f"UI reports per import: {batched} batched, {unbatched} unbatched")
+    logging_utils.configure_logging()
+
+if __name__ == "__main__":
+    main()
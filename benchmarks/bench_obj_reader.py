@@ -0,0 +1,70 @@
+"""
+OBJ import benchmark for Titancraft Import add-on.
+
+Compares bpy.ops.wm.obj_import against the fast NumPy OBJ reader, with
+and without a memory-mapped mesh sidecar, on a synthetic Titancraft mesh
+(1M triangles by default), and checks that all of them produce the same
+vertex, face and corner counts and bounds.
+
+Run inside Blender:
+    blender --background --factory-startup --python benchmarks/bench_obj_reader.py -- --faces 1000000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import bpy  # type: ignore
+from synthetic import get_script_args, write_obj
+from Titancraft_Import.functions.apply_textures import import_obj
+from Titancraft_Import.functions.logging_utils import configure_logging, get_logger
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="bench_obj_reader.py")
+    parser.add_argument('--faces', type=int, default=1000000, help="Triangle count of the synthetic mesh")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed imports per reader")
+    return parser.parse_args(argv)
+
+def describe(obj):
+    """Return counts and rounded bounds, to check both readers built the same mesh."""
+    mesh = obj.data
+    bounds = [tuple(round(value, 4) for value in corner) for corner in (obj.bound_box[0], obj.bound_box[6])]
+    return len(mesh.vertices), len(mesh.polygons), len(mesh.loops), bounds
+
+def time_reader(obj_path, fast_obj_reader, repeat, sidecar_dir=None):
+    timings = []
+    for _ in range(repeat):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        start_time = time.perf_counter()
+        obj = import_obj(obj_path, get_logger(), fast_obj_reader, sidecar_dir)[0]
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), describe(obj)
+
+def main():
+    args = parse_args(get_script_args())
+    configure_logging('WARNING')
+    with tempfile.TemporaryDirectory(prefix="titancraft_bench_") as directory:
+        obj_path = os.path.join(directory, "Synthetic.obj")
+        vertices, faces = write_obj(obj_path, "Synthetic", args.faces)
+        print(f"Synthetic OBJ: {vertices} vertices, {faces} triangles, {os.path.getsize(obj_path) / 1048576:.1f} MB")
+
+        operator_time, operator_mesh = time_reader(obj_path, False, args.repeat)
+        fast_time, fast_mesh = time_reader(obj_path, True, args.repeat)
+        sidecar_dir = os.path.join(directory, "sidecars")
+        os.makedirs(sidecar_dir)
+        time_reader(obj_path, True, 1, sidecar_dir)  # Writes the sidecar
+        sidecar_time, sidecar_mesh = time_reader(obj_path, True, args.repeat, sidecar_dir)
+
+    print(f"bpy.ops.wm.obj_import:   {operator_time:.3f}s")
+    print(f"Fast OBJ reader:         {fast_time:.3f}s ({operator_time / max(fast_time, 1e-9):.1f}x)")
+    print(f"Mapped mesh sidecar:     {sidecar_time:.3f}s ({operator_time / max(sidecar_time, 1e-9):.1f}x)")
+    print(f"Meshes match: {operator_mesh == fast_mesh == sidecar_mesh} (operator {operator_mesh}, fast {fast_mesh}, sidecar {sidecar_mesh})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Import pipeline benchmark for Titancraft Import add-on.
+
+Generates a synthetic Titancraft zip and times each stage of the import,
+extract_zip -> get_file_paths -> check_files_exist -> apply_textures ->
+resize_object -> setup_glow_compositor, over repeated runs in a fresh empty
+scene. Results are written as JSON; pass --baseline with an earlier result
+file to print the change per stage.
+
+Run inside Blender:
+    blender --background --factory-startup --python benchmarks/bench_pipeline.py -- --faces 200000 --resolution 2048 --output results.json
+or with the bpy module:
+    python benchmarks/bench_pipeline.py --faces 200000 --resolution 2048 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import bpy  # type: ignore
+from synthetic import LAYOUTS, get_script_args, make_archive
+from Titancraft_Import.functions.apply_textures import apply_textures
+from Titancraft_Import.functions.constants import ImportConstants, MaterialConstants, ScalingConstants
+from Titancraft_Import.functions.glow import setup_glow_compositor
+from Titancraft_Import.functions.io import extract_zip, get_file_paths
+from Titancraft_Import.functions.logging_utils import configure_logging, get_logger
+from Titancraft_Import.functions.resize import resize_object
+from Titancraft_Import.functions.utils import check_files_exist
+
+STAGES = ['extract_zip', 'get_file_paths', 'check_files_exist', 'apply_textures', 'resize_object', 'setup_glow_compositor']
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="bench_pipeline.py", description="Time each import stage on a synthetic Titancraft zip.")
+    parser.add_argument('--faces', type=int, default=20000, help="Triangle count of the synthetic mesh")
+    parser.add_argument('--resolution', type=int, default=1024, help="Texture resolution in pixels (square)")
+    parser.add_argument('--layout', choices=LAYOUTS, default='flat', help="Files at the zip root or in one subdirectory")
+    parser.add_argument('--no-emissive', dest='emissive', action='store_false', help="Leave out the emissive map")
+    parser.add_argument('--configuration', choices=('DEFAULT', 'UNREAL'), default='DEFAULT', help="Import configuration")
+    parser.add_argument('--fast-obj', action='store_true', help="Import the OBJ with the fast NumPy reader")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs before the timed ones")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Earlier results JSON to compare against")
+    return parser.parse_args(argv)
+
+def run_pipeline(zip_path, extract_root, configuration, fast_obj_reader=False):
+    """Import the zip once into an empty scene and return {stage: seconds}."""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    logger = get_logger()
+    timings = {}
+
+    def timed(stage, function, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = function(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start_time
+        return result
+
+    base_name, extract_to = timed('extract_zip', extract_zip, zip_path, logger, extract_root=extract_root)
+    try:
+        obj_path, texture_paths = timed('get_file_paths', get_file_paths, base_name, extract_to, logger)
+        if not timed('check_files_exist', check_files_exist, obj_path, texture_paths, logger):
+            raise RuntimeError("Synthetic archive failed check_files_exist")
+        if timed('apply_textures', apply_textures, obj_path, texture_paths, base_name, MaterialConstants.DEFAULT_IOR, configuration, fast_obj_reader=fast_obj_reader) == {'CANCELLED'}:
+            raise RuntimeError("apply_textures was cancelled")
+        timed('resize_object', resize_object, scale=ScalingConstants.UNREAL_ENGINE_SCALE, logger=logger)
+        timed('setup_glow_compositor', setup_glow_compositor)
+    finally:
+        shutil.rmtree(extract_to, ignore_errors=True)
+    return timings
+
+def summarize(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'samples': samples,
+    }
+
+def print_results(results, baseline=None):
+    print(f"{'Stage':<24}{'median (ms)':>14}{'min (ms)':>12}{'baseline (ms)':>16}{'change':>10}")
+    for stage in [*STAGES, 'total']:
+        current = results['stages'][stage]
+        line = f"{stage:<24}{current['median'] * 1000:>14.2f}{current['min'] * 1000:>12.2f}"
+        previous = (baseline or {}).get('stages', {}).get(stage)
+        if previous:
+            change = (current['median'] - previous['median']) / max(previous['median'], 1e-9) * 100
+            line += f"{previous['median'] * 1000:>16.2f}{change:>+9.1f}%"
+        print(line)
+
+def main():
+    args = parse_args(get_script_args())
+    configure_logging('WARNING')
+    configuration = ImportConstants.CONFIGURATION_UNREAL if args.configuration == 'UNREAL' else ImportConstants.CONFIGURATION_DEFAULT
+
+    with tempfile.TemporaryDirectory(prefix="titancraft_bench_") as directory:
+        zip_path = make_archive(directory, faces=args.faces, resolution=args.resolution, layout=args.layout, emissive=args.emissive)
+        zip_size = os.path.getsize(zip_path)
+        for _ in range(args.warmup):
+            run_pipeline(zip_path, directory, configuration, args.fast_obj)
+        runs = [run_pipeline(zip_path, directory, configuration, args.fast_obj) for _ in range(args.repeat)]
+
+    stages = {stage: summarize([run[stage] for run in runs]) for stage in STAGES}
+    stages['total'] = summarize([sum(run.values()) for run in runs])
+    results = {
+        'parameters': {**vars(args), 'zip_bytes': zip_size},
+        'environment': {
+            'blender': bpy.app.version_string,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'stages': stages,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Startup budget check for Titancraft Import add-on.
+
+Launches fresh background Blender processes that import and register the
+add-on, and reports the median time and the modules it loaded. Exits with
+status 1 if the median exceeds --budget-ms, or if registration loads NumPy
+or any pipeline module under functions/ besides constants, so it can gate
+changes in CI.
+
+Run inside Blender:
+    blender --background --factory-startup --python benchmarks/bench_startup.py -- --repeat 5 --budget-ms 25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import bpy  # type: ignore
+from synthetic import get_script_args
+
+PACKAGE_NAME = 'Titancraft_Import'
+# Modules registration may load, relative to the package
+ALLOWED_MODULES = {'', '.operator', '.preferences', '.functions', '.functions.constants'}
+FORBIDDEN_MODULES = ('numpy',)
+RESULT_PREFIX = "TITANCRAFT_STARTUP "
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="bench_startup.py", description="Check the add-on's import and registration time against a budget.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of fresh Blender processes to measure")
+    parser.add_argument('--budget-ms', type=float, default=25.0, help="Largest allowed median import + register time in milliseconds")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def measure_startup():
+    """Import and register the add-on in this process; return the time and the newly loaded modules."""
+    before = set(sys.modules)
+    start_time = time.perf_counter()
+    addon = __import__(PACKAGE_NAME)
+    addon.register()
+    seconds = time.perf_counter() - start_time
+    loaded = sorted(set(sys.modules) - before)
+    addon.unregister()
+    return {'seconds': seconds, 'modules': loaded}
+
+def run_child():
+    print(RESULT_PREFIX + json.dumps(measure_startup()), flush=True)
+
+def run_measurement():
+    """Measure startup in a fresh Blender process, so no add-on module is cached yet."""
+    command = [bpy.app.binary_path, '--background', '--factory-startup', '--python', os.path.abspath(__file__), '--', '--child']
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"No result from the startup measurement:\n{output}")
+
+def get_violations(modules):
+    """Return the loaded modules that registration must not load."""
+    violations = []
+    for module in modules:
+        if module == PACKAGE_NAME or module.startswith(f"{PACKAGE_NAME}."):
+            if module[len(PACKAGE_NAME):] not in ALLOWED_MODULES:
+                violations.append(module)
+        elif module.split('.')[0] in FORBIDDEN_MODULES:
+            violations.append(module)
+    return violations
+
+def main():
+    args = parse_args(get_script_args())
+    if args.child:
+        run_child()
+        return 0
+
+    runs = [run_measurement() for _ in range(args.repeat)]
+    median_ms = statistics.median(run['seconds'] for run in runs) * 1000
+    violations = sorted({module for run in runs for module in get_violations(run['modules'])})
+    addon_modules = [module for module in runs[0]['modules'] if module.startswith(PACKAGE_NAME)]
+
+    print(f"Import + register: median {median_ms:.2f} ms over {len(runs)} runs (budget {args.budget_ms:.2f} ms)")
+    print(f"Add-on modules loaded: {', '.join(addon_modules)}")
+    if violations:
+        print(f"FAIL: registration loaded {', '.join(violations)}")
+    if median_ms > args.budget_ms:
+        print("FAIL: over the startup budget")
+    return 1 if violations or median_ms > args.budget_ms else 0
+
+if __name__ == "__main__":
+    status = main()
+    if status:
+        sys.exit(status)
@@ -0,0 +1,81 @@
+"""
+Synthetic Titancraft archives for the benchmarks.
+
+Writes zips shaped like a Titancraft export: one OBJ (a triangulated grid
+with v/vt/vn/f records) and a PNG per texture type, either at the zip root
+or inside a single subdirectory. Needs only the standard library, so the
+archives can also be generated outside Blender.
+"""
+
+import math
+import os
+import random
+import struct
+import sys
+import zipfile
+import zlib
+
+TEXTURE_TYPES = ['color', 'normals', 'metallic', 'roughness', 'ao', 'emissive']
+LAYOUTS = ('flat', 'subdirectory')
+
+def get_script_args(argv=None):
+    """Return the script's own arguments, both under Blender (after '--') and with the bpy module."""
+    argv = sys.argv if argv is None else argv
+    if '--' in argv:
+        return argv[argv.index('--') + 1:]
+    return argv[1:] if argv and argv[0].endswith('.py') else []
+
+def png_chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+def make_png(resolution, seed):
+    """Return an 8-bit RGB PNG of the given size filled with seeded noise.
+
+    Noise keeps the deflate stream (and the decode work) close to a real
+    texture's, unlike a flat color that compresses to almost nothing.
+    """
+    rng = random.Random(seed)
+    # A few hundred distinct rows is enough to defeat deflate's 32 KiB window on large maps
+    rows = [b'\x00' + rng.randbytes(resolution * 3) for _ in range(min(resolution, 257))]
+    raw = b''.join(rows[y % len(rows)] for y in range(resolution))
+    header = struct.pack('>IIBBBBB', resolution, resolution, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) + png_chunk(b'IDAT', zlib.compress(raw, 6)) + png_chunk(b'IEND', b'')
+
+def write_obj(path, name, faces):
+    """Write a triangulated grid with at least the given number of faces. Returns (vertices, faces)."""
+    side = max(2, math.ceil(math.sqrt(faces / 2)) + 1)
+    with open(path, 'w', encoding='utf-8') as obj_file:
+        obj_file.write(f"# Synthetic Titancraft benchmark mesh\nmtllib {name}.mtl\no {name}\n")
+        scale = 1.0 / (side - 1)
+        obj_file.writelines(f"v {x * scale:.6f} {0.1 * math.sin(x * 0.3) * math.cos(y * 0.3):.6f} {y * scale:.6f}\n" for y in range(side) for x in range(side))
+        obj_file.writelines(f"vt {x * scale:.6f} {y * scale:.6f}\n" for y in range(side) for x in range(side))
+        obj_file.write("vn 0.0000 1.0000 0.0000\n")
+        obj_file.write(f"usemtl {name}\ns off\n")
+        for y in range(side - 1):
+            lines = []
+            for x in range(side - 1):
+                a = y * side + x + 1
+                b, c, d = a + 1, a + side, a + side + 1
+                lines.append(f"f {a}/{a}/1 {c}/{c}/1 {b}/{b}/1\nf {b}/{b}/1 {c}/{c}/1 {d}/{d}/1\n")
+            obj_file.writelines(lines)
+    return side * side, 2 * (side - 1) ** 2
+
+def make_archive(directory, name="Synthetic", faces=20000, resolution=1024, layout='flat', emissive=True, seed=0):
+    """Write a synthetic Titancraft zip into directory and return its path."""
+    prefix = f"{name}/" if layout == 'subdirectory' else ""
+    # Titancraft zips carry a suffix after the model name, which the add-on strips
+    zip_path = os.path.join(directory, f"{name}_export.zip")
+    obj_path = os.path.join(directory, f"{name}.obj.tmp")
+    write_obj(obj_path, name, faces)
+    try:
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.write(obj_path, f"{prefix}{name}.obj")
+            zip_ref.writestr(f"{prefix}{name}.mtl", f"newmtl {name}\nKd 0.8 0.8 0.8\n")
+            for index, texture_type in enumerate(TEXTURE_TYPES):
+                if texture_type == 'emissive' and not emissive:
+                    continue
+                # PNGs are already deflated; storing them matches how exporters usually pack them
+                zip_ref.writestr(f"{prefix}{name}_{texture_type}.png", make_png(resolution, seed + index), zipfile.ZIP_STORED)
+    finally:
+        os.remove(obj_path)
+    return zip_path